@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+import sys, os, argparse, glob, shlex, io, contextlib
+import concurrent.futures
+import main
+
+def load_manifest(filename):
+    # One main.py command line per line, '#' starts a comment
+    jobs = []
+    with open(filename) as manifest:
+        for line in manifest:
+            argv = shlex.split(line, comments=True)
+            if len(argv) > 0:
+                jobs.append(argv)
+    return jobs
+
+def find_xml(paths, patterns):
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += sorted(glob.glob(os.path.join(p, '*.xml')))
+        else:
+            files.append(p)
+    for pattern in patterns:
+        files += sorted(glob.glob(pattern, recursive=True))
+    return files
+
+def run_job(argv):
+    # Returns (argv, captured stdout, error message or None)
+    out = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(out):
+            main.main(argv)
+    except SystemExit as e:
+        if e.code not in (0, None):
+            return (argv, out.getvalue(), f'exited with status {e.code}')
+    except Exception as e:
+        return (argv, out.getvalue(), f'{type(e).__name__}: {e}')
+    return (argv, out.getvalue(), None)
+
+def run_batch(jobs, workers=None):
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(run_job, jobs))
+
+def batch_main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Generate seL4 RPC stubs for many interface XML files in parallel',
+                                 epilog='Options after -- are passed to main.py for every file found '
+                                 'in the directories or globs, use -o with {stem} to name the outputs')
+    ap.add_argument('paths', metavar='path', nargs='*',
+                    type=str, help='Interface xml file or directory of xml files')
+    ap.add_argument('--glob', dest='patterns', action='append', default=[],
+                    type=str, help='Glob pattern of interface xml files, may be repeated')
+    ap.add_argument('-m','--manifest', dest='manifests', action='append', default=[],
+                    type=str, help='File with one main.py command line per line, may be repeated')
+    ap.add_argument('-j','--jobs', dest='jobs', default=None,
+                    type=int, help='Number of worker processes (default=number of CPUs)')
+
+    if argv is None:
+        argv = sys.argv[1:]
+    if '--' in argv:
+        common = argv[argv.index('--') + 1:]
+        argv = argv[:argv.index('--')]
+    else:
+        common = []
+    args = ap.parse_args(argv)
+
+    jobs = [[f] + common for f in find_xml(args.paths, args.patterns)]
+    for m in args.manifests:
+        jobs += load_manifest(m)
+    if len(jobs) == 0:
+        raise RuntimeError('No interface xml files given')
+
+    failures = 0
+    for argv, out, error in run_batch(jobs, args.jobs):
+        sys.stdout.write(out)
+        if error is not None:
+            failures += 1
+            print(f'{argv[0]}: {error}', file=sys.stderr)
+    if failures > 0:
+        print(f'{failures} of {len(jobs)} interfaces failed', file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(batch_main())
@@ -0,0 +1,258 @@
+#!/usr/bin/python3
+#
+# Benchmarks the parser and the generators on synthetic interfaces of
+# several sizes. Parsing is timed twice, once with expat alone and once
+# building the model, the difference is the model construction. Times
+# are the best of the repeats, peak memory is measured in a separate
+# run under tracemalloc (which slows things down too much to time).
+#
+# Results can be written as json and compared with an earlier run, the
+# exit status is 1 if any phase got slower than the threshold. It is
+# also 1 if parsing the parse_check_methods interface takes more than
+# max_parse_seconds, or more than max_parse_ratio times as long as
+# expat alone, which doesn't depend on how fast the machine is.
+import sys, os, argparse, json, random, time, tracemalloc, gc, platform
+from xml.parsers import expat
+from xml.sax.saxutils import quoteattr
+from interface_parse import parse_interface
+from interface_cache import generator_version
+from main import generators, wordsizes, add_generator_options, generator_options
+
+default_scales = [10, 100, 1000, 10000, 50000, 100000]
+
+# Parse time check, see check_parse
+parse_check_methods = 50000
+max_parse_seconds = 1.5
+max_parse_ratio = 2.5
+
+# Interface level elements of synth_interface
+methods_per_include = 100
+methods_per_define = 20
+
+value_types = ['int', 'uint8_t', 'uint16_t', 'uint32_t', 'uint64_t', 'seL4_Word', 'char', 'long long']
+
+def synth_interface(methods, seed=0):
+    '''Interface xml (bytes) with the given number of methods.
+
+    Methods have 0 to 8 value args of mixed types and directions, some
+    pass or receive a capability, some are oneway, batched, have a
+    buffer arg or leave their id to be assigned. There is an include
+    for every methods_per_include methods and a define for every
+    methods_per_define, some of them for the client or server only.
+    '''
+    rnd = random.Random(seed)
+    lines = []
+    next_batch_id = 11 + methods
+    for n in range(methods):
+        name = f'method{n}'
+        kind = rnd.random()
+        attrs = [f'name="{name}"', f'clientcap="{1 + n % 4}"']
+        if rnd.random() < 0.95:
+            attrs.append(f'id="{11 + n}"')
+        oneway = kind < 0.1
+        caps = 0.1 <= kind < 0.2
+        batched = 0.2 <= kind < 0.25
+        buffer = 0.25 <= kind < 0.3
+        if oneway:
+            attrs.append('oneway="true"')
+        else:
+            attrs.append(f'return_type={quoteattr(rnd.choice(value_types + ["void"]))}')
+        if batched:
+            attrs.append(f'batch_id="{next_batch_id}"')
+            next_batch_id += 1
+        lines.append(f'  <method {" ".join(attrs)}>')
+        for a in range(rnd.randint(0, 8)):
+            direction = 'in' if oneway else rnd.choice(['in', 'in', 'out', 'inout'])
+            lines.append(f'    <{direction} ctype={quoteattr(rnd.choice(value_types))} name="a{a}"/>')
+        if caps:
+            lines.append('    <capin ctype="seL4_CPtr" name="cap_in"/>')
+            if rnd.random() < 0.5:
+                lines.append('    <capout ctype="seL4_CPtr" name="cap_out"/>')
+        if buffer:
+            lines.append('    <inbuf ctype="uint8_t" name="data" size="16"/>')
+        lines.append('  </method>')
+    lines.append('</interface>')
+    # Drawn after the methods so they stay the same as in earlier runs
+    head = ['<interface dispatch_func="bench_dispatch" error_func="bench_error" server_prefix="bench_" '
+            'client_cspace_root="CSPACE_ROOT" client_cspace_depth="64" '
+            'shmem="bench_shm_vaddr" shmem_size="BENCH_SHM_SIZE">',
+            '  <include header="&lt;sel4/sel4.h&gt;"/>']
+    for n in range(max(methods // methods_per_include, 2)):
+        side = rnd.choice(['', '', ' server="false"', ' client="false"'])
+        head.append(f'  <include header="&lt;bench/header{n}.h&gt;"{side}/>')
+    head.append('  <define name="CSPACE_ROOT" value="1"/>')
+    head.append('  <define name="BENCH_SHM_SIZE" value="0x100000"/>')
+    for n in range(methods // methods_per_define):
+        head.append(f'  <define name="BENCH_CONST{n}" value="{rnd.randrange(1 << 16):#x}"/>')
+    return '\n'.join(head + lines).encode() + b'\n'
+
+def parse_xml(xml):
+    # expat alone, no model
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.buffer_size = 1 << 16
+    parser.StartElementHandler = lambda tag, attrib: None
+    parser.EndElementHandler = lambda tag: None
+    parser.CharacterDataHandler = lambda data: None
+    parser.Parse(xml, True)
+
+def phases(xml, wordsize, generator_names, options):
+    # (phase name, function) of everything timed for one interface
+    interface = parse_interface(xml, wordsize)
+    result = [('parse_xml', lambda: parse_xml(xml)),
+              ('parse_interface', lambda: parse_interface(xml, wordsize))]
+    for g in generator_names:
+        result.append((g, lambda g=g: generators[g](interface, 'bench', wordsize, write=False, **options)))
+    return result
+
+def time_phase(func, repeats):
+    runs = []
+    for r in range(repeats):
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        runs.append(time.perf_counter() - start)
+    return runs
+
+def peak_memory(func):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmark(scales, wordsize, generator_names, options, repeats=3, memory=True, corpus_dir=None, log=None):
+    results = []
+    for methods in scales:
+        xml = synth_interface(methods)
+        if corpus_dir is not None:
+            os.makedirs(corpus_dir, exist_ok=True)
+            with open(os.path.join(corpus_dir, f'synth_{methods}.xml'), 'wb') as f:
+                f.write(xml)
+        timed = {}
+        for name, func in phases(xml, wordsize, generator_names, options):
+            runs = time_phase(func, repeats)
+            result = dict(methods=methods, xml_bytes=len(xml), phase=name,
+                          seconds=min(runs), runs=runs,
+                          peak_bytes=peak_memory(func) if memory else None)
+            timed[name] = result['seconds']
+            results.append(result)
+            if log is not None:
+                log(result)
+        # What building the model costs on top of reading the xml
+        result = dict(methods=methods, xml_bytes=len(xml), phase='model',
+                      seconds=max(timed['parse_interface'] - timed['parse_xml'], 0.0),
+                      runs=None, peak_bytes=None)
+        results.append(result)
+        if log is not None:
+            log(result)
+    return results
+
+def print_result(result):
+    peak = f'{result["peak_bytes"] / 1e6:10.2f} MB' if result['peak_bytes'] is not None else ' ' * 13
+    print(f'{result["methods"]:8d} {result["phase"]:16s} {result["seconds"] * 1e3:12.3f} ms {peak}')
+    sys.stdout.flush()
+
+def compare(old, new, threshold):
+    '''Prints new/old time ratios, returns the number of phases slower
+    than threshold'''
+    before = {(r['methods'], r['phase']): r['seconds'] for r in old['results']}
+    regressions = 0
+    for r in new['results']:
+        key = (r['methods'], r['phase'])
+        if key not in before or before[key] <= 0:
+            continue
+        ratio = r['seconds'] / before[key]
+        flag = ''
+        # The model time is a difference of two measurements, too noisy to gate on
+        if ratio > threshold and r['phase'] != 'model':
+            flag = ' SLOWER'
+            regressions += 1
+        print(f'{r["methods"]:8d} {r["phase"]:16s} {before[key] * 1e3:12.3f} ms -> {r["seconds"] * 1e3:12.3f} ms {ratio:6.2f}x{flag}')
+    return regressions
+
+def check_parse(results, max_ratio, max_seconds):
+    '''Prints the parse time of the parse_check_methods interface,
+    returns the number of limits it is over'''
+    timed = {r['phase']: r['seconds'] for r in results if r['methods'] == parse_check_methods}
+    if 'parse_interface' not in timed:
+        return 0
+    seconds = timed['parse_interface']
+    ratio = seconds / timed['parse_xml'] if timed['parse_xml'] > 0 else 0.0
+    over = 0
+    flag = ''
+    if ratio > max_ratio:
+        flag += f' SLOWER than {max_ratio:.2f}x expat'
+        over += 1
+    if seconds > max_seconds:
+        flag += f' SLOWER than {max_seconds:.3f} s'
+        over += 1
+    print(f'Parsing {parse_check_methods} methods: {seconds * 1e3:.3f} ms, {ratio:.2f}x expat alone{flag}')
+    return over
+
+def benchmark_main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Benchmark the interface parser and generators on synthetic interfaces')
+    ap.add_argument('-s','--scale', dest='scales', action='append',
+                    type=int, help=f'Number of methods, may be repeated (default={",".join(map(str, default_scales))})')
+    ap.add_argument('-g','--generator', dest='generators', action='append',
+                    choices=generators.keys(),
+                    type=str, help='Generator to time, may be repeated (default=all)')
+    ap.add_argument('-w','--wordsize', dest='wordsize', default='64',
+                    choices=wordsizes.keys(), help='CPU word size in bits (default=64)')
+    ap.add_argument('-r','--repeat', dest='repeats', default=3,
+                    type=int, help='Runs of each phase, the fastest counts (default=3)')
+    ap.add_argument('--no-memory', dest='memory', action='store_false',
+                    help='Skip the peak memory runs')
+    ap.add_argument('-o','--output', dest='output', default=None,
+                    type=str, help='Write the results to this json file')
+    ap.add_argument('--compare', dest='compare', default=None,
+                    type=str, help='Compare with the results of an earlier run')
+    ap.add_argument('--threshold', dest='threshold', default=1.2,
+                    type=float, help='Slowdown reported as a regression by --compare (default=1.2)')
+    ap.add_argument('--max-parse-ratio', dest='max_parse_ratio', default=max_parse_ratio,
+                    type=float, help=f'Limit on the {parse_check_methods} method parse time over expat '
+                    f'alone (default={max_parse_ratio})')
+    ap.add_argument('--max-parse-seconds', dest='max_parse_seconds', default=max_parse_seconds,
+                    type=float, help=f'Limit on the {parse_check_methods} method parse time '
+                    f'(default={max_parse_seconds})')
+    ap.add_argument('--corpus-dir', dest='corpus_dir', default=None,
+                    type=str, help='Also write the synthetic interfaces to this directory')
+    add_generator_options(ap)
+
+    args = ap.parse_args(argv)
+    scales = args.scales if args.scales is not None else default_scales
+    generator_names = args.generators if args.generators is not None else list(generators.keys())
+    options = generator_options(args)
+
+    print(f'{"methods":>8s} {"phase":16s} {"time":>15s} {"peak memory":>13s}')
+    results = run_benchmark(scales, wordsizes[args.wordsize], generator_names, options,
+                            args.repeats, args.memory, args.corpus_dir, print_result)
+    report = dict(generator_version=generator_version(),
+                  python=platform.python_version(),
+                  machine=platform.machine(),
+                  wordsize=args.wordsize,
+                  repeats=args.repeats,
+                  options=options,
+                  results=results)
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=1)
+            f.write('\n')
+    print()
+    status = 0
+    if check_parse(results, args.max_parse_ratio, args.max_parse_seconds) > 0:
+        status = 1
+    if args.compare is not None:
+        with open(args.compare) as f:
+            old = json.load(f)
+        print()
+        if old.get('options') != report['options'] or old.get('wordsize') != report['wordsize']:
+            print('Note: the runs used different generator options')
+        if compare(old, report, args.threshold) > 0:
+            status = 1
+    return status
+
+if __name__ == '__main__':
+    sys.exit(benchmark_main())
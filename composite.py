@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+#
+# One server dispatch function for several interfaces served on the
+# same endpoint. Writes the server header of every interface and the
+# merged dispatcher, the per interface dispatchers are not needed.
+import sys, argparse
+from interface_parse import parse_interface_file
+from interface_gen import InterfaceServerDispatch, InterfaceCompositeDispatch, write_if_changed
+from main import wordsizes, add_generator_options, generator_options, target_basename
+
+def composite_main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Generate one seL4 server dispatch function for several interfaces')
+    ap.add_argument('filenames', metavar='file_name.xml', nargs='+',
+                    type=str, help='Interface xml files')
+    ap.add_argument('-w','--wordsize', dest='wordsize', default='64',
+                    choices=wordsizes.keys(), help='CPU word size in bits (default=64)')
+    ap.add_argument('-o','--output', dest='filebasename', required=True,
+                    type=str, help='Output file base name of the merged dispatcher')
+    ap.add_argument('--header-output', dest='headerbasename', default='{stem}_server',
+                    type=str, help='Output file base name of each interface header, {stem} (xml file '
+                    'name without extension) and {wordsize} are replaced (default={stem}_server)')
+    ap.add_argument('--dispatch-func', dest='dispatch_func', required=True,
+                    type=str, help='Name of the merged dispatch function')
+    ap.add_argument('--error-func', dest='error_func', required=True,
+                    type=str, help='Function called for labels of no interface')
+    add_generator_options(ap)
+
+    args = ap.parse_args(argv)
+    options = generator_options(args)
+    wordsize = wordsizes[args.wordsize]
+
+    servers = []
+    for filename in args.filenames:
+        headerbasename = target_basename(args.headerbasename, 'serverdispatch', args.wordsize, filename)
+        interface = parse_interface_file(filename, wordsize)
+        servers.append(InterfaceServerDispatch(interface, headerbasename, wordsize, write=False, **options))
+    if len(set(s.filebasename for s in servers)) != len(servers):
+        raise RuntimeError('Header output name must contain {stem} to tell the interfaces apart')
+
+    # Checks the interfaces before anything is written
+    composite = InterfaceCompositeDispatch(servers, args.filebasename, wordsize,
+                                           args.dispatch_func, args.error_func, write=False, **options)
+    for server in servers:
+        write_if_changed(server.filebasename + '.h', server.outputs['.h'])
+    for suffix, text in composite.outputs.items():
+        write_if_changed(args.filebasename + suffix, text)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(composite_main())
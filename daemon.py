@@ -0,0 +1,263 @@
+#!/usr/bin/python3
+#
+# Long running generator. 'serve' listens on a Unix socket and runs
+# main.py command lines sent by 'run' in process, keeping the parsed
+# interfaces in memory. Command lines it has run are repeated when one
+# of their input files changes. Output is produced by the same code as
+# one-shot main.py and is identical.
+#
+# 'run' is a drop-in replacement for main.py. It falls back to running
+# main.py in process when no daemon is listening. The daemon restarts
+# itself when the generator sources change.
+#
+# Protocol: one json request per connection, answered by one json reply.
+import sys, os, socket, json, argparse
+
+def default_socket():
+    return os.environ.get('INTERFACE_GEN_SOCKET',
+                          os.path.join(os.environ.get('TMPDIR', '/tmp'), f'interface_gen-{os.getuid()}.sock'))
+
+# Environment variables main.py reads
+passed_env = ['INTERFACE_GEN_CACHE']
+
+
+class ModelCache(dict):
+    # Parsed interfaces by xml content, least recently added dropped first
+    def __init__(self, max_models):
+        super().__init__()
+        self.max_models = max_models
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        while len(self) > self.max_models:
+            del self[next(iter(self))]
+
+
+class GeneratorDaemon:
+    def __str__(self):
+        return str(self.__class__) + ": " + str(self.__dict__)
+
+    def __init__(self, socket_path, watch_interval=0.5, max_models=64, log=sys.stderr,
+                 receive_timeout=10.0):
+        import main, interface_cache
+        self.main = main
+        self.socket_path = socket_path
+        self.watch_interval = watch_interval
+        # Seconds a client gets to send its request, the daemon serves
+        # one connection at a time
+        self.receive_timeout = receive_timeout
+        self.models = ModelCache(max_models)
+        self.log = log
+        # (cwd, argv, env) -> {input file: stat key}
+        self.jobs = {}
+        here = os.path.dirname(os.path.abspath(__file__))
+        sources = interface_cache._sources + ['main.py', 'daemon.py']
+        self.sources = {os.path.join(here, n): self.stat(os.path.join(here, n)) for n in sources}
+
+    def stat(self, filename):
+        try:
+            st = os.stat(filename)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def inputs(self, cwd, argv):
+        # Files the output of a command line depends on
+        args = self.main.argument_parser().parse_args(argv)
+        files = [args.filename]
+        if args.profile is not None:
+            files.append(args.profile)
+        return [os.path.join(cwd, f) for f in files]
+
+    def run(self, cwd, argv, env):
+        '''(exit status, stdout, stderr) of running main.py in cwd'''
+        import io, contextlib, traceback
+        out = io.StringIO()
+        err = io.StringIO()
+        saved_cwd = os.getcwd()
+        saved_env = {k: os.environ.get(k) for k in passed_env}
+        status = 0
+        try:
+            for k in passed_env:
+                if env.get(k) is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = env[k]
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                try:
+                    # A missing cwd is an error of this command line only
+                    os.chdir(cwd)
+                    status = self.main.main(argv, self.models)
+                except SystemExit as e:
+                    if e.code is None:
+                        status = 0
+                    elif isinstance(e.code, int):
+                        status = e.code
+                    else:
+                        print(e.code, file=sys.stderr)
+                        status = 1
+                except Exception:
+                    traceback.print_exc()
+                    status = 1
+        finally:
+            os.chdir(saved_cwd)
+            for k, v in saved_env.items():
+                if v is None:
+                    os.environ.pop(k, None)
+                else:
+                    os.environ[k] = v
+        return status, out.getvalue(), err.getvalue()
+
+    def handle(self, request):
+        if request.get('command') == 'stop':
+            return dict(status=0, stdout='', stderr='', stop=True)
+        cwd, argv, env = request['cwd'], request['argv'], request.get('env', {})
+        status, out, err = self.run(cwd, argv, env)
+        if status == 0:
+            key = (cwd, tuple(argv), tuple(sorted(env.items())))
+            self.jobs[key] = {f: self.stat(f) for f in self.inputs(cwd, argv)}
+        return dict(status=status, stdout=out, stderr=err)
+
+    def check_inputs(self):
+        # Regenerate the outputs of command lines whose inputs changed
+        for (cwd, argv, env), inputs in list(self.jobs.items()):
+            changed = [f for f, st in inputs.items() if self.stat(f) != st]
+            if len(changed) == 0:
+                continue
+            print(f'{", ".join(changed)} changed, regenerating in {cwd}: {" ".join(argv)}', file=self.log)
+            for f in inputs:
+                inputs[f] = self.stat(f)
+            try:
+                status, out, err = self.run(cwd, list(argv), dict(env))
+            except Exception as e:
+                # Forget the job rather than fail on it every time
+                print(f'Regenerating failed, dropping the job: {e}', file=self.log)
+                del self.jobs[(cwd, argv, env)]
+                continue
+            if status != 0:
+                self.log.write(err)
+
+    def sources_changed(self):
+        return any(self.stat(f) != st for f, st in self.sources.items())
+
+    def serve_connection(self, conn):
+        # A bad request or a client going away gets an error reply (if
+        # it can still be sent) and the daemon carries on
+        conn.settimeout(self.receive_timeout)
+        try:
+            reply = self.handle(json.loads(receive(conn)))
+        except Exception as e:
+            print(f'Bad request: {e!r}', file=self.log)
+            reply = dict(status=1, stdout='', stderr=f'interface_gen daemon: bad request: {e!r}\n')
+        try:
+            conn.sendall(json.dumps(reply).encode())
+        except OSError as e:
+            print(f'Unable to send the reply: {e}', file=self.log)
+        return reply
+
+    def serve(self):
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        if os.path.exists(self.socket_path):
+            try:
+                listener.connect(self.socket_path)
+                raise RuntimeError(f'A daemon is already listening on {self.socket_path}')
+            except ConnectionRefusedError:
+                os.unlink(self.socket_path)
+            listener.close()
+            listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(self.socket_path)
+        listener.listen(16)
+        listener.settimeout(self.watch_interval)
+        os.chdir(os.path.dirname(os.path.abspath(__file__)))
+        print(f'Listening on {self.socket_path}', file=self.log)
+        try:
+            while True:
+                try:
+                    conn, addr = listener.accept()
+                except socket.timeout:
+                    conn = None
+                if conn is not None:
+                    with conn:
+                        reply = self.serve_connection(conn)
+                    if reply.get('stop'):
+                        return 0
+                if self.sources_changed():
+                    # Restart so output stays the same as one-shot mode
+                    print('Generator sources changed, restarting', file=self.log)
+                    listener.close()
+                    os.unlink(self.socket_path)
+                    os.execv(sys.executable, [sys.executable] + sys.argv)
+                self.check_inputs()
+        finally:
+            if listener.fileno() >= 0:
+                listener.close()
+                os.unlink(self.socket_path)
+
+
+def receive(conn):
+    # The sender shuts down its side when done
+    chunks = []
+    while True:
+        chunk = conn.recv(1 << 16)
+        if not chunk:
+            break
+        chunks.append(chunk)
+    return b''.join(chunks)
+
+def request(socket_path, message):
+    '''Reply of the daemon, None if none is listening'''
+    conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        conn.connect(socket_path)
+    except (FileNotFoundError, ConnectionRefusedError):
+        conn.close()
+        return None
+    with conn:
+        conn.sendall(json.dumps(message).encode())
+        conn.shutdown(socket.SHUT_WR)
+        return json.loads(receive(conn))
+
+def daemon_main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Generate seL4 RPC stubs through a long running daemon')
+    ap.add_argument('-s','--socket', dest='socket', default=default_socket(),
+                    type=str, help='Unix socket path (default=$INTERFACE_GEN_SOCKET or '
+                    '$TMPDIR/interface_gen-<uid>.sock)')
+    sub = ap.add_subparsers(dest='command', required=True)
+    serve = sub.add_parser('serve', help='Run the daemon')
+    serve.add_argument('--watch-interval', dest='watch_interval', default=0.5,
+                       type=float, help='Seconds between checks of the input files (default=0.5)')
+    serve.add_argument('--max-models', dest='max_models', default=64,
+                       type=int, help='Parsed interfaces kept in memory (default=64)')
+    serve.add_argument('--receive-timeout', dest='receive_timeout', default=10.0,
+                       type=float, help='Seconds a client gets to send its request (default=10)')
+    run = sub.add_parser('run', help='Run a main.py command line in the daemon')
+    run.add_argument('--no-fallback', dest='fallback', action='store_false',
+                     help='Fail instead of running main.py in process when no daemon is listening')
+    run.add_argument('argv', nargs=argparse.REMAINDER, help='main.py arguments')
+    sub.add_parser('stop', help='Stop the daemon')
+
+    args = ap.parse_args(argv)
+    if args.command == 'serve':
+        return GeneratorDaemon(args.socket, args.watch_interval, args.max_models,
+                               receive_timeout=args.receive_timeout).serve()
+    if args.command == 'stop':
+        if request(args.socket, dict(command='stop')) is None:
+            print(f'No daemon listening on {args.socket}', file=sys.stderr)
+            return 1
+        return 0
+
+    main_argv = args.argv[1:] if args.argv[:1] == ['--'] else args.argv
+    reply = request(args.socket, dict(cwd=os.getcwd(), argv=main_argv,
+                                      env={k: os.environ.get(k) for k in passed_env}))
+    if reply is None:
+        if not args.fallback:
+            print(f'No daemon listening on {args.socket}', file=sys.stderr)
+            return 1
+        import main
+        return main.main(main_argv)
+    sys.stdout.write(reply['stdout'])
+    sys.stderr.write(reply['stderr'])
+    return reply['status']
+
+if __name__ == '__main__':
+    sys.exit(daemon_main())
@@ -0,0 +1,60 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <blk_client.h>
+int put(uint64_t sector, seL4_Word len, const uint8_t *data)
+{
+    struct put_ipc_in {
+        uint64_t sector;
+        seL4_Word len;
+        seL4_Word data_offset;
+        seL4_Word data_len;
+    };
+
+    struct put_ipc_out {
+        int __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct put_ipc_in) <= seL4_MsgMaxLength,
+                   "struct put_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct put_ipc_out) <= seL4_MsgMaxLength,
+                   "struct put_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct put_ipc_in *argsin_ptr = (struct put_ipc_in *) &(ipc_buf->msg[0]);
+    struct put_ipc_out *argsout_ptr = (struct put_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct put_ipc_in) {sector, len, (seL4_Word)((const char *)data - (const char *)(blk_shm)), (seL4_Word)(len)});
+    message = seL4_MessageInfo_new(METHOD_NUM_PUT, 0, 0, sizeof_in_MRs(struct put_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
+int get(uint64_t sector, seL4_Word count, uint32_t *words)
+{
+    struct get_ipc_in {
+        uint64_t sector;
+        seL4_Word count;
+        seL4_Word words_offset;
+        seL4_Word words_len;
+    };
+
+    struct get_ipc_out {
+        int __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct get_ipc_in) <= seL4_MsgMaxLength,
+                   "struct get_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct get_ipc_out) <= seL4_MsgMaxLength,
+                   "struct get_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct get_ipc_in *argsin_ptr = (struct get_ipc_in *) &(ipc_buf->msg[0]);
+    struct get_ipc_out *argsout_ptr = (struct get_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct get_ipc_in) {sector, count, (seL4_Word)((const char *)words - (const char *)(blk_shm)), (seL4_Word)(count)});
+    message = seL4_MessageInfo_new(METHOD_NUM_GET, 0, 0, sizeof_in_MRs(struct get_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
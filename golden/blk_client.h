@@ -0,0 +1,16 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef BLK_CLIENT_CLIENT_H
+#define BLK_CLIENT_CLIENT_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define BLK_SHM_SIZE (0x10000)
+#define METHOD_NUM_PUT 11
+extern int put(uint64_t sector, seL4_Word len, const uint8_t *data);
+
+#define METHOD_NUM_GET 12
+extern int get(uint64_t sector, seL4_Word count, uint32_t *words);
+
+#endif /* BLK_CLIENT_CLIENT_H */
@@ -0,0 +1,15 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <blk_server.h>
+seL4_MessageInfo_t blk_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_PUT: msg = blk_put(ep, msginfo, reply, data); break;
+        case METHOD_NUM_GET: msg = blk_get(ep, msginfo, reply, data); break;
+
+        default: msg = blk_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
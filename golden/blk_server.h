@@ -0,0 +1,76 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef BLK_SERVER_SERVER_H
+#define BLK_SERVER_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define BLK_SHM_SIZE (0x10000)
+extern seL4_MessageInfo_t blk_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t blk_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/****************************************
+ * extern int put(uint64_t sector, seL4_Word len, const uint8_t *data);
+ */
+#define METHOD_NUM_PUT 11
+struct blk_put_ipc_in {
+    uint64_t sector;
+    seL4_Word len;
+    seL4_Word data_offset;
+    seL4_Word data_len;
+};
+
+struct blk_put_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct blk_put_ipc_in) <= seL4_MsgMaxLength,
+               "struct blk_put_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct blk_put_ipc_out) <= seL4_MsgMaxLength,
+               "struct blk_put_ipc_out does not fit in seL4_MsgMaxLength MRs");
+static inline const uint8_t *blk_put_data(const struct blk_put_ipc_in *in)
+{
+    if (in->data_offset > (seL4_Word)(BLK_SHM_SIZE) ||
+        in->data_len > ((seL4_Word)(BLK_SHM_SIZE) - in->data_offset) / sizeof(uint8_t) ||
+        in->data_offset % __alignof__(uint8_t) != 0) {
+        return NULL;
+    }
+    return (const uint8_t *)((char *)(blk_shm) + in->data_offset);
+}
+
+extern seL4_MessageInfo_t blk_put(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern int get(uint64_t sector, seL4_Word count, uint32_t *words);
+ */
+#define METHOD_NUM_GET 12
+struct blk_get_ipc_in {
+    uint64_t sector;
+    seL4_Word count;
+    seL4_Word words_offset;
+    seL4_Word words_len;
+};
+
+struct blk_get_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct blk_get_ipc_in) <= seL4_MsgMaxLength,
+               "struct blk_get_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct blk_get_ipc_out) <= seL4_MsgMaxLength,
+               "struct blk_get_ipc_out does not fit in seL4_MsgMaxLength MRs");
+static inline uint32_t *blk_get_words(const struct blk_get_ipc_in *in)
+{
+    if (in->words_offset > (seL4_Word)(BLK_SHM_SIZE) ||
+        in->words_len > ((seL4_Word)(BLK_SHM_SIZE) - in->words_offset) / sizeof(uint32_t) ||
+        in->words_offset % __alignof__(uint32_t) != 0) {
+        return NULL;
+    }
+    return (uint32_t *)((char *)(blk_shm) + in->words_offset);
+}
+
+extern seL4_MessageInfo_t blk_get(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+#endif /* BLK_SERVER_SERVER_H */
@@ -0,0 +1,4 @@
+# calls seen in a run of the calc test
+now 900
+add 40
+reset 3
@@ -0,0 +1,26 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_CLIENT_CLIENT_H
+#define CALC_CLIENT_CLIENT_H
+
+#include <sel4/sel4.h>
+#include <stdint.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define CSPACE_ROOT (1)
+#define METHOD_NUM_ADD 20
+extern int add(int a, int b);
+
+#define METHOD_NUM_NOW 11
+extern seL4_Word now(uint64_t *ticks);
+
+#define METHOD_NUM_MIX 12
+extern void mix(char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds, char *status);
+
+#define METHOD_NUM_GRANT 13
+extern int grant(seL4_Word rights, seL4_CPtr frame, seL4_CPtr badged);
+
+#define METHOD_NUM_RESET 14
+extern void reset(void);
+
+#endif /* CALC_CLIENT_CLIENT_H */
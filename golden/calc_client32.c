@@ -0,0 +1,133 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_client32.h>
+int add(int a, int b)
+{
+    struct add_ipc_in {
+        int a;
+        int b;
+    };
+
+    struct add_ipc_out {
+        int __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct add_ipc_in) <= seL4_MsgMaxLength,
+                   "struct add_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct add_ipc_out) <= seL4_MsgMaxLength,
+                   "struct add_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct add_ipc_in *argsin_ptr = (struct add_ipc_in *) &(ipc_buf->msg[0]);
+    struct add_ipc_out *argsout_ptr = (struct add_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct add_ipc_in) {a, b});
+    message = seL4_MessageInfo_new(METHOD_NUM_ADD, 0, 0, sizeof_in_MRs(struct add_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
+seL4_Word now(uint64_t *ticks)
+{
+    struct now_ipc_in {
+    };
+
+    struct now_ipc_out {
+        seL4_Word __ret;
+        uint64_t ticks;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct now_ipc_in) <= seL4_MsgMaxLength,
+                   "struct now_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct now_ipc_out) <= seL4_MsgMaxLength,
+                   "struct now_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct now_ipc_in *argsin_ptr = (struct now_ipc_in *) &(ipc_buf->msg[0]);
+    struct now_ipc_out *argsout_ptr = (struct now_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct now_ipc_in) {});
+    message = seL4_MessageInfo_new(METHOD_NUM_NOW, 0, 0, sizeof_in_MRs(struct now_ipc_in));
+    message = seL4_Call(1, message);
+    *ticks = argsout_ptr->ticks;
+    return argsout_ptr->__ret;
+}
+
+
+void mix(char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds, char *status)
+{
+    struct mix_ipc_in {
+        char tag;
+        seL4_Word acc;
+        uint64_t salt;
+        uint16_t rounds;
+    };
+
+    struct mix_ipc_out {
+        seL4_Word acc;
+        char status;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct mix_ipc_in) <= seL4_MsgMaxLength,
+                   "struct mix_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct mix_ipc_out) <= seL4_MsgMaxLength,
+                   "struct mix_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct mix_ipc_in *argsin_ptr = (struct mix_ipc_in *) &(ipc_buf->msg[0]);
+    struct mix_ipc_out *argsout_ptr = (struct mix_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct mix_ipc_in) {tag, *acc, salt, rounds});
+    message = seL4_MessageInfo_new(METHOD_NUM_MIX, 0, 0, sizeof_in_MRs(struct mix_ipc_in));
+    message = seL4_Call(1, message);
+    *acc = argsout_ptr->acc;
+    *status = argsout_ptr->status;
+}
+
+
+int grant(seL4_Word rights, seL4_CPtr frame, seL4_CPtr badged)
+{
+    struct grant_ipc_in {
+        seL4_Word rights;
+    };
+
+    struct grant_ipc_out {
+        int __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct grant_ipc_in) <= seL4_MsgMaxLength,
+                   "struct grant_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct grant_ipc_out) <= seL4_MsgMaxLength,
+                   "struct grant_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct grant_ipc_in *argsin_ptr = (struct grant_ipc_in *) &(ipc_buf->msg[0]);
+    struct grant_ipc_out *argsout_ptr = (struct grant_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct grant_ipc_in) {rights});
+    ipc_buf->caps_or_badges[0] = frame;
+    ipc_buf->receiveCNode = CSPACE_ROOT;
+    ipc_buf->receiveIndex = badged;
+    ipc_buf->receiveDepth = 64;
+    message = seL4_MessageInfo_new(METHOD_NUM_GRANT, 0, 1, sizeof_in_MRs(struct grant_ipc_in));
+    message = seL4_Call(2, message);
+    return argsout_ptr->__ret;
+}
+
+
+void reset(void)
+{
+    struct reset_ipc_in {
+    };
+
+    struct reset_ipc_out {
+    };
+
+    _Static_assert(sizeof_in_MRs(struct reset_ipc_in) <= seL4_MsgMaxLength,
+                   "struct reset_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct reset_ipc_out) <= seL4_MsgMaxLength,
+                   "struct reset_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    message = seL4_MessageInfo_new(METHOD_NUM_RESET, 0, 0, sizeof_in_MRs(struct reset_ipc_in));
+    message = seL4_Call(1, message);
+}
+
+
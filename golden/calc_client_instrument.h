@@ -0,0 +1,77 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_CLIENT_INSTRUMENT_CLIENT_H
+#define CALC_CLIENT_INSTRUMENT_CLIENT_H
+
+#include <sel4/sel4.h>
+#include <stdint.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define CSPACE_ROOT (1)
+
+/* Per-method call statistics, define CALC_CLIENT_STATS to collect them */
+#define CALC_CLIENT_STATS_METHODS 5
+#define CALC_CLIENT_STATS_IDX_ADD 0
+#define CALC_CLIENT_STATS_IDX_NOW 1
+#define CALC_CLIENT_STATS_IDX_MIX 2
+#define CALC_CLIENT_STATS_IDX_GRANT 3
+#define CALC_CLIENT_STATS_IDX_RESET 4
+#ifdef CALC_CLIENT_STATS
+#ifndef CALC_CLIENT_CYCLES
+#if defined(__x86_64__) || defined(__i386__)
+#define CALC_CLIENT_CYCLES() __builtin_ia32_rdtsc()
+#elif defined(__aarch64__)
+#define CALC_CLIENT_CYCLES() ({ seL4_Uint64 _c; __asm__ volatile("mrs %0, cntvct_el0" : "=r"(_c)); _c; })
+#elif defined(__riscv)
+#define CALC_CLIENT_CYCLES() ({ unsigned long _c; __asm__ volatile("rdcycle %0" : "=r"(_c)); (seL4_Uint64)_c; })
+#else
+#define CALC_CLIENT_CYCLES() ((seL4_Uint64)0)
+#endif
+#endif
+#ifndef CALC_CLIENT_STATS_BUCKETS
+#define CALC_CLIENT_STATS_BUCKETS 32
+#endif
+struct calc_client_stats {
+    seL4_Uint64 calls;
+    seL4_Uint64 cycles;
+    seL4_Uint64 max_cycles;
+    /* hist[i] counts calls taking [2^(i-1), 2^i) cycles, the last bucket the rest */
+    seL4_Uint64 hist[CALC_CLIENT_STATS_BUCKETS];
+};
+extern struct calc_client_stats calc_client_stats[CALC_CLIENT_STATS_METHODS];
+extern const char *const calc_client_stats_names[CALC_CLIENT_STATS_METHODS];
+static inline void calc_client_stat_record(struct calc_client_stats *s, seL4_Uint64 cycles)
+{
+    unsigned bucket = cycles == 0 ? 0 : 64 - __builtin_clzll(cycles);
+    if (bucket >= CALC_CLIENT_STATS_BUCKETS) {
+        bucket = CALC_CLIENT_STATS_BUCKETS - 1;
+    }
+    s->calls++;
+    s->cycles += cycles;
+    if (cycles > s->max_cycles) {
+        s->max_cycles = cycles;
+    }
+    s->hist[bucket]++;
+}
+#define CALC_CLIENT_STAT_BEGIN(idx) seL4_Uint64 calc_client_stat_start = CALC_CLIENT_CYCLES()
+#define CALC_CLIENT_STAT_END(idx) calc_client_stat_record(&calc_client_stats[idx], CALC_CLIENT_CYCLES() - calc_client_stat_start)
+#else
+#define CALC_CLIENT_STAT_BEGIN(idx) do { } while (0)
+#define CALC_CLIENT_STAT_END(idx) do { } while (0)
+#endif
+#define METHOD_NUM_ADD 20
+extern int add(int a, int b);
+
+#define METHOD_NUM_NOW 11
+extern seL4_Word now(uint64_t *ticks);
+
+#define METHOD_NUM_MIX 12
+extern void mix(char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds, char *status);
+
+#define METHOD_NUM_GRANT 13
+extern int grant(seL4_Word rights, seL4_CPtr frame, seL4_CPtr badged);
+
+#define METHOD_NUM_RESET 14
+extern void reset(void);
+
+#endif /* CALC_CLIENT_INSTRUMENT_CLIENT_H */
@@ -0,0 +1,4 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_client_split.h>
@@ -0,0 +1,135 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_COMPOSITE_SERVER_SERVER_H
+#define CALC_COMPOSITE_SERVER_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define CSPACE_ROOT (1)
+extern seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/*
+ * calc_dispatch() returns CALC_NO_REPLY when no reply must be sent,
+ * either because the method is oneway or because the handler deferred its reply.
+ */
+#ifndef CALC_NO_REPLY_LABEL
+#define CALC_NO_REPLY_LABEL 0xfffff
+#endif
+#define CALC_NO_REPLY seL4_MessageInfo_new(CALC_NO_REPLY_LABEL, 0, 0, 0)
+
+/*
+ * calc_dispatch_loop() receives on ep forever, passing each message
+ * to calc_dispatch() and answering with seL4_ReplyRecv. reply points
+ * to the reply object cptr (used on MCS kernels) and calc_badge holds the badge
+ * of the current message. A handler returning CALC_NO_REPLY defers its reply,
+ * the loop then only waits for the next message.
+ *
+ * The next receive overwrites the reply capability of the caller, so a handler
+ * deferring its reply must first keep it: on MCS kernels by setting *(seL4_CPtr *)reply
+ * to a fresh reply object (the loop receives into it from then on) and keeping the
+ * old one, on other kernels by moving the caller's reply cap into a free slot with
+ * seL4_CNode_SaveCaller(). The reply is later sent with seL4_Send() on the kept cap.
+ */
+extern seL4_Word calc_badge;
+extern void calc_dispatch_loop(seL4_CPtr ep, seL4_CPtr reply, void *data);
+
+/****************************************
+ * extern int add(int a, int b);
+ */
+#define METHOD_NUM_ADD 20
+struct calc_add_ipc_in {
+    int a;
+    int b;
+};
+
+struct calc_add_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_add_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_add_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_add_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_add_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_add(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern seL4_Word now(uint64_t *ticks);
+ */
+#define METHOD_NUM_NOW 11
+struct calc_now_ipc_in {
+};
+
+struct calc_now_ipc_out {
+    seL4_Word __ret;
+    uint64_t ticks;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_now_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_now_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_now_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_now_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_now(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void mix(char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds, char *status);
+ */
+#define METHOD_NUM_MIX 12
+struct calc_mix_ipc_in {
+    char tag;
+    seL4_Word acc;
+    uint64_t salt;
+    uint16_t rounds;
+};
+
+struct calc_mix_ipc_out {
+    seL4_Word acc;
+    char status;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_mix_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_mix_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_mix_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_mix_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_mix(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern int grant(seL4_Word rights);
+ */
+#define METHOD_NUM_GRANT 13
+struct calc_grant_ipc_in {
+    seL4_Word rights;
+};
+
+struct calc_grant_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_grant_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_grant_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_grant_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_grant_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_grant(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void reset(void);
+ */
+#define METHOD_NUM_RESET 14
+struct calc_reset_ipc_in {
+};
+
+struct calc_reset_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_reset_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_reset_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_reset_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_reset_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_reset(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+#endif /* CALC_COMPOSITE_SERVER_SERVER_H */
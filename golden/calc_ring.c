@@ -0,0 +1,60 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_ring.h>
+
+void calc_ring_drain(struct calc_ring_req_ring *req, struct calc_ring_resp_ring *resp, seL4_CPtr client_ntfn, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    int responses = 0;
+    while (!calc_ring_req_ring_empty(req) && !calc_ring_resp_ring_full(resp)) {
+        struct calc_ring_req *e = calc_ring_req_ring_front(req);
+        struct calc_ring_resp *r = &resp->entries[resp->head & (CALC_RING_SIZE - 1)];
+        seL4_MessageInfo_t reply_info;
+        int respond = 1;
+        r->cookie = e->cookie;
+        switch (e->label) {
+        case METHOD_NUM_ADD:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.add, sizeof(struct calc_ring_add_ipc_in));
+            reply_info = calc_add(0, seL4_MessageInfo_new(METHOD_NUM_ADD, 0, 0, sizeof_in_MRs(struct calc_ring_add_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.add, &ipc_buf->msg[0], sizeof(struct calc_ring_add_ipc_out));
+            break;
+        case METHOD_NUM_NOW:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.now, sizeof(struct calc_ring_now_ipc_in));
+            reply_info = calc_now(0, seL4_MessageInfo_new(METHOD_NUM_NOW, 0, 0, sizeof_in_MRs(struct calc_ring_now_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.now, &ipc_buf->msg[0], sizeof(struct calc_ring_now_ipc_out));
+            break;
+        case METHOD_NUM_MIX:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.mix, sizeof(struct calc_ring_mix_ipc_in));
+            reply_info = calc_mix(0, seL4_MessageInfo_new(METHOD_NUM_MIX, 0, 0, sizeof_in_MRs(struct calc_ring_mix_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.mix, &ipc_buf->msg[0], sizeof(struct calc_ring_mix_ipc_out));
+            break;
+        case METHOD_NUM_RESET:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.reset, sizeof(struct calc_ring_reset_ipc_in));
+            reply_info = calc_reset(0, seL4_MessageInfo_new(METHOD_NUM_RESET, 0, 0, sizeof_in_MRs(struct calc_ring_reset_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.reset, &ipc_buf->msg[0], sizeof(struct calc_ring_reset_ipc_out));
+            break;
+        default:
+            reply_info = calc_error(0, seL4_MessageInfo_new(e->label, 0, 0, 0), NULL, data);
+            break;
+        }
+        calc_ring_req_ring_pop(req);
+        if (respond) {
+            r->label = seL4_MessageInfo_get_label(reply_info);
+            __atomic_store_n(&resp->head, resp->head + 1, __ATOMIC_RELEASE);
+            responses++;
+        }
+    }
+    if (responses) {
+        calc_ring_resp_ring_kick(resp, client_ntfn);
+    }
+}
+
+void calc_ring_serve(struct calc_ring_req_ring *req, struct calc_ring_resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data)
+{
+    for (;;) {
+        calc_ring_req_ring_wait(req, ntfn);
+        calc_ring_resp_ring_wait_space(resp, ntfn);
+        calc_ring_drain(req, resp, client_ntfn, data);
+    }
+}
@@ -0,0 +1,310 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_RING_RING_H
+#define CALC_RING_RING_H
+
+#include <sel4/sel4.h>
+#include <stdint.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define CSPACE_ROOT (1)
+
+/* Number of entries in each ring, must be a power of two */
+#ifndef CALC_RING_SIZE
+#define CALC_RING_SIZE 64
+#endif
+
+#define METHOD_NUM_ADD 20
+struct calc_ring_add_ipc_in {
+    int a;
+    int b;
+};
+
+struct calc_ring_add_ipc_out {
+    int __ret;
+};
+
+#define METHOD_NUM_NOW 11
+struct calc_ring_now_ipc_in {
+};
+
+struct calc_ring_now_ipc_out {
+    seL4_Word __ret;
+    uint64_t ticks;
+};
+
+#define METHOD_NUM_MIX 12
+struct calc_ring_mix_ipc_in {
+    char tag;
+    seL4_Word acc;
+    uint64_t salt;
+    uint16_t rounds;
+};
+
+struct calc_ring_mix_ipc_out {
+    seL4_Word acc;
+    char status;
+};
+
+/* grant has capability args and is not available on the ring */
+#define METHOD_NUM_RESET 14
+struct calc_ring_reset_ipc_in {
+};
+
+struct calc_ring_reset_ipc_out {
+};
+
+struct calc_ring_req {
+    seL4_Word label;
+    seL4_Word cookie;
+    union {
+        struct calc_ring_add_ipc_in add;
+        struct calc_ring_now_ipc_in now;
+        struct calc_ring_mix_ipc_in mix;
+        struct calc_ring_reset_ipc_in reset;
+    } u;
+};
+
+/* label is the label of the message info returned by the server handler */
+struct calc_ring_resp {
+    seL4_Word label;
+    seL4_Word cookie;
+    union {
+        struct calc_ring_add_ipc_out add;
+        struct calc_ring_now_ipc_out now;
+        struct calc_ring_mix_ipc_out mix;
+        struct calc_ring_reset_ipc_out reset;
+    } u;
+};
+
+struct calc_ring_req_ring {
+    seL4_Word head;              /* next entry to produce, written by the producer */
+    seL4_Word tail;              /* next entry to consume, written by the consumer */
+    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */
+    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */
+    struct calc_ring_req entries[CALC_RING_SIZE];
+};
+
+static inline int calc_ring_req_ring_empty(struct calc_ring_req_ring *ring)
+{
+    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;
+}
+
+static inline int calc_ring_req_ring_full(struct calc_ring_req_ring *ring)
+{
+    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == CALC_RING_SIZE;
+}
+
+/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */
+static inline void calc_ring_req_ring_kick(struct calc_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has entries */
+static inline void calc_ring_req_ring_wait(struct calc_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    while (calc_ring_req_ring_empty(ring)) {
+        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (calc_ring_req_ring_empty(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+static inline struct calc_ring_req *calc_ring_req_ring_front(struct calc_ring_req_ring *ring)
+{
+    return &ring->entries[ring->tail & (CALC_RING_SIZE - 1)];
+}
+
+static inline void calc_ring_req_ring_pop(struct calc_ring_req_ring *ring)
+{
+    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);
+}
+
+/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */
+static inline void calc_ring_req_ring_release(struct calc_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has a free entry */
+static inline void calc_ring_req_ring_wait_space(struct calc_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    while (calc_ring_req_ring_full(ring)) {
+        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (calc_ring_req_ring_full(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+struct calc_ring_resp_ring {
+    seL4_Word head;              /* next entry to produce, written by the producer */
+    seL4_Word tail;              /* next entry to consume, written by the consumer */
+    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */
+    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */
+    struct calc_ring_resp entries[CALC_RING_SIZE];
+};
+
+static inline int calc_ring_resp_ring_empty(struct calc_ring_resp_ring *ring)
+{
+    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;
+}
+
+static inline int calc_ring_resp_ring_full(struct calc_ring_resp_ring *ring)
+{
+    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == CALC_RING_SIZE;
+}
+
+/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */
+static inline void calc_ring_resp_ring_kick(struct calc_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has entries */
+static inline void calc_ring_resp_ring_wait(struct calc_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    while (calc_ring_resp_ring_empty(ring)) {
+        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (calc_ring_resp_ring_empty(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+static inline struct calc_ring_resp *calc_ring_resp_ring_front(struct calc_ring_resp_ring *ring)
+{
+    return &ring->entries[ring->tail & (CALC_RING_SIZE - 1)];
+}
+
+static inline void calc_ring_resp_ring_pop(struct calc_ring_resp_ring *ring)
+{
+    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);
+}
+
+/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */
+static inline void calc_ring_resp_ring_release(struct calc_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has a free entry */
+static inline void calc_ring_resp_ring_wait_space(struct calc_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    while (calc_ring_resp_ring_full(ring)) {
+        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (calc_ring_resp_ring_full(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+/*
+ * Copy out the next response, returns -1 if there is none. server_ntfn is
+ * rung if the server waits for room in the ring, so it must be the
+ * notification the server waits on.
+ */
+static inline int calc_ring_resp_ring_dequeue(struct calc_ring_resp_ring *ring, struct calc_ring_resp *resp, seL4_CPtr server_ntfn)
+{
+    if (calc_ring_resp_ring_empty(ring)) {
+        return -1;
+    }
+    *resp = *calc_ring_resp_ring_front(ring);
+    calc_ring_resp_ring_pop(ring);
+    calc_ring_resp_ring_release(ring, server_ntfn);
+    return 0;
+}
+
+static inline int calc_ring_add_enqueue(struct calc_ring_req_ring *ring, seL4_Word cookie, int a, int b)
+{
+    struct calc_ring_req *e;
+    if (calc_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (CALC_RING_SIZE - 1)];
+    e->label = METHOD_NUM_ADD;
+    e->cookie = cookie;
+    e->u.add.a = a;
+    e->u.add.b = b;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+static inline int calc_ring_now_enqueue(struct calc_ring_req_ring *ring, seL4_Word cookie)
+{
+    struct calc_ring_req *e;
+    if (calc_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (CALC_RING_SIZE - 1)];
+    e->label = METHOD_NUM_NOW;
+    e->cookie = cookie;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+static inline int calc_ring_mix_enqueue(struct calc_ring_req_ring *ring, seL4_Word cookie, char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds)
+{
+    struct calc_ring_req *e;
+    if (calc_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (CALC_RING_SIZE - 1)];
+    e->label = METHOD_NUM_MIX;
+    e->cookie = cookie;
+    e->u.mix.tag = tag;
+    e->u.mix.acc = *acc;
+    e->u.mix.salt = salt;
+    e->u.mix.rounds = rounds;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+static inline int calc_ring_reset_enqueue(struct calc_ring_req_ring *ring, seL4_Word cookie)
+{
+    struct calc_ring_req *e;
+    if (calc_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (CALC_RING_SIZE - 1)];
+    e->label = METHOD_NUM_RESET;
+    e->cookie = cookie;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+extern void calc_ring_drain(struct calc_ring_req_ring *req, struct calc_ring_resp_ring *resp, seL4_CPtr client_ntfn, void *data);
+extern void calc_ring_serve(struct calc_ring_req_ring *req, struct calc_ring_resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data);
+extern seL4_MessageInfo_t calc_add(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_now(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_mix(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_reset(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+#endif /* CALC_RING_RING_H */
@@ -0,0 +1,18 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_server.h>
+seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_ADD: msg = calc_add(ep, msginfo, reply, data); break;
+        case METHOD_NUM_NOW: msg = calc_now(ep, msginfo, reply, data); break;
+        case METHOD_NUM_MIX: msg = calc_mix(ep, msginfo, reply, data); break;
+        case METHOD_NUM_GRANT: msg = calc_grant(ep, msginfo, reply, data); break;
+        case METHOD_NUM_RESET: msg = calc_reset(ep, msginfo, reply, data); break;
+
+        default: msg = calc_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
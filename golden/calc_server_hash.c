@@ -0,0 +1,46 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_server_hash.h>
+typedef seL4_MessageInfo_t (*calc_dispatch_handler_t)(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+static inline seL4_Uint32 calc_dispatch_mix(seL4_Uint32 x)
+{
+    x ^= x >> 16;
+    x *= 0x85ebca6bu;
+    x ^= x >> 13;
+    x *= 0xc2b2ae35u;
+    x ^= x >> 16;
+    return x;
+}
+
+static const seL4_Uint32 calc_dispatch_disp[3] = {
+    9, 0, 8
+};
+
+static const seL4_Word calc_dispatch_keys[5] = {
+    METHOD_NUM_NOW,
+    METHOD_NUM_RESET,
+    METHOD_NUM_GRANT,
+    METHOD_NUM_MIX,
+    METHOD_NUM_ADD,
+};
+
+static const calc_dispatch_handler_t calc_dispatch_handlers[5] = {
+    calc_now,
+    calc_reset,
+    calc_grant,
+    calc_mix,
+    calc_add,
+};
+
+seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_Word label = seL4_MessageInfo_get_label(msginfo);
+    seL4_Uint32 d = calc_dispatch_disp[calc_dispatch_mix(label) % 3];
+    seL4_Uint32 slot = calc_dispatch_mix(label ^ (d * 0x9e3779b9u)) % 5;
+    if (calc_dispatch_keys[slot] == label) {
+        return calc_dispatch_handlers[slot](ep, msginfo, reply, data);
+    }
+    return calc_error(ep, msginfo, reply, data);
+}
@@ -0,0 +1,94 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_server_instrument.h>
+#ifdef CALC_STATS
+struct calc_stats calc_stats[CALC_STATS_METHODS];
+const char *const calc_stats_names[CALC_STATS_METHODS] = {
+    [CALC_STATS_IDX_ADD] = "add",
+    [CALC_STATS_IDX_NOW] = "now",
+    [CALC_STATS_IDX_MIX] = "mix",
+    [CALC_STATS_IDX_GRANT] = "grant",
+    [CALC_STATS_IDX_RESET] = "reset",
+};
+#endif
+
+#ifdef CALC_STATS
+static seL4_MessageInfo_t calc_add_stat(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    CALC_STAT_BEGIN(CALC_STATS_IDX_ADD);
+    msg = calc_add(ep, msginfo, reply, data);
+    CALC_STAT_END(CALC_STATS_IDX_ADD);
+    return msg;
+}
+#else
+#define calc_add_stat calc_add
+#endif
+
+#ifdef CALC_STATS
+static seL4_MessageInfo_t calc_now_stat(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    CALC_STAT_BEGIN(CALC_STATS_IDX_NOW);
+    msg = calc_now(ep, msginfo, reply, data);
+    CALC_STAT_END(CALC_STATS_IDX_NOW);
+    return msg;
+}
+#else
+#define calc_now_stat calc_now
+#endif
+
+#ifdef CALC_STATS
+static seL4_MessageInfo_t calc_mix_stat(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    CALC_STAT_BEGIN(CALC_STATS_IDX_MIX);
+    msg = calc_mix(ep, msginfo, reply, data);
+    CALC_STAT_END(CALC_STATS_IDX_MIX);
+    return msg;
+}
+#else
+#define calc_mix_stat calc_mix
+#endif
+
+#ifdef CALC_STATS
+static seL4_MessageInfo_t calc_grant_stat(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    CALC_STAT_BEGIN(CALC_STATS_IDX_GRANT);
+    msg = calc_grant(ep, msginfo, reply, data);
+    CALC_STAT_END(CALC_STATS_IDX_GRANT);
+    return msg;
+}
+#else
+#define calc_grant_stat calc_grant
+#endif
+
+#ifdef CALC_STATS
+static seL4_MessageInfo_t calc_reset_stat(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    CALC_STAT_BEGIN(CALC_STATS_IDX_RESET);
+    msg = calc_reset(ep, msginfo, reply, data);
+    CALC_STAT_END(CALC_STATS_IDX_RESET);
+    return msg;
+}
+#else
+#define calc_reset_stat calc_reset
+#endif
+
+seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_ADD: msg = calc_add_stat(ep, msginfo, reply, data); break;
+        case METHOD_NUM_NOW: msg = calc_now_stat(ep, msginfo, reply, data); break;
+        case METHOD_NUM_MIX: msg = calc_mix_stat(ep, msginfo, reply, data); break;
+        case METHOD_NUM_GRANT: msg = calc_grant_stat(ep, msginfo, reply, data); break;
+        case METHOD_NUM_RESET: msg = calc_reset_stat(ep, msginfo, reply, data); break;
+
+        default: msg = calc_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
@@ -0,0 +1,161 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_SERVER_INSTRUMENT_SERVER_H
+#define CALC_SERVER_INSTRUMENT_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define CSPACE_ROOT (1)
+extern seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/****************************************
+ * extern int add(int a, int b);
+ */
+#define METHOD_NUM_ADD 20
+struct calc_add_ipc_in {
+    int a;
+    int b;
+};
+
+struct calc_add_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_add_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_add_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_add_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_add_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_add(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern seL4_Word now(uint64_t *ticks);
+ */
+#define METHOD_NUM_NOW 11
+struct calc_now_ipc_in {
+};
+
+struct calc_now_ipc_out {
+    seL4_Word __ret;
+    uint64_t ticks;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_now_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_now_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_now_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_now_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_now(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void mix(char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds, char *status);
+ */
+#define METHOD_NUM_MIX 12
+struct calc_mix_ipc_in {
+    char tag;
+    seL4_Word acc;
+    uint64_t salt;
+    uint16_t rounds;
+};
+
+struct calc_mix_ipc_out {
+    seL4_Word acc;
+    char status;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_mix_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_mix_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_mix_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_mix_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_mix(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern int grant(seL4_Word rights);
+ */
+#define METHOD_NUM_GRANT 13
+struct calc_grant_ipc_in {
+    seL4_Word rights;
+};
+
+struct calc_grant_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_grant_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_grant_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_grant_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_grant_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_grant(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void reset(void);
+ */
+#define METHOD_NUM_RESET 14
+struct calc_reset_ipc_in {
+};
+
+struct calc_reset_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_reset_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_reset_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_reset_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_reset_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_reset(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/* Per-method call statistics, define CALC_STATS to collect them */
+#define CALC_STATS_METHODS 5
+#define CALC_STATS_IDX_ADD 0
+#define CALC_STATS_IDX_NOW 1
+#define CALC_STATS_IDX_MIX 2
+#define CALC_STATS_IDX_GRANT 3
+#define CALC_STATS_IDX_RESET 4
+#ifdef CALC_STATS
+#ifndef CALC_CYCLES
+#if defined(__x86_64__) || defined(__i386__)
+#define CALC_CYCLES() __builtin_ia32_rdtsc()
+#elif defined(__aarch64__)
+#define CALC_CYCLES() ({ seL4_Uint64 _c; __asm__ volatile("mrs %0, cntvct_el0" : "=r"(_c)); _c; })
+#elif defined(__riscv)
+#define CALC_CYCLES() ({ unsigned long _c; __asm__ volatile("rdcycle %0" : "=r"(_c)); (seL4_Uint64)_c; })
+#else
+#define CALC_CYCLES() ((seL4_Uint64)0)
+#endif
+#endif
+#ifndef CALC_STATS_BUCKETS
+#define CALC_STATS_BUCKETS 32
+#endif
+struct calc_stats {
+    seL4_Uint64 calls;
+    seL4_Uint64 cycles;
+    seL4_Uint64 max_cycles;
+    /* hist[i] counts calls taking [2^(i-1), 2^i) cycles, the last bucket the rest */
+    seL4_Uint64 hist[CALC_STATS_BUCKETS];
+};
+extern struct calc_stats calc_stats[CALC_STATS_METHODS];
+extern const char *const calc_stats_names[CALC_STATS_METHODS];
+static inline void calc_stat_record(struct calc_stats *s, seL4_Uint64 cycles)
+{
+    unsigned bucket = cycles == 0 ? 0 : 64 - __builtin_clzll(cycles);
+    if (bucket >= CALC_STATS_BUCKETS) {
+        bucket = CALC_STATS_BUCKETS - 1;
+    }
+    s->calls++;
+    s->cycles += cycles;
+    if (cycles > s->max_cycles) {
+        s->max_cycles = cycles;
+    }
+    s->hist[bucket]++;
+}
+#define CALC_STAT_BEGIN(idx) seL4_Uint64 calc_stat_start = CALC_CYCLES()
+#define CALC_STAT_END(idx) calc_stat_record(&calc_stats[idx], CALC_CYCLES() - calc_stat_start)
+#else
+#define CALC_STAT_BEGIN(idx) do { } while (0)
+#define CALC_STAT_END(idx) do { } while (0)
+#endif
+#endif /* CALC_SERVER_INSTRUMENT_SERVER_H */
@@ -0,0 +1,110 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_SERVER_LAYOUT32_SERVER_H
+#define CALC_SERVER_LAYOUT32_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+4-1)/4)
+#define CSPACE_ROOT (1)
+extern seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/****************************************
+ * extern int add(int a, int b);
+ */
+#define METHOD_NUM_ADD 20
+struct calc_add_ipc_in {
+    int a;
+    int b;
+};
+
+struct calc_add_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_add_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_add_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_add_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_add_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_add(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern seL4_Word now(uint64_t *ticks);
+ */
+#define METHOD_NUM_NOW 11
+struct calc_now_ipc_in {
+};
+
+struct calc_now_ipc_out {
+    uint64_t ticks;
+    seL4_Word __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_now_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_now_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_now_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_now_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_now(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void mix(char tag, seL4_Word *acc, uint64_t salt, const uint16_t rounds, char *status);
+ */
+#define METHOD_NUM_MIX 12
+struct calc_mix_ipc_in {
+    uint64_t salt;
+    seL4_Word acc;
+    uint16_t rounds;
+    char tag;
+};
+
+struct calc_mix_ipc_out {
+    seL4_Word acc;
+    char status;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_mix_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_mix_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_mix_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_mix_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_mix(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern int grant(seL4_Word rights);
+ */
+#define METHOD_NUM_GRANT 13
+struct calc_grant_ipc_in {
+    seL4_Word rights;
+};
+
+struct calc_grant_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_grant_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_grant_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_grant_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_grant_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_grant(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void reset(void);
+ */
+#define METHOD_NUM_RESET 14
+struct calc_reset_ipc_in {
+};
+
+struct calc_reset_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct calc_reset_ipc_in) <= seL4_MsgMaxLength,
+               "struct calc_reset_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct calc_reset_ipc_out) <= seL4_MsgMaxLength,
+               "struct calc_reset_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t calc_reset(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+#endif /* CALC_SERVER_LAYOUT32_SERVER_H */
@@ -0,0 +1,27 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_server_table.h>
+typedef seL4_MessageInfo_t (*calc_dispatch_handler_t)(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+static const calc_dispatch_handler_t calc_dispatch_table[10] = {
+    [METHOD_NUM_NOW - 11] = calc_now,
+    [METHOD_NUM_MIX - 11] = calc_mix,
+    [METHOD_NUM_GRANT - 11] = calc_grant,
+    [METHOD_NUM_RESET - 11] = calc_reset,
+    [4] = calc_error,
+    [5] = calc_error,
+    [6] = calc_error,
+    [7] = calc_error,
+    [8] = calc_error,
+    [METHOD_NUM_ADD - 11] = calc_add,
+};
+
+seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_Word index = seL4_MessageInfo_get_label(msginfo) - 11;
+    if (index < 10) {
+        return calc_dispatch_table[index](ep, msginfo, reply, data);
+    }
+    return calc_error(ep, msginfo, reply, data);
+}
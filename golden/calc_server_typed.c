@@ -0,0 +1,82 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_server_typed.h>
+seL4_MessageInfo_t calc_add(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word label;
+    if (seL4_MessageInfo_get_length(msginfo) < sizeof_in_MRs(struct calc_add_ipc_in)) {
+        return calc_error(ep, msginfo, reply, data);
+    }
+    label = calc_add_typed(ep, msginfo, reply, data, (const struct calc_add_ipc_in *)&ipc_buf->msg[0], (struct calc_add_ipc_out *)&ipc_buf->msg[0]);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, sizeof_in_MRs(struct calc_add_ipc_out));
+}
+
+seL4_MessageInfo_t calc_now(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word label;
+    label = calc_now_typed(ep, msginfo, reply, data, (struct calc_now_ipc_out *)&ipc_buf->msg[0]);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, sizeof_in_MRs(struct calc_now_ipc_out));
+}
+
+seL4_MessageInfo_t calc_mix(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word label;
+    if (seL4_MessageInfo_get_length(msginfo) < sizeof_in_MRs(struct calc_mix_ipc_in)) {
+        return calc_error(ep, msginfo, reply, data);
+    }
+    label = calc_mix_typed(ep, msginfo, reply, data, (const struct calc_mix_ipc_in *)&ipc_buf->msg[0], (struct calc_mix_ipc_out *)&ipc_buf->msg[0]);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, sizeof_in_MRs(struct calc_mix_ipc_out));
+}
+
+seL4_MessageInfo_t calc_grant(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word label;
+    if (seL4_MessageInfo_get_length(msginfo) < sizeof_in_MRs(struct calc_grant_ipc_in) ||
+        seL4_MessageInfo_get_extraCaps(msginfo) < 1) {
+        return calc_error(ep, msginfo, reply, data);
+    }
+    label = calc_grant_typed(ep, msginfo, reply, data, (const struct calc_grant_ipc_in *)&ipc_buf->msg[0], (struct calc_grant_ipc_out *)&ipc_buf->msg[0]);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 1, sizeof_in_MRs(struct calc_grant_ipc_out));
+}
+
+seL4_MessageInfo_t calc_reset(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_Word label;
+    label = calc_reset_typed(ep, msginfo, reply, data);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, 0);
+}
+
+seL4_MessageInfo_t calc_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_ADD: msg = calc_add(ep, msginfo, reply, data); break;
+        case METHOD_NUM_NOW: msg = calc_now(ep, msginfo, reply, data); break;
+        case METHOD_NUM_MIX: msg = calc_mix(ep, msginfo, reply, data); break;
+        case METHOD_NUM_GRANT: msg = calc_grant(ep, msginfo, reply, data); break;
+        case METHOD_NUM_RESET: msg = calc_reset(ep, msginfo, reply, data); break;
+
+        default: msg = calc_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
@@ -0,0 +1,56 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <calc_timer.h>
+
+static seL4_MessageInfo_t timer_arm_oneway(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    timer_arm(ep, msginfo, reply, data);
+    return TIMER_NO_REPLY;
+}
+
+seL4_MessageInfo_t calc_timer(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_ADD: msg = calc_add(ep, msginfo, reply, data); break;
+        case METHOD_NUM_NOW: msg = calc_now(ep, msginfo, reply, data); break;
+        case METHOD_NUM_MIX: msg = calc_mix(ep, msginfo, reply, data); break;
+        case METHOD_NUM_GRANT: msg = calc_grant(ep, msginfo, reply, data); break;
+        case METHOD_NUM_RESET: msg = calc_reset(ep, msginfo, reply, data); break;
+        case METHOD_NUM_ARM: msg = timer_arm_oneway(ep, msginfo, reply, data); break;
+        case METHOD_NUM_ELAPSED: msg = timer_elapsed(ep, msginfo, reply, data); break;
+
+        default: msg = calc_timer_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
+
+seL4_Word calc_timer_badge;
+
+void calc_timer_loop(seL4_CPtr ep, seL4_CPtr reply, void *data)
+{
+    seL4_MessageInfo_t msginfo;
+    seL4_MessageInfo_t reply_info;
+#ifdef CONFIG_KERNEL_MCS
+    msginfo = seL4_Recv(ep, &calc_timer_badge, reply);
+#else
+    msginfo = seL4_Recv(ep, &calc_timer_badge);
+#endif
+    for (;;) {
+        reply_info = calc_timer(ep, msginfo, &reply, data);
+        if (seL4_MessageInfo_get_label(reply_info) == CALC_TIMER_NO_REPLY_LABEL) {
+#ifdef CONFIG_KERNEL_MCS
+            msginfo = seL4_Recv(ep, &calc_timer_badge, reply);
+#else
+            msginfo = seL4_Recv(ep, &calc_timer_badge);
+#endif
+        } else {
+#ifdef CONFIG_KERNEL_MCS
+            msginfo = seL4_ReplyRecv(ep, reply_info, &calc_timer_badge, reply);
+#else
+            msginfo = seL4_ReplyRecv(ep, reply_info, &calc_timer_badge);
+#endif
+        }
+    }
+}
@@ -0,0 +1,50 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef CALC_TIMER_COMPOSITE_H
+#define CALC_TIMER_COMPOSITE_H
+
+#ifndef CALC_TIMER_NO_REPLY_LABEL
+#define CALC_TIMER_NO_REPLY_LABEL 0xfffff
+#endif
+#ifndef CALC_NO_REPLY_LABEL
+#define CALC_NO_REPLY_LABEL CALC_TIMER_NO_REPLY_LABEL
+#endif
+#ifndef TIMER_NO_REPLY_LABEL
+#define TIMER_NO_REPLY_LABEL CALC_TIMER_NO_REPLY_LABEL
+#endif
+
+#include <calc_composite_server.h>
+#include <timer_composite_server.h>
+
+_Static_assert(CALC_NO_REPLY_LABEL == CALC_TIMER_NO_REPLY_LABEL,
+               "CALC_NO_REPLY_LABEL must be the same as CALC_TIMER_NO_REPLY_LABEL");
+_Static_assert(TIMER_NO_REPLY_LABEL == CALC_TIMER_NO_REPLY_LABEL,
+               "TIMER_NO_REPLY_LABEL must be the same as CALC_TIMER_NO_REPLY_LABEL");
+
+extern seL4_MessageInfo_t calc_timer(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t calc_timer_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/*
+ * calc_timer() returns CALC_TIMER_NO_REPLY when no reply must be sent,
+ * either because the method is oneway or because the handler deferred its reply.
+ */
+#define CALC_TIMER_NO_REPLY seL4_MessageInfo_new(CALC_TIMER_NO_REPLY_LABEL, 0, 0, 0)
+
+/*
+ * calc_timer_loop() receives on ep forever, passing each message
+ * to calc_timer() and answering with seL4_ReplyRecv. reply points
+ * to the reply object cptr (used on MCS kernels) and calc_timer_badge holds the badge
+ * of the current message. A handler returning CALC_TIMER_NO_REPLY defers its reply,
+ * the loop then only waits for the next message.
+ *
+ * The next receive overwrites the reply capability of the caller, so a handler
+ * deferring its reply must first keep it: on MCS kernels by setting *(seL4_CPtr *)reply
+ * to a fresh reply object (the loop receives into it from then on) and keeping the
+ * old one, on other kernels by moving the caller's reply cap into a free slot with
+ * seL4_CNode_SaveCaller(). The reply is later sent with seL4_Send() on the kept cap.
+ */
+extern seL4_Word calc_timer_badge;
+extern void calc_timer_loop(seL4_CPtr ep, seL4_CPtr reply, void *data);
+
+#endif /* CALC_TIMER_COMPOSITE_H */
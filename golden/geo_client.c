@@ -0,0 +1,108 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <geo_client.h>
+
+struct distance_cache_entry distance_cache[DISTANCE_CACHE_SIZE];
+
+void distance_invalidate(void)
+{
+    __builtin_memset(distance_cache, 0, sizeof(distance_cache));
+}
+
+struct locate_cache_entry locate_cache[LOCATE_CACHE_SIZE];
+
+void locate_invalidate(void)
+{
+    __builtin_memset(locate_cache, 0, sizeof(locate_cache));
+}
+
+void geo_client_cache_invalidate_all(void)
+{
+    distance_invalidate();
+    locate_invalidate();
+}
+
+uint32_t distance(int32_t x, int32_t y)
+{
+    seL4_MessageInfo_t message;
+    struct distance_ipc_in cache_key;
+    struct distance_cache_entry *cache_entry;
+    __builtin_memset(&cache_key, 0, sizeof(cache_key));
+    cache_key.x = x;
+    cache_key.y = y;
+    cache_entry = &distance_cache[geo_client_cache_hash(&cache_key, sizeof(cache_key)) % DISTANCE_CACHE_SIZE];
+    if (cache_entry->valid && __builtin_memcmp(&cache_entry->in, &cache_key, sizeof(cache_key)) == 0) {
+        return cache_entry->out.__ret;
+    }
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct distance_ipc_in *argsin_ptr = (struct distance_ipc_in *) &(ipc_buf->msg[0]);
+    struct distance_ipc_out *argsout_ptr = (struct distance_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct distance_ipc_in) {x, y});
+    message = seL4_MessageInfo_new(METHOD_NUM_DISTANCE, 0, 0, sizeof_in_MRs(struct distance_ipc_in));
+    message = seL4_Call(1, message);
+    if (seL4_MessageInfo_get_label(message) == 0) {
+        __builtin_memcpy(&cache_entry->in, &cache_key, sizeof(cache_key));
+        cache_entry->out = *argsout_ptr;
+        cache_entry->valid = 1;
+    }
+    return argsout_ptr->__ret;
+}
+
+
+int locate(seL4_Word id, int32_t *x, int32_t *y)
+{
+    seL4_MessageInfo_t message;
+    struct locate_ipc_in cache_key;
+    struct locate_cache_entry *cache_entry;
+    __builtin_memset(&cache_key, 0, sizeof(cache_key));
+    cache_key.id = id;
+    cache_entry = &locate_cache[geo_client_cache_hash(&cache_key, sizeof(cache_key)) % LOCATE_CACHE_SIZE];
+    if (cache_entry->valid && __builtin_memcmp(&cache_entry->in, &cache_key, sizeof(cache_key)) == 0) {
+        *x = cache_entry->out.x;
+        *y = cache_entry->out.y;
+        return cache_entry->out.__ret;
+    }
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct locate_ipc_in *argsin_ptr = (struct locate_ipc_in *) &(ipc_buf->msg[0]);
+    struct locate_ipc_out *argsout_ptr = (struct locate_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct locate_ipc_in) {id});
+    message = seL4_MessageInfo_new(METHOD_NUM_LOCATE, 0, 0, sizeof_in_MRs(struct locate_ipc_in));
+    message = seL4_Call(1, message);
+    if (seL4_MessageInfo_get_label(message) == 0) {
+        __builtin_memcpy(&cache_entry->in, &cache_key, sizeof(cache_key));
+        cache_entry->out = *argsout_ptr;
+        cache_entry->valid = 1;
+    }
+    *x = argsout_ptr->x;
+    *y = argsout_ptr->y;
+    return argsout_ptr->__ret;
+}
+
+
+int move(seL4_Word id, int32_t dx)
+{
+    struct move_ipc_in {
+        seL4_Word id;
+        int32_t dx;
+    };
+
+    struct move_ipc_out {
+        int __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct move_ipc_in) <= seL4_MsgMaxLength,
+                   "struct move_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct move_ipc_out) <= seL4_MsgMaxLength,
+                   "struct move_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct move_ipc_in *argsin_ptr = (struct move_ipc_in *) &(ipc_buf->msg[0]);
+    struct move_ipc_out *argsout_ptr = (struct move_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct move_ipc_in) {id, dx});
+    message = seL4_MessageInfo_new(METHOD_NUM_MOVE, 0, 0, sizeof_in_MRs(struct move_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
@@ -0,0 +1,78 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef GEO_CLIENT_CLIENT_H
+#define GEO_CLIENT_CLIENT_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+
+/* Client side reply caches, not thread safe */
+extern void geo_client_cache_invalidate_all(void);
+static inline seL4_Word geo_client_cache_hash(const void *key, seL4_Word len)
+{
+    /* FNV-1a */
+    const unsigned char *p = key;
+    seL4_Uint32 h = 2166136261u;
+    seL4_Word j;
+    for (j = 0; j < len; j++) {
+        h = (h ^ p[j]) * 16777619u;
+    }
+    return h;
+}
+
+#define METHOD_NUM_DISTANCE 11
+extern uint32_t distance(int32_t x, int32_t y);
+
+struct distance_ipc_in {
+    int32_t x;
+    int32_t y;
+};
+
+struct distance_ipc_out {
+    uint32_t __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct distance_ipc_in) <= seL4_MsgMaxLength,
+               "struct distance_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct distance_ipc_out) <= seL4_MsgMaxLength,
+               "struct distance_ipc_out does not fit in seL4_MsgMaxLength MRs");
+#define DISTANCE_CACHE_SIZE 8
+struct distance_cache_entry {
+    seL4_Bool valid;
+    struct distance_ipc_in in;
+    struct distance_ipc_out out;
+};
+extern struct distance_cache_entry distance_cache[DISTANCE_CACHE_SIZE];
+extern void distance_invalidate(void);
+
+#define METHOD_NUM_LOCATE 12
+extern int locate(seL4_Word id, int32_t *x, int32_t *y);
+
+struct locate_ipc_in {
+    seL4_Word id;
+};
+
+struct locate_ipc_out {
+    int __ret;
+    int32_t x;
+    int32_t y;
+};
+
+_Static_assert(sizeof_in_MRs(struct locate_ipc_in) <= seL4_MsgMaxLength,
+               "struct locate_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct locate_ipc_out) <= seL4_MsgMaxLength,
+               "struct locate_ipc_out does not fit in seL4_MsgMaxLength MRs");
+#define LOCATE_CACHE_SIZE 1
+struct locate_cache_entry {
+    seL4_Bool valid;
+    struct locate_ipc_in in;
+    struct locate_ipc_out out;
+};
+extern struct locate_cache_entry locate_cache[LOCATE_CACHE_SIZE];
+extern void locate_invalidate(void);
+
+#define METHOD_NUM_MOVE 13
+extern int move(seL4_Word id, int32_t dx);
+
+#endif /* GEO_CLIENT_CLIENT_H */
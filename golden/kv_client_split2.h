@@ -0,0 +1,53 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef KV_CLIENT_SPLIT2_CLIENT_H
+#define KV_CLIENT_SPLIT2_CLIENT_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define METHOD_NUM_SET 11
+extern int set(seL4_Word key, uint32_t value);
+
+struct set_ipc_in {
+    seL4_Word key;
+    uint32_t value;
+};
+
+struct set_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct set_ipc_in) <= seL4_MsgMaxLength,
+               "struct set_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct set_ipc_out) <= seL4_MsgMaxLength,
+               "struct set_ipc_out does not fit in seL4_MsgMaxLength MRs");
+#define METHOD_NUM_SET_BATCH 12
+#define SET_BATCH_STRIDE (sizeof_in_MRs(struct set_ipc_in) > sizeof_in_MRs(struct set_ipc_out) ? sizeof_in_MRs(struct set_ipc_in) : (sizeof_in_MRs(struct set_ipc_out) > 0 ? sizeof_in_MRs(struct set_ipc_out) : 1))
+#define SET_BATCH_MAX (seL4_MsgMaxLength / SET_BATCH_STRIDE)
+extern seL4_Word set_batch(seL4_Word n, const struct set_ipc_in *in, struct set_ipc_out *out);
+
+#define METHOD_NUM_GET 13
+extern uint32_t get(seL4_Word key);
+
+#define METHOD_NUM_SIZE 14
+extern seL4_Word size(seL4_Word *capacity);
+
+struct size_ipc_in {
+};
+
+struct size_ipc_out {
+    seL4_Word __ret;
+    seL4_Word capacity;
+};
+
+_Static_assert(sizeof_in_MRs(struct size_ipc_in) <= seL4_MsgMaxLength,
+               "struct size_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct size_ipc_out) <= seL4_MsgMaxLength,
+               "struct size_ipc_out does not fit in seL4_MsgMaxLength MRs");
+#define METHOD_NUM_SIZE_BATCH 20
+#define SIZE_BATCH_STRIDE (sizeof_in_MRs(struct size_ipc_in) > sizeof_in_MRs(struct size_ipc_out) ? sizeof_in_MRs(struct size_ipc_in) : (sizeof_in_MRs(struct size_ipc_out) > 0 ? sizeof_in_MRs(struct size_ipc_out) : 1))
+#define SIZE_BATCH_MAX (seL4_MsgMaxLength / SIZE_BATCH_STRIDE)
+extern seL4_Word size_batch(seL4_Word n, const struct size_ipc_in *in, struct size_ipc_out *out);
+
+#endif /* KV_CLIENT_SPLIT2_CLIENT_H */
@@ -0,0 +1,109 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <kv_client_split2.h>
+
+int set(seL4_Word key, uint32_t value)
+{
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct set_ipc_in *argsin_ptr = (struct set_ipc_in *) &(ipc_buf->msg[0]);
+    struct set_ipc_out *argsout_ptr = (struct set_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct set_ipc_in) {key, value});
+    message = seL4_MessageInfo_new(METHOD_NUM_SET, 0, 0, sizeof_in_MRs(struct set_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
+seL4_Word set_batch(seL4_Word n, const struct set_ipc_in *in, struct set_ipc_out *out)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word done = 0;
+    while (done < n) {
+        seL4_Word count = n - done > SET_BATCH_MAX ? SET_BATCH_MAX : n - done;
+        seL4_MessageInfo_t message;
+        seL4_Word j;
+        for (j = 0; j < count; j++) {
+            __builtin_memcpy(&ipc_buf->msg[j * SET_BATCH_STRIDE], &in[done + j], sizeof(*in));
+        }
+        message = seL4_MessageInfo_new(METHOD_NUM_SET_BATCH, 0, 0, count * SET_BATCH_STRIDE);
+        message = seL4_Call(1, message);
+        count = seL4_MessageInfo_get_length(message) / SET_BATCH_STRIDE;
+        for (j = 0; j < count; j++) {
+            __builtin_memcpy(&out[done + j], &ipc_buf->msg[j * SET_BATCH_STRIDE], sizeof(*out));
+        }
+        done += count;
+        if (seL4_MessageInfo_get_label(message) != 0 || count == 0) {
+            break;
+        }
+    }
+    return done;
+}
+
+
+uint32_t get(seL4_Word key)
+{
+    struct get_ipc_in {
+        seL4_Word key;
+    };
+
+    struct get_ipc_out {
+        uint32_t __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct get_ipc_in) <= seL4_MsgMaxLength,
+                   "struct get_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct get_ipc_out) <= seL4_MsgMaxLength,
+                   "struct get_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct get_ipc_in *argsin_ptr = (struct get_ipc_in *) &(ipc_buf->msg[0]);
+    struct get_ipc_out *argsout_ptr = (struct get_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct get_ipc_in) {key});
+    message = seL4_MessageInfo_new(METHOD_NUM_GET, 0, 0, sizeof_in_MRs(struct get_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
+seL4_Word size(seL4_Word *capacity)
+{
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct size_ipc_in *argsin_ptr = (struct size_ipc_in *) &(ipc_buf->msg[0]);
+    struct size_ipc_out *argsout_ptr = (struct size_ipc_out *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct size_ipc_in) {});
+    message = seL4_MessageInfo_new(METHOD_NUM_SIZE, 0, 0, sizeof_in_MRs(struct size_ipc_in));
+    message = seL4_Call(1, message);
+    *capacity = argsout_ptr->capacity;
+    return argsout_ptr->__ret;
+}
+
+
+seL4_Word size_batch(seL4_Word n, const struct size_ipc_in *in, struct size_ipc_out *out)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word done = 0;
+    while (done < n) {
+        seL4_Word count = n - done > SIZE_BATCH_MAX ? SIZE_BATCH_MAX : n - done;
+        seL4_MessageInfo_t message;
+        seL4_Word j;
+        for (j = 0; j < count; j++) {
+            __builtin_memcpy(&ipc_buf->msg[j * SIZE_BATCH_STRIDE], &in[done + j], sizeof(*in));
+        }
+        message = seL4_MessageInfo_new(METHOD_NUM_SIZE_BATCH, 0, 0, count * SIZE_BATCH_STRIDE);
+        message = seL4_Call(1, message);
+        count = seL4_MessageInfo_get_length(message) / SIZE_BATCH_STRIDE;
+        for (j = 0; j < count; j++) {
+            __builtin_memcpy(&out[done + j], &ipc_buf->msg[j * SIZE_BATCH_STRIDE], sizeof(*out));
+        }
+        done += count;
+        if (seL4_MessageInfo_get_label(message) != 0 || count == 0) {
+            break;
+        }
+    }
+    return done;
+}
+
+
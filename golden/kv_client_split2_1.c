@@ -0,0 +1,5 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <kv_client_split2.h>
+
@@ -0,0 +1,70 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <kv_server.h>
+static seL4_MessageInfo_t kv_set_batch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct kv_set_ipc_out results[KV_SET_BATCH_MAX];
+    seL4_Word n = seL4_MessageInfo_get_length(msginfo) / KV_SET_BATCH_STRIDE;
+    seL4_Word label = 0;
+    seL4_Word i, j;
+    if (n > KV_SET_BATCH_MAX) {
+        n = KV_SET_BATCH_MAX;
+    }
+    for (i = 0; i < n; i++) {
+        struct kv_set_ipc_in in;
+        __builtin_memcpy(&in, &ipc_buf->msg[i * KV_SET_BATCH_STRIDE], sizeof(in));
+        __builtin_memcpy(&ipc_buf->msg[0], &in, sizeof(in));
+        label = seL4_MessageInfo_get_label(kv_set(ep, seL4_MessageInfo_new(METHOD_NUM_SET, 0, 0, sizeof_in_MRs(in)), reply, data));
+        if (label != 0) {
+            break;
+        }
+        __builtin_memcpy(&results[i], &ipc_buf->msg[0], sizeof(results[i]));
+    }
+    for (j = 0; j < i; j++) {
+        __builtin_memcpy(&ipc_buf->msg[j * KV_SET_BATCH_STRIDE], &results[j], sizeof(results[j]));
+    }
+    return seL4_MessageInfo_new(label, 0, 0, i * KV_SET_BATCH_STRIDE);
+}
+
+static seL4_MessageInfo_t kv_size_batch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct kv_size_ipc_out results[KV_SIZE_BATCH_MAX];
+    seL4_Word n = seL4_MessageInfo_get_length(msginfo) / KV_SIZE_BATCH_STRIDE;
+    seL4_Word label = 0;
+    seL4_Word i, j;
+    if (n > KV_SIZE_BATCH_MAX) {
+        n = KV_SIZE_BATCH_MAX;
+    }
+    for (i = 0; i < n; i++) {
+        struct kv_size_ipc_in in;
+        __builtin_memcpy(&in, &ipc_buf->msg[i * KV_SIZE_BATCH_STRIDE], sizeof(in));
+        __builtin_memcpy(&ipc_buf->msg[0], &in, sizeof(in));
+        label = seL4_MessageInfo_get_label(kv_size(ep, seL4_MessageInfo_new(METHOD_NUM_SIZE, 0, 0, sizeof_in_MRs(in)), reply, data));
+        if (label != 0) {
+            break;
+        }
+        __builtin_memcpy(&results[i], &ipc_buf->msg[0], sizeof(results[i]));
+    }
+    for (j = 0; j < i; j++) {
+        __builtin_memcpy(&ipc_buf->msg[j * KV_SIZE_BATCH_STRIDE], &results[j], sizeof(results[j]));
+    }
+    return seL4_MessageInfo_new(label, 0, 0, i * KV_SIZE_BATCH_STRIDE);
+}
+
+seL4_MessageInfo_t kv_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_SET: msg = kv_set(ep, msginfo, reply, data); break;
+        case METHOD_NUM_GET: msg = kv_get(ep, msginfo, reply, data); break;
+        case METHOD_NUM_SIZE: msg = kv_size(ep, msginfo, reply, data); break;
+        case METHOD_NUM_SET_BATCH: msg = kv_set_batch(ep, msginfo, reply, data); break;
+        case METHOD_NUM_SIZE_BATCH: msg = kv_size_batch(ep, msginfo, reply, data); break;
+
+        default: msg = kv_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
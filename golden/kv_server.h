@@ -0,0 +1,75 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef KV_SERVER_SERVER_H
+#define KV_SERVER_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+extern seL4_MessageInfo_t kv_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t kv_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/****************************************
+ * extern int set(seL4_Word key, uint32_t value);
+ */
+#define METHOD_NUM_SET 11
+struct kv_set_ipc_in {
+    seL4_Word key;
+    uint32_t value;
+};
+
+struct kv_set_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct kv_set_ipc_in) <= seL4_MsgMaxLength,
+               "struct kv_set_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct kv_set_ipc_out) <= seL4_MsgMaxLength,
+               "struct kv_set_ipc_out does not fit in seL4_MsgMaxLength MRs");
+#define METHOD_NUM_SET_BATCH 12
+#define KV_SET_BATCH_STRIDE (sizeof_in_MRs(struct kv_set_ipc_in) > sizeof_in_MRs(struct kv_set_ipc_out) ? sizeof_in_MRs(struct kv_set_ipc_in) : (sizeof_in_MRs(struct kv_set_ipc_out) > 0 ? sizeof_in_MRs(struct kv_set_ipc_out) : 1))
+#define KV_SET_BATCH_MAX (seL4_MsgMaxLength / KV_SET_BATCH_STRIDE)
+extern seL4_MessageInfo_t kv_set(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern uint32_t get(seL4_Word key);
+ */
+#define METHOD_NUM_GET 13
+struct kv_get_ipc_in {
+    seL4_Word key;
+};
+
+struct kv_get_ipc_out {
+    uint32_t __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct kv_get_ipc_in) <= seL4_MsgMaxLength,
+               "struct kv_get_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct kv_get_ipc_out) <= seL4_MsgMaxLength,
+               "struct kv_get_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t kv_get(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern seL4_Word size(seL4_Word *capacity);
+ */
+#define METHOD_NUM_SIZE 14
+struct kv_size_ipc_in {
+};
+
+struct kv_size_ipc_out {
+    seL4_Word __ret;
+    seL4_Word capacity;
+};
+
+_Static_assert(sizeof_in_MRs(struct kv_size_ipc_in) <= seL4_MsgMaxLength,
+               "struct kv_size_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct kv_size_ipc_out) <= seL4_MsgMaxLength,
+               "struct kv_size_ipc_out does not fit in seL4_MsgMaxLength MRs");
+#define METHOD_NUM_SIZE_BATCH 20
+#define KV_SIZE_BATCH_STRIDE (sizeof_in_MRs(struct kv_size_ipc_in) > sizeof_in_MRs(struct kv_size_ipc_out) ? sizeof_in_MRs(struct kv_size_ipc_in) : (sizeof_in_MRs(struct kv_size_ipc_out) > 0 ? sizeof_in_MRs(struct kv_size_ipc_out) : 1))
+#define KV_SIZE_BATCH_MAX (seL4_MsgMaxLength / KV_SIZE_BATCH_STRIDE)
+extern seL4_MessageInfo_t kv_size(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+#endif /* KV_SERVER_SERVER_H */
@@ -0,0 +1,67 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <notify_client.h>
+void post(seL4_Word event, uint8_t level)
+{
+    struct post_ipc_in {
+        seL4_Word event;
+        uint8_t level;
+    };
+
+    struct post_ipc_out {
+    };
+
+    _Static_assert(sizeof_in_MRs(struct post_ipc_in) <= seL4_MsgMaxLength,
+                   "struct post_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct post_ipc_out) <= seL4_MsgMaxLength,
+                   "struct post_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct post_ipc_in *argsin_ptr = (struct post_ipc_in *) &(ipc_buf->msg[0]);
+    *argsin_ptr = ((struct post_ipc_in) {event, level});
+    message = seL4_MessageInfo_new(METHOD_NUM_POST, 0, 0, sizeof_in_MRs(struct post_ipc_in));
+    seL4_Send(1, message);
+}
+
+
+void poke(void)
+{
+    struct poke_ipc_in {
+    };
+
+    struct poke_ipc_out {
+    };
+
+    _Static_assert(sizeof_in_MRs(struct poke_ipc_in) <= seL4_MsgMaxLength,
+                   "struct poke_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct poke_ipc_out) <= seL4_MsgMaxLength,
+                   "struct poke_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    message = seL4_MessageInfo_new(METHOD_NUM_POKE, 0, 0, sizeof_in_MRs(struct poke_ipc_in));
+    seL4_NBSend(1, message);
+}
+
+
+seL4_Word count(void)
+{
+    struct count_ipc_in {
+    };
+
+    struct count_ipc_out {
+        seL4_Word __ret;
+    };
+
+    _Static_assert(sizeof_in_MRs(struct count_ipc_in) <= seL4_MsgMaxLength,
+                   "struct count_ipc_in does not fit in seL4_MsgMaxLength MRs");
+    _Static_assert(sizeof_in_MRs(struct count_ipc_out) <= seL4_MsgMaxLength,
+                   "struct count_ipc_out does not fit in seL4_MsgMaxLength MRs");
+    seL4_MessageInfo_t message;
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    struct count_ipc_out *argsout_ptr = (struct count_ipc_out *) &(ipc_buf->msg[0]);
+    message = seL4_MessageInfo_new(METHOD_NUM_COUNT, 0, 0, sizeof_in_MRs(struct count_ipc_in));
+    message = seL4_Call(1, message);
+    return argsout_ptr->__ret;
+}
+
+
@@ -0,0 +1,18 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef NOTIFY_CLIENT_CLIENT_H
+#define NOTIFY_CLIENT_CLIENT_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+#define METHOD_NUM_POST 11
+extern void post(seL4_Word event, uint8_t level);
+
+#define METHOD_NUM_POKE 12
+extern void poke(void);
+
+#define METHOD_NUM_COUNT 13
+extern seL4_Word count(void);
+
+#endif /* NOTIFY_CLIENT_CLIENT_H */
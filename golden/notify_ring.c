@@ -0,0 +1,55 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <notify_ring.h>
+
+void notify_ring_drain(struct notify_ring_req_ring *req, struct notify_ring_resp_ring *resp, seL4_CPtr client_ntfn, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    int responses = 0;
+    while (!notify_ring_req_ring_empty(req) && !notify_ring_resp_ring_full(resp)) {
+        struct notify_ring_req *e = notify_ring_req_ring_front(req);
+        struct notify_ring_resp *r = &resp->entries[resp->head & (NOTIFY_RING_SIZE - 1)];
+        seL4_MessageInfo_t reply_info;
+        int respond = 1;
+        r->cookie = e->cookie;
+        switch (e->label) {
+        case METHOD_NUM_POST:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.post, sizeof(struct notify_ring_post_ipc_in));
+            reply_info = notify_post(0, seL4_MessageInfo_new(METHOD_NUM_POST, 0, 0, sizeof_in_MRs(struct notify_ring_post_ipc_in)), NULL, data);
+            respond = 0;
+            break;
+        case METHOD_NUM_POKE:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.poke, sizeof(struct notify_ring_poke_ipc_in));
+            reply_info = notify_poke(0, seL4_MessageInfo_new(METHOD_NUM_POKE, 0, 0, sizeof_in_MRs(struct notify_ring_poke_ipc_in)), NULL, data);
+            respond = 0;
+            break;
+        case METHOD_NUM_COUNT:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.count, sizeof(struct notify_ring_count_ipc_in));
+            reply_info = notify_count(0, seL4_MessageInfo_new(METHOD_NUM_COUNT, 0, 0, sizeof_in_MRs(struct notify_ring_count_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.count, &ipc_buf->msg[0], sizeof(struct notify_ring_count_ipc_out));
+            break;
+        default:
+            reply_info = notify_error(0, seL4_MessageInfo_new(e->label, 0, 0, 0), NULL, data);
+            break;
+        }
+        notify_ring_req_ring_pop(req);
+        if (respond) {
+            r->label = seL4_MessageInfo_get_label(reply_info);
+            __atomic_store_n(&resp->head, resp->head + 1, __ATOMIC_RELEASE);
+            responses++;
+        }
+    }
+    if (responses) {
+        notify_ring_resp_ring_kick(resp, client_ntfn);
+    }
+}
+
+void notify_ring_serve(struct notify_ring_req_ring *req, struct notify_ring_resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data)
+{
+    for (;;) {
+        notify_ring_req_ring_wait(req, ntfn);
+        notify_ring_resp_ring_wait_space(resp, ntfn);
+        notify_ring_drain(req, resp, client_ntfn, data);
+    }
+}
@@ -0,0 +1,270 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef NOTIFY_RING_RING_H
+#define NOTIFY_RING_RING_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+
+/* Number of entries in each ring, must be a power of two */
+#ifndef NOTIFY_RING_SIZE
+#define NOTIFY_RING_SIZE 64
+#endif
+
+#define METHOD_NUM_POST 11
+struct notify_ring_post_ipc_in {
+    seL4_Word event;
+    uint8_t level;
+};
+
+struct notify_ring_post_ipc_out {
+};
+
+#define METHOD_NUM_POKE 12
+struct notify_ring_poke_ipc_in {
+};
+
+struct notify_ring_poke_ipc_out {
+};
+
+#define METHOD_NUM_COUNT 13
+struct notify_ring_count_ipc_in {
+};
+
+struct notify_ring_count_ipc_out {
+    seL4_Word __ret;
+};
+
+struct notify_ring_req {
+    seL4_Word label;
+    seL4_Word cookie;
+    union {
+        struct notify_ring_post_ipc_in post;
+        struct notify_ring_poke_ipc_in poke;
+        struct notify_ring_count_ipc_in count;
+    } u;
+};
+
+/* label is the label of the message info returned by the server handler */
+struct notify_ring_resp {
+    seL4_Word label;
+    seL4_Word cookie;
+    union {
+        struct notify_ring_count_ipc_out count;
+    } u;
+};
+
+struct notify_ring_req_ring {
+    seL4_Word head;              /* next entry to produce, written by the producer */
+    seL4_Word tail;              /* next entry to consume, written by the consumer */
+    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */
+    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */
+    struct notify_ring_req entries[NOTIFY_RING_SIZE];
+};
+
+static inline int notify_ring_req_ring_empty(struct notify_ring_req_ring *ring)
+{
+    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;
+}
+
+static inline int notify_ring_req_ring_full(struct notify_ring_req_ring *ring)
+{
+    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == NOTIFY_RING_SIZE;
+}
+
+/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */
+static inline void notify_ring_req_ring_kick(struct notify_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has entries */
+static inline void notify_ring_req_ring_wait(struct notify_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    while (notify_ring_req_ring_empty(ring)) {
+        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (notify_ring_req_ring_empty(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+static inline struct notify_ring_req *notify_ring_req_ring_front(struct notify_ring_req_ring *ring)
+{
+    return &ring->entries[ring->tail & (NOTIFY_RING_SIZE - 1)];
+}
+
+static inline void notify_ring_req_ring_pop(struct notify_ring_req_ring *ring)
+{
+    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);
+}
+
+/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */
+static inline void notify_ring_req_ring_release(struct notify_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has a free entry */
+static inline void notify_ring_req_ring_wait_space(struct notify_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    while (notify_ring_req_ring_full(ring)) {
+        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (notify_ring_req_ring_full(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+struct notify_ring_resp_ring {
+    seL4_Word head;              /* next entry to produce, written by the producer */
+    seL4_Word tail;              /* next entry to consume, written by the consumer */
+    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */
+    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */
+    struct notify_ring_resp entries[NOTIFY_RING_SIZE];
+};
+
+static inline int notify_ring_resp_ring_empty(struct notify_ring_resp_ring *ring)
+{
+    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;
+}
+
+static inline int notify_ring_resp_ring_full(struct notify_ring_resp_ring *ring)
+{
+    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == NOTIFY_RING_SIZE;
+}
+
+/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */
+static inline void notify_ring_resp_ring_kick(struct notify_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has entries */
+static inline void notify_ring_resp_ring_wait(struct notify_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    while (notify_ring_resp_ring_empty(ring)) {
+        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (notify_ring_resp_ring_empty(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+static inline struct notify_ring_resp *notify_ring_resp_ring_front(struct notify_ring_resp_ring *ring)
+{
+    return &ring->entries[ring->tail & (NOTIFY_RING_SIZE - 1)];
+}
+
+static inline void notify_ring_resp_ring_pop(struct notify_ring_resp_ring *ring)
+{
+    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);
+}
+
+/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */
+static inline void notify_ring_resp_ring_release(struct notify_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has a free entry */
+static inline void notify_ring_resp_ring_wait_space(struct notify_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    while (notify_ring_resp_ring_full(ring)) {
+        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (notify_ring_resp_ring_full(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+/*
+ * Copy out the next response, returns -1 if there is none. server_ntfn is
+ * rung if the server waits for room in the ring, so it must be the
+ * notification the server waits on.
+ */
+static inline int notify_ring_resp_ring_dequeue(struct notify_ring_resp_ring *ring, struct notify_ring_resp *resp, seL4_CPtr server_ntfn)
+{
+    if (notify_ring_resp_ring_empty(ring)) {
+        return -1;
+    }
+    *resp = *notify_ring_resp_ring_front(ring);
+    notify_ring_resp_ring_pop(ring);
+    notify_ring_resp_ring_release(ring, server_ntfn);
+    return 0;
+}
+
+static inline int notify_ring_post_enqueue(struct notify_ring_req_ring *ring, seL4_Word cookie, seL4_Word event, uint8_t level)
+{
+    struct notify_ring_req *e;
+    if (notify_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (NOTIFY_RING_SIZE - 1)];
+    e->label = METHOD_NUM_POST;
+    e->cookie = cookie;
+    e->u.post.event = event;
+    e->u.post.level = level;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+static inline int notify_ring_poke_enqueue(struct notify_ring_req_ring *ring, seL4_Word cookie)
+{
+    struct notify_ring_req *e;
+    if (notify_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (NOTIFY_RING_SIZE - 1)];
+    e->label = METHOD_NUM_POKE;
+    e->cookie = cookie;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+static inline int notify_ring_count_enqueue(struct notify_ring_req_ring *ring, seL4_Word cookie)
+{
+    struct notify_ring_req *e;
+    if (notify_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (NOTIFY_RING_SIZE - 1)];
+    e->label = METHOD_NUM_COUNT;
+    e->cookie = cookie;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+extern void notify_ring_drain(struct notify_ring_req_ring *req, struct notify_ring_resp_ring *resp, seL4_CPtr client_ntfn, void *data);
+extern void notify_ring_serve(struct notify_ring_req_ring *req, struct notify_ring_resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data);
+extern seL4_MessageInfo_t notify_post(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t notify_poke(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t notify_count(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t notify_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+#endif /* NOTIFY_RING_RING_H */
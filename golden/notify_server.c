@@ -0,0 +1,28 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <notify_server.h>
+static seL4_MessageInfo_t notify_post_oneway(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    notify_post(ep, msginfo, reply, data);
+    return NOTIFY_NO_REPLY;
+}
+
+static seL4_MessageInfo_t notify_poke_oneway(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    notify_poke(ep, msginfo, reply, data);
+    return NOTIFY_NO_REPLY;
+}
+
+seL4_MessageInfo_t notify_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_POST: msg = notify_post_oneway(ep, msginfo, reply, data); break;
+        case METHOD_NUM_POKE: msg = notify_poke_oneway(ep, msginfo, reply, data); break;
+        case METHOD_NUM_COUNT: msg = notify_count(ep, msginfo, reply, data); break;
+
+        default: msg = notify_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
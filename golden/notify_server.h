@@ -0,0 +1,74 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef NOTIFY_SERVER_SERVER_H
+#define NOTIFY_SERVER_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+extern seL4_MessageInfo_t notify_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t notify_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/*
+ * notify_dispatch() returns NOTIFY_NO_REPLY when no reply must be sent,
+ * either because the method is oneway or because the handler deferred its reply.
+ */
+#ifndef NOTIFY_NO_REPLY_LABEL
+#define NOTIFY_NO_REPLY_LABEL 0xfffff
+#endif
+#define NOTIFY_NO_REPLY seL4_MessageInfo_new(NOTIFY_NO_REPLY_LABEL, 0, 0, 0)
+
+/****************************************
+ * extern void post(seL4_Word event, uint8_t level);
+ */
+#define METHOD_NUM_POST 11
+struct notify_post_ipc_in {
+    seL4_Word event;
+    uint8_t level;
+};
+
+struct notify_post_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct notify_post_ipc_in) <= seL4_MsgMaxLength,
+               "struct notify_post_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct notify_post_ipc_out) <= seL4_MsgMaxLength,
+               "struct notify_post_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t notify_post(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern void poke(void);
+ */
+#define METHOD_NUM_POKE 12
+struct notify_poke_ipc_in {
+};
+
+struct notify_poke_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct notify_poke_ipc_in) <= seL4_MsgMaxLength,
+               "struct notify_poke_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct notify_poke_ipc_out) <= seL4_MsgMaxLength,
+               "struct notify_poke_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t notify_poke(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern seL4_Word count(void);
+ */
+#define METHOD_NUM_COUNT 13
+struct notify_count_ipc_in {
+};
+
+struct notify_count_ipc_out {
+    seL4_Word __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct notify_count_ipc_in) <= seL4_MsgMaxLength,
+               "struct notify_count_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct notify_count_ipc_out) <= seL4_MsgMaxLength,
+               "struct notify_count_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t notify_count(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+#endif /* NOTIFY_SERVER_SERVER_H */
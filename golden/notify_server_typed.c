@@ -0,0 +1,63 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <notify_server_typed.h>
+seL4_MessageInfo_t notify_post(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word label;
+    if (seL4_MessageInfo_get_length(msginfo) < sizeof_in_MRs(struct notify_post_ipc_in)) {
+        return notify_error(ep, msginfo, reply, data);
+    }
+    label = notify_post_typed(ep, msginfo, reply, data, (const struct notify_post_ipc_in *)&ipc_buf->msg[0]);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, 0);
+}
+
+static seL4_MessageInfo_t notify_post_oneway(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    notify_post(ep, msginfo, reply, data);
+    return NOTIFY_NO_REPLY;
+}
+
+seL4_MessageInfo_t notify_poke(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_Word label;
+    label = notify_poke_typed(ep, msginfo, reply, data);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, 0);
+}
+
+static seL4_MessageInfo_t notify_poke_oneway(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    notify_poke(ep, msginfo, reply, data);
+    return NOTIFY_NO_REPLY;
+}
+
+seL4_MessageInfo_t notify_count(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    seL4_Word label;
+    label = notify_count_typed(ep, msginfo, reply, data, (struct notify_count_ipc_out *)&ipc_buf->msg[0]);
+    if (label != 0) {
+        return seL4_MessageInfo_new(label, 0, 0, 0);
+    }
+    return seL4_MessageInfo_new(0, 0, 0, sizeof_in_MRs(struct notify_count_ipc_out));
+}
+
+seL4_MessageInfo_t notify_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_POST: msg = notify_post_oneway(ep, msginfo, reply, data); break;
+        case METHOD_NUM_POKE: msg = notify_poke_oneway(ep, msginfo, reply, data); break;
+        case METHOD_NUM_COUNT: msg = notify_count(ep, msginfo, reply, data); break;
+
+        default: msg = notify_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
@@ -0,0 +1,51 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <sess_ring.h>
+
+void sess_ring_drain(struct sess_ring_req_ring *req, struct sess_ring_resp_ring *resp, seL4_CPtr client_ntfn, void *data, seL4_Word badge)
+{
+    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();
+    int responses = 0;
+    sess_badge = badge;
+    while (!sess_ring_req_ring_empty(req) && !sess_ring_resp_ring_full(resp)) {
+        struct sess_ring_req *e = sess_ring_req_ring_front(req);
+        struct sess_ring_resp *r = &resp->entries[resp->head & (SESS_RING_SIZE - 1)];
+        seL4_MessageInfo_t reply_info;
+        int respond = 1;
+        r->cookie = e->cookie;
+        switch (e->label) {
+        case METHOD_NUM_ATTACH:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.attach, sizeof(struct sess_ring_attach_ipc_in));
+            reply_info = sess_attach(0, seL4_MessageInfo_new(METHOD_NUM_ATTACH, 0, 0, sizeof_in_MRs(struct sess_ring_attach_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.attach, &ipc_buf->msg[0], sizeof(struct sess_ring_attach_ipc_out));
+            break;
+        case METHOD_NUM_DETACH:
+            __builtin_memcpy(&ipc_buf->msg[0], &e->u.detach, sizeof(struct sess_ring_detach_ipc_in));
+            reply_info = sess_detach(0, seL4_MessageInfo_new(METHOD_NUM_DETACH, 0, 0, sizeof_in_MRs(struct sess_ring_detach_ipc_in)), NULL, data);
+            __builtin_memcpy(&r->u.detach, &ipc_buf->msg[0], sizeof(struct sess_ring_detach_ipc_out));
+            break;
+        default:
+            reply_info = sess_error(0, seL4_MessageInfo_new(e->label, 0, 0, 0), NULL, data);
+            break;
+        }
+        sess_ring_req_ring_pop(req);
+        if (respond) {
+            r->label = seL4_MessageInfo_get_label(reply_info);
+            __atomic_store_n(&resp->head, resp->head + 1, __ATOMIC_RELEASE);
+            responses++;
+        }
+    }
+    if (responses) {
+        sess_ring_resp_ring_kick(resp, client_ntfn);
+    }
+}
+
+void sess_ring_serve(struct sess_ring_req_ring *req, struct sess_ring_resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data, seL4_Word badge)
+{
+    for (;;) {
+        sess_ring_req_ring_wait(req, ntfn);
+        sess_ring_resp_ring_wait_space(resp, ntfn);
+        sess_ring_drain(req, resp, client_ntfn, data, badge);
+    }
+}
@@ -0,0 +1,253 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef SESS_RING_RING_H
+#define SESS_RING_RING_H
+
+#include <sel4/sel4.h>
+#include <sess_state.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+
+/* Number of entries in each ring, must be a power of two */
+#ifndef SESS_RING_SIZE
+#define SESS_RING_SIZE 64
+#endif
+
+#define METHOD_NUM_ATTACH 11
+struct sess_ring_attach_ipc_in {
+    seL4_Word flags;
+};
+
+struct sess_ring_attach_ipc_out {
+    int __ret;
+};
+
+#define METHOD_NUM_DETACH 12
+struct sess_ring_detach_ipc_in {
+};
+
+struct sess_ring_detach_ipc_out {
+};
+
+struct sess_ring_req {
+    seL4_Word label;
+    seL4_Word cookie;
+    union {
+        struct sess_ring_attach_ipc_in attach;
+        struct sess_ring_detach_ipc_in detach;
+    } u;
+};
+
+/* label is the label of the message info returned by the server handler */
+struct sess_ring_resp {
+    seL4_Word label;
+    seL4_Word cookie;
+    union {
+        struct sess_ring_attach_ipc_out attach;
+        struct sess_ring_detach_ipc_out detach;
+    } u;
+};
+
+struct sess_ring_req_ring {
+    seL4_Word head;              /* next entry to produce, written by the producer */
+    seL4_Word tail;              /* next entry to consume, written by the consumer */
+    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */
+    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */
+    struct sess_ring_req entries[SESS_RING_SIZE];
+};
+
+static inline int sess_ring_req_ring_empty(struct sess_ring_req_ring *ring)
+{
+    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;
+}
+
+static inline int sess_ring_req_ring_full(struct sess_ring_req_ring *ring)
+{
+    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == SESS_RING_SIZE;
+}
+
+/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */
+static inline void sess_ring_req_ring_kick(struct sess_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has entries */
+static inline void sess_ring_req_ring_wait(struct sess_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    while (sess_ring_req_ring_empty(ring)) {
+        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (sess_ring_req_ring_empty(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+static inline struct sess_ring_req *sess_ring_req_ring_front(struct sess_ring_req_ring *ring)
+{
+    return &ring->entries[ring->tail & (SESS_RING_SIZE - 1)];
+}
+
+static inline void sess_ring_req_ring_pop(struct sess_ring_req_ring *ring)
+{
+    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);
+}
+
+/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */
+static inline void sess_ring_req_ring_release(struct sess_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has a free entry */
+static inline void sess_ring_req_ring_wait_space(struct sess_ring_req_ring *ring, seL4_CPtr ntfn)
+{
+    while (sess_ring_req_ring_full(ring)) {
+        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (sess_ring_req_ring_full(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+struct sess_ring_resp_ring {
+    seL4_Word head;              /* next entry to produce, written by the producer */
+    seL4_Word tail;              /* next entry to consume, written by the consumer */
+    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */
+    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */
+    struct sess_ring_resp entries[SESS_RING_SIZE];
+};
+
+static inline int sess_ring_resp_ring_empty(struct sess_ring_resp_ring *ring)
+{
+    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;
+}
+
+static inline int sess_ring_resp_ring_full(struct sess_ring_resp_ring *ring)
+{
+    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == SESS_RING_SIZE;
+}
+
+/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */
+static inline void sess_ring_resp_ring_kick(struct sess_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has entries */
+static inline void sess_ring_resp_ring_wait(struct sess_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    while (sess_ring_resp_ring_empty(ring)) {
+        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (sess_ring_resp_ring_empty(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+static inline struct sess_ring_resp *sess_ring_resp_ring_front(struct sess_ring_resp_ring *ring)
+{
+    return &ring->entries[ring->tail & (SESS_RING_SIZE - 1)];
+}
+
+static inline void sess_ring_resp_ring_pop(struct sess_ring_resp_ring *ring)
+{
+    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);
+}
+
+/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */
+static inline void sess_ring_resp_ring_release(struct sess_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    __atomic_thread_fence(__ATOMIC_SEQ_CST);
+    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+        seL4_Signal(ntfn);
+    }
+}
+
+/* Block on the doorbell until the ring has a free entry */
+static inline void sess_ring_resp_ring_wait_space(struct sess_ring_resp_ring *ring, seL4_CPtr ntfn)
+{
+    while (sess_ring_resp_ring_full(ring)) {
+        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);
+        __atomic_thread_fence(__ATOMIC_SEQ_CST);
+        if (sess_ring_resp_ring_full(ring)) {
+            seL4_Wait(ntfn, NULL);
+        }
+        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);
+    }
+}
+
+/*
+ * Copy out the next response, returns -1 if there is none. server_ntfn is
+ * rung if the server waits for room in the ring, so it must be the
+ * notification the server waits on.
+ */
+static inline int sess_ring_resp_ring_dequeue(struct sess_ring_resp_ring *ring, struct sess_ring_resp *resp, seL4_CPtr server_ntfn)
+{
+    if (sess_ring_resp_ring_empty(ring)) {
+        return -1;
+    }
+    *resp = *sess_ring_resp_ring_front(ring);
+    sess_ring_resp_ring_pop(ring);
+    sess_ring_resp_ring_release(ring, server_ntfn);
+    return 0;
+}
+
+static inline int sess_ring_attach_enqueue(struct sess_ring_req_ring *ring, seL4_Word cookie, seL4_Word flags)
+{
+    struct sess_ring_req *e;
+    if (sess_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (SESS_RING_SIZE - 1)];
+    e->label = METHOD_NUM_ATTACH;
+    e->cookie = cookie;
+    e->u.attach.flags = flags;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+static inline int sess_ring_detach_enqueue(struct sess_ring_req_ring *ring, seL4_Word cookie)
+{
+    struct sess_ring_req *e;
+    if (sess_ring_req_ring_full(ring)) {
+        return -1;
+    }
+    e = &ring->entries[ring->head & (SESS_RING_SIZE - 1)];
+    e->label = METHOD_NUM_DETACH;
+    e->cookie = cookie;
+    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);
+    return 0;
+}
+
+/*
+ * The handlers find the state of the client by sess_badge, drain() sets
+ * it to badge, the badge of the client on the other end of the rings.
+ */
+extern seL4_Word sess_badge;
+extern void sess_ring_drain(struct sess_ring_req_ring *req, struct sess_ring_resp_ring *resp, seL4_CPtr client_ntfn, void *data, seL4_Word badge);
+extern void sess_ring_serve(struct sess_ring_req_ring *req, struct sess_ring_resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data, seL4_Word badge);
+extern seL4_MessageInfo_t sess_attach(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t sess_detach(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t sess_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+#endif /* SESS_RING_RING_H */
@@ -0,0 +1,78 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef SESS_SERVER_SERVER_H
+#define SESS_SERVER_SERVER_H
+
+#include <sel4/sel4.h>
+#include <sess_state.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+extern seL4_MessageInfo_t sess_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t sess_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/*
+ * State of each client, indexed by the badge of its endpoint cap. sess_badge
+ * must hold the badge of the message being dispatched, sess_client_mint() allocates
+ * a badge and mints a cap with it, sess_client_release() frees the badge once the
+ * cap is deleted. Handlers get the state of the caller, messages with a badge
+ * that has no state go to sess_error(). Not thread safe.
+ */
+#define SESS_MAX_CLIENTS 16
+struct sess_client {
+    seL4_Bool used;
+    struct sess_state state;
+};
+extern struct sess_client sess_clients[SESS_MAX_CLIENTS];
+extern seL4_Word sess_badge;
+extern seL4_Word sess_client_alloc(void);
+extern void sess_client_release(seL4_Word badge);
+extern seL4_Error sess_client_mint(seL4_CPtr cnode, seL4_Word dest, seL4_Uint8 depth, seL4_CPtr ep,
+                                  seL4_CapRights_t rights, seL4_Word *badge);
+static inline struct sess_state *sess_client_state(seL4_Word badge)
+{
+    if (badge == 0 || badge > SESS_MAX_CLIENTS || !sess_clients[badge - 1].used) {
+        return NULL;
+    }
+    return &sess_clients[badge - 1].state;
+}
+
+/****************************************
+ * extern int attach(seL4_Word flags);
+ */
+#define METHOD_NUM_ATTACH 11
+struct sess_attach_ipc_in {
+    seL4_Word flags;
+};
+
+struct sess_attach_ipc_out {
+    int __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct sess_attach_ipc_in) <= seL4_MsgMaxLength,
+               "struct sess_attach_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct sess_attach_ipc_out) <= seL4_MsgMaxLength,
+               "struct sess_attach_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t sess_attach(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+extern seL4_MessageInfo_t sess_attach_client(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data, struct sess_state *client);
+
+
+/****************************************
+ * extern void detach(void);
+ */
+#define METHOD_NUM_DETACH 12
+struct sess_detach_ipc_in {
+};
+
+struct sess_detach_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct sess_detach_ipc_in) <= seL4_MsgMaxLength,
+               "struct sess_detach_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct sess_detach_ipc_out) <= seL4_MsgMaxLength,
+               "struct sess_detach_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t sess_detach(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+extern seL4_MessageInfo_t sess_detach_client(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data, struct sess_state *client);
+
+#endif /* SESS_SERVER_SERVER_H */
@@ -0,0 +1,100 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <sess_server_loop.h>
+struct sess_client sess_clients[SESS_MAX_CLIENTS];
+seL4_Word sess_badge;
+
+seL4_Word sess_client_alloc(void)
+{
+    seL4_Word i;
+    for (i = 0; i < SESS_MAX_CLIENTS; i++) {
+        if (!sess_clients[i].used) {
+            __builtin_memset(&sess_clients[i].state, 0, sizeof(sess_clients[i].state));
+            sess_clients[i].used = 1;
+            return i + 1;
+        }
+    }
+    return 0;
+}
+
+void sess_client_release(seL4_Word badge)
+{
+    if (badge != 0 && badge <= SESS_MAX_CLIENTS) {
+        sess_clients[badge - 1].used = 0;
+    }
+}
+
+seL4_Error sess_client_mint(seL4_CPtr cnode, seL4_Word dest, seL4_Uint8 depth, seL4_CPtr ep,
+                        seL4_CapRights_t rights, seL4_Word *badge)
+{
+    seL4_Error err;
+    seL4_Word b = sess_client_alloc();
+    if (b == 0) {
+        return seL4_NotEnoughMemory;
+    }
+    err = seL4_CNode_Mint(cnode, dest, depth, cnode, ep, depth, rights, b);
+    if (err != seL4_NoError) {
+        sess_client_release(b);
+        return err;
+    }
+    *badge = b;
+    return seL4_NoError;
+}
+
+seL4_MessageInfo_t sess_attach(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    struct sess_state *client = sess_client_state(sess_badge);
+    if (client == NULL) {
+        return sess_error(ep, msginfo, reply, data);
+    }
+    return sess_attach_client(ep, msginfo, reply, data, client);
+}
+
+seL4_MessageInfo_t sess_detach(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    struct sess_state *client = sess_client_state(sess_badge);
+    if (client == NULL) {
+        return sess_error(ep, msginfo, reply, data);
+    }
+    return sess_detach_client(ep, msginfo, reply, data, client);
+}
+
+seL4_MessageInfo_t sess_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_ATTACH: msg = sess_attach(ep, msginfo, reply, data); break;
+        case METHOD_NUM_DETACH: msg = sess_detach(ep, msginfo, reply, data); break;
+
+        default: msg = sess_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
+
+void sess_dispatch_loop(seL4_CPtr ep, seL4_CPtr reply, void *data)
+{
+    seL4_MessageInfo_t msginfo;
+    seL4_MessageInfo_t reply_info;
+#ifdef CONFIG_KERNEL_MCS
+    msginfo = seL4_Recv(ep, &sess_badge, reply);
+#else
+    msginfo = seL4_Recv(ep, &sess_badge);
+#endif
+    for (;;) {
+        reply_info = sess_dispatch(ep, msginfo, &reply, data);
+        if (seL4_MessageInfo_get_label(reply_info) == SESS_NO_REPLY_LABEL) {
+#ifdef CONFIG_KERNEL_MCS
+            msginfo = seL4_Recv(ep, &sess_badge, reply);
+#else
+            msginfo = seL4_Recv(ep, &sess_badge);
+#endif
+        } else {
+#ifdef CONFIG_KERNEL_MCS
+            msginfo = seL4_ReplyRecv(ep, reply_info, &sess_badge, reply);
+#else
+            msginfo = seL4_ReplyRecv(ep, reply_info, &sess_badge);
+#endif
+        }
+    }
+}
@@ -0,0 +1,50 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#include <timer_composite_server.h>
+static seL4_MessageInfo_t timer_arm_oneway(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    timer_arm(ep, msginfo, reply, data);
+    return TIMER_NO_REPLY;
+}
+
+seL4_MessageInfo_t timer_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)
+{
+    seL4_MessageInfo_t msg;
+    switch (seL4_MessageInfo_get_label(msginfo)) {
+        case METHOD_NUM_ARM: msg = timer_arm_oneway(ep, msginfo, reply, data); break;
+        case METHOD_NUM_ELAPSED: msg = timer_elapsed(ep, msginfo, reply, data); break;
+
+        default: msg = timer_error(ep, msginfo, reply, data);
+    }
+    return msg;
+}
+
+seL4_Word timer_badge;
+
+void timer_dispatch_loop(seL4_CPtr ep, seL4_CPtr reply, void *data)
+{
+    seL4_MessageInfo_t msginfo;
+    seL4_MessageInfo_t reply_info;
+#ifdef CONFIG_KERNEL_MCS
+    msginfo = seL4_Recv(ep, &timer_badge, reply);
+#else
+    msginfo = seL4_Recv(ep, &timer_badge);
+#endif
+    for (;;) {
+        reply_info = timer_dispatch(ep, msginfo, &reply, data);
+        if (seL4_MessageInfo_get_label(reply_info) == TIMER_NO_REPLY_LABEL) {
+#ifdef CONFIG_KERNEL_MCS
+            msginfo = seL4_Recv(ep, &timer_badge, reply);
+#else
+            msginfo = seL4_Recv(ep, &timer_badge);
+#endif
+        } else {
+#ifdef CONFIG_KERNEL_MCS
+            msginfo = seL4_ReplyRecv(ep, reply_info, &timer_badge, reply);
+#else
+            msginfo = seL4_ReplyRecv(ep, reply_info, &timer_badge);
+#endif
+        }
+    }
+}
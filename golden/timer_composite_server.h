@@ -0,0 +1,72 @@
+
+    /* This file is automatically generated, DO NOT EDIT */
+    
+#ifndef TIMER_COMPOSITE_SERVER_SERVER_H
+#define TIMER_COMPOSITE_SERVER_SERVER_H
+
+#include <sel4/sel4.h>
+#define sizeof_in_MRs(x)    ((sizeof(x)+8-1)/8)
+extern seL4_MessageInfo_t timer_dispatch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+extern seL4_MessageInfo_t timer_error(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);
+
+/*
+ * timer_dispatch() returns TIMER_NO_REPLY when no reply must be sent,
+ * either because the method is oneway or because the handler deferred its reply.
+ */
+#ifndef TIMER_NO_REPLY_LABEL
+#define TIMER_NO_REPLY_LABEL 0xfffff
+#endif
+#define TIMER_NO_REPLY seL4_MessageInfo_new(TIMER_NO_REPLY_LABEL, 0, 0, 0)
+
+/*
+ * timer_dispatch_loop() receives on ep forever, passing each message
+ * to timer_dispatch() and answering with seL4_ReplyRecv. reply points
+ * to the reply object cptr (used on MCS kernels) and timer_badge holds the badge
+ * of the current message. A handler returning TIMER_NO_REPLY defers its reply,
+ * the loop then only waits for the next message.
+ *
+ * The next receive overwrites the reply capability of the caller, so a handler
+ * deferring its reply must first keep it: on MCS kernels by setting *(seL4_CPtr *)reply
+ * to a fresh reply object (the loop receives into it from then on) and keeping the
+ * old one, on other kernels by moving the caller's reply cap into a free slot with
+ * seL4_CNode_SaveCaller(). The reply is later sent with seL4_Send() on the kept cap.
+ */
+extern seL4_Word timer_badge;
+extern void timer_dispatch_loop(seL4_CPtr ep, seL4_CPtr reply, void *data);
+
+/****************************************
+ * extern void arm(uint64_t deadline);
+ */
+#define METHOD_NUM_ARM 64
+struct timer_arm_ipc_in {
+    uint64_t deadline;
+};
+
+struct timer_arm_ipc_out {
+};
+
+_Static_assert(sizeof_in_MRs(struct timer_arm_ipc_in) <= seL4_MsgMaxLength,
+               "struct timer_arm_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct timer_arm_ipc_out) <= seL4_MsgMaxLength,
+               "struct timer_arm_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t timer_arm(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+
+/****************************************
+ * extern uint64_t elapsed(void);
+ */
+#define METHOD_NUM_ELAPSED 65
+struct timer_elapsed_ipc_in {
+};
+
+struct timer_elapsed_ipc_out {
+    uint64_t __ret;
+};
+
+_Static_assert(sizeof_in_MRs(struct timer_elapsed_ipc_in) <= seL4_MsgMaxLength,
+               "struct timer_elapsed_ipc_in does not fit in seL4_MsgMaxLength MRs");
+_Static_assert(sizeof_in_MRs(struct timer_elapsed_ipc_out) <= seL4_MsgMaxLength,
+               "struct timer_elapsed_ipc_out does not fit in seL4_MsgMaxLength MRs");
+extern seL4_MessageInfo_t timer_elapsed(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);
+
+#endif /* TIMER_COMPOSITE_SERVER_SERVER_H */
@@ -0,0 +1,170 @@
+#!/usr/bin/python3
+#
+# Content addressed cache of generated files. An entry is keyed by the
+# xml content, generator, word size, output name, generator options and
+# the generator source, so a hit can skip parsing and generation.
+#
+# Layout: <cachedir>/<key>/meta.json plus one out<suffix> file per
+# generated file (e.g. out.h, out.c).
+
+import sys, os, argparse, hashlib, json, shutil, time
+
+VERSION = '1'
+
+# Source files the generated output depends on
+_sources = ['interface_parse.py', 'interface_gen.py', 'interface_layout.py']
+
+_generator_version = None
+
+def generator_version():
+    global _generator_version
+    if _generator_version is None:
+        h = hashlib.sha256(VERSION.encode())
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in _sources:
+            with open(os.path.join(here, name), 'rb') as f:
+                h.update(f.read())
+        _generator_version = h.hexdigest()
+    return _generator_version
+
+
+class GeneratorCache:
+    def __str__(self):
+        return str(self.__class__) + ": " + str(self.__dict__)
+
+    def __init__(self, cachedir):
+        self.cachedir = cachedir
+
+    def key(self, xml, generator, wordsize, filebasename, options):
+        h = hashlib.sha256()
+        h.update(generator_version().encode())
+        h.update(hashlib.sha256(xml).hexdigest().encode())
+        desc = [generator, wordsize, filebasename, sorted(options.items())]
+        h.update(json.dumps(desc).encode())
+        return h.hexdigest()
+
+    def entry_dir(self, key):
+        return os.path.join(self.cachedir, key)
+
+    def lookup(self, key):
+        '''Generated text by file name suffix, None on a miss'''
+        entry = self.entry_dir(key)
+        try:
+            with open(os.path.join(entry, 'meta.json')) as f:
+                meta = json.load(f)
+            outputs = {}
+            for suffix in meta['suffixes']:
+                with open(os.path.join(entry, 'out' + suffix)) as f:
+                    outputs[suffix] = f.read()
+        except (OSError, ValueError, KeyError):
+            return None
+        # Used by prune to find stale entries
+        os.utime(os.path.join(entry, 'meta.json'))
+        return outputs
+
+    def store(self, key, outputs, **meta):
+        entry = self.entry_dir(key)
+        if os.path.isdir(entry):
+            return
+        os.makedirs(self.cachedir, exist_ok=True)
+        tmp = f'{entry}.{os.getpid()}.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.mkdir(tmp)
+        for suffix, text in outputs.items():
+            with open(os.path.join(tmp, 'out' + suffix), 'w') as f:
+                f.write(text)
+        meta['suffixes'] = sorted(outputs.keys())
+        meta['created'] = time.time()
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+        try:
+            os.rename(tmp, entry)
+        except OSError:
+            # Someone else stored the same entry first
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    def entries(self):
+        '''(key, last used time, size in bytes, meta) of every entry'''
+        result = []
+        if not os.path.isdir(self.cachedir):
+            return result
+        for key in sorted(os.listdir(self.cachedir)):
+            entry = self.entry_dir(key)
+            metafile = os.path.join(entry, 'meta.json')
+            if key.endswith('.tmp') or not os.path.isfile(metafile):
+                continue
+            with open(metafile) as f:
+                meta = json.load(f)
+            size = sum(os.path.getsize(os.path.join(entry, n)) for n in os.listdir(entry))
+            result.append((key, os.path.getmtime(metafile), size, meta))
+        return result
+
+    def remove(self, key):
+        shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+
+    def prune(self, max_age=None, max_entries=None):
+        '''Remove entries unused for max_age seconds, then the least
+        recently used ones beyond max_entries. Returns the number removed.'''
+        entries = sorted(self.entries(), key=lambda e: e[1], reverse=True)
+        now = time.time()
+        keep = []
+        removed = 0
+        for e in entries:
+            if max_age is not None and now - e[1] > max_age:
+                self.remove(e[0])
+                removed += 1
+            else:
+                keep.append(e)
+        if max_entries is not None:
+            for e in keep[max_entries:]:
+                self.remove(e[0])
+                removed += 1
+        return removed
+
+    def clear(self):
+        removed = 0
+        for e in self.entries():
+            self.remove(e[0])
+            removed += 1
+        return removed
+
+
+def default_cachedir():
+    return os.environ.get('INTERFACE_GEN_CACHE')
+
+def cache_main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description='Inspect and prune the interface generator cache')
+    ap.add_argument('-c','--cache-dir', dest='cachedir', default=default_cachedir(),
+                    type=str, help='Cache directory (default=$INTERFACE_GEN_CACHE)')
+    sub = ap.add_subparsers(dest='command', required=True)
+    sub.add_parser('list', help='List cache entries')
+    prune = sub.add_parser('prune', help='Remove old cache entries')
+    prune.add_argument('--max-age', dest='max_age', default=None,
+                       type=float, help='Remove entries unused for this many days')
+    prune.add_argument('--max-entries', dest='max_entries', default=None,
+                       type=int, help='Keep at most this many recently used entries')
+    sub.add_parser('clear', help='Remove all cache entries')
+
+    args = ap.parse_args(argv)
+    if args.cachedir is None:
+        raise RuntimeError('No cache directory given')
+    cache = GeneratorCache(args.cachedir)
+
+    if args.command == 'list':
+        total = 0
+        entries = cache.entries()
+        for key, used, size, meta in entries:
+            total += size
+            print(f'{key[:16]} {time.strftime("%Y-%m-%d %H:%M", time.localtime(used))} '
+                  f'{size:8d} {meta.get("generator")} {meta.get("wordsize")} '
+                  f'{meta.get("filename")} -> {meta.get("filebasename")}')
+        print(f'{len(entries)} entries, {total} bytes')
+    elif args.command == 'prune':
+        max_age = args.max_age * 24 * 3600 if args.max_age is not None else None
+        print(f'Removed {cache.prune(max_age, args.max_entries)} entries')
+    elif args.command == 'clear':
+        print(f'Removed {cache.clear()} entries')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(cache_main())
@@ -1,19 +1,147 @@
 #!/usr/bin/python3
-from interface_parse import Interface, ArgDirection, Method
+import sys, os, contextlib, zlib, json
+from interface_parse import Interface, ArgDirection, Method, SEL4_NUM_ERRORS
+from interface_layout import optimise_layout, struct_size
+
+class Emitter:
+    # Collects generated text as a list of fragments, joined once
+    def __init__(self):
+        self.fragments = []
+
+    def write(self, text):
+        self.fragments.append(text)
+
+    def line(self, text=''):
+        self.fragments.append(text)
+        self.fragments.append('\n')
+
+    def getvalue(self):
+        return ''.join(self.fragments)
+
+def write_if_changed(filename, text):
+    # Leave the file (and its mtime) alone if the content is the same,
+    # otherwise replace it atomically
+    data = text.encode()
+    try:
+        with open(filename, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmpname = f'{filename}.{os.getpid()}.tmp'
+    with open(tmpname, 'wb') as f:
+        f.write(data)
+    os.replace(tmpname, filename)
+    return True
+
+def remove_stale_sources(filebasename, sources):
+    # Removes the split client stub files listed in the previous
+    # <filebasename>.sources but not in sources (the new list, None if
+    # the stubs are no longer split, which removes the list too). A
+    # build globbing the directory would otherwise link them. Only
+    # names of split files are touched.
+    listfile = filebasename + '.sources'
+    try:
+        with open(listfile) as f:
+            old = f.read().split()
+    except FileNotFoundError:
+        return
+    stem = os.path.basename(filebasename) + '_'
+    for source in old:
+        if (source.startswith(stem) and source.endswith('.c') and os.path.basename(source) == source
+                and (sources is None or source not in sources)):
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(os.path.join(os.path.dirname(filebasename), source))
+    if sources is None:
+        os.remove(listfile)
 
 class InterfaceGen:
     preamble = '''
     /* This file is automatically generated, DO NOT EDIT */
     '''
+    # Output only depends on the arguments and ends up in self.outputs
+    cacheable = True
+    # Part of the include guard, tells apart the headers of different
+    # generators with the same base name (e.g. client/foo.h, server/foo.h)
+    guard_tag = ''
+
     def __str__(self):
 
         return str(self.__class__) + ": " + str(self.__dict__)
 
-    def __init__(self, interface, filebasename , wordsize):
+    def __init__(self, interface, filebasename , wordsize, fastpath=False,
+                 dispatch='switch', optimise_layout=False, server_loop=False,
+                 no_reply_label=0xfffff, inline_stubs=False, profile=None,
+                 instrument=False, split=None, typed_handlers=False, write=True):
 
         self.interface = interface
         self.filebasename = filebasename
         self.wordsize = wordsize
+        self.fastpath = fastpath
+        self.dispatch = dispatch
+        self.optimise_layout = optimise_layout
+        self.server_loop = server_loop
+        self.no_reply_label = no_reply_label
+        self.inline_stubs = inline_stubs
+        # Call counts by method name, see load_profile
+        self.profile = profile if profile is not None else {}
+        self.instrument = instrument
+        # Client stubs in one .c (None), one per method ('method') or
+        # in this many shards
+        self.split = split
+        self.typed_handlers = typed_handlers
+        self.write = write
+        self.outputs = {}
+        # None for generators combining several interfaces
+        if self.interface is not None:
+            for m in self.interface.methods:
+                self.check_method(m)
+
+    def check_method(self, method: Method):
+        # Lower labels are seL4_Error values
+        for id in (method.id, method.batch_id):
+            if id is not None and id < SEL4_NUM_ERRORS:
+                raise RuntimeError(f'Method "{method.name}" id {id} must be at least seL4_NumErrors ({SEL4_NUM_ERRORS})')
+        if method.oneway:
+            if len(method.out_args) > 0:
+                raise RuntimeError(f'Oneway method "{method.name}" cannot have out args')
+            if len(method.out_caps) > 0:
+                raise RuntimeError(f'Oneway method "{method.name}" cannot receive capabilities')
+            if method.return_type != 'void':
+                raise RuntimeError(f'Oneway method "{method.name}" must return void')
+        elif method.nonblocking:
+            raise RuntimeError(f'Method "{method.name}" is nonblocking but not oneway')
+        if method.batch_id is not None and (method.oneway or len(method.cap_args) > 0):
+            raise RuntimeError(f'Batched method "{method.name}" cannot be oneway or have capability args')
+        if len(method.buf_args) > 0 and (self.interface.shmem == '' or self.interface.shmem_size == ''):
+            raise RuntimeError(f'Method "{method.name}" has buffer args but the interface has no shmem/shmem_size')
+        if self.interface.client_state is not None and (method.name == 'clients' or method.name.startswith('client_')):
+            raise RuntimeError(f'Method "{method.name}" clashes with the client state functions')
+        if method.cache_size is not None:
+            # The reply must only depend on the values in the in struct
+            if method.oneway or len(method.cap_args) > 0 or len(method.buf_args) > 0:
+                raise RuntimeError(f'Cacheable method "{method.name}" cannot be oneway or have capability or buffer args')
+            if any('*' in a.ctype for a in method.args):
+                raise RuntimeError(f'Cacheable method "{method.name}" cannot have pointer args')
+
+    def include_guard(self):
+        name = os.path.basename(self.filebasename) or 'interface'
+        return ''.join(c if c.isalnum() else '_' for c in name.upper()) + self.guard_tag + '_H'
+
+    @contextlib.contextmanager
+    def open_output(self, suffix, stdout=False):
+        # Output is collected in memory, self.outputs maps the file name
+        # suffix to the generated text. It is written out in one go unless
+        # the generator was created with write=False.
+        f = Emitter()
+        yield f
+        self.outputs[suffix] = f.getvalue()
+        if not self.write:
+            pass
+        elif stdout:
+            sys.stdout.write(self.outputs[suffix])
+        else:
+            write_if_changed(self.filebasename + suffix, self.outputs[suffix])
 
     def formatarg(self,a):
         if a.const:
@@ -28,6 +156,19 @@ class InterfaceGen:
     def formatcaparg(self,a):
         return f'{a.ctype} {a.name}'
 
+    def formatbufarg(self,a):
+        if a.direction == ArgDirection.IN:
+            return f'const {a.ctype} *{a.name}'
+        else:
+            return f'{a.ctype} *{a.name}'
+
+    def formatparams(self, method: Method):
+        params = (list(map(self.formatarg,method.args)) + list(map(self.formatbufarg,method.buf_args)) +
+                  list(map(self.formatcaparg,method.cap_args)))
+        if len(params) == 0:
+            return 'void'
+        return ', '.join(params)
+
 
 
     def ipc_in_struct_name(self,method : str):
@@ -36,159 +177,615 @@ class InterfaceGen:
     def ipc_out_struct_name(self,method: str):
         return f'{method}_ipc_out'
 
+    def ipc_in_fields(self, method: Method, wordsize=None):
+        # (ctype, name, client side value) of the in struct members, laid
+        # out for wordsize (default the one generated for)
+        wordsize = wordsize or self.wordsize
+        fields = []
+        for a in method.in_args:
+            if a.const and a.direction == ArgDirection.IN and '*' in a.ctype:
+                # super hacky check if passing const pointer by value
+                # passing values, const is discarded
+                ctype = f'const {a.ctype}'
+            else:
+                ctype = a.ctype
+            fields.append((ctype, a.name, a.name if a.direction == ArgDirection.IN else f'*{a.name}'))
+        for b in method.buf_args:
+            # Buffers live in the shared region, only their place is sent
+            fields.append(('seL4_Word', f'{b.name}_offset',
+                           f'(seL4_Word)((const char *){b.name} - (const char *)({self.interface.shmem}))'))
+            fields.append(('seL4_Word', f'{b.name}_len', f'(seL4_Word)({b.size})'))
+        if self.optimise_layout:
+            fields = optimise_layout(fields, wordsize, ctype=lambda f: f[0])
+        return fields
+
+    def ipc_out_fields(self, method: Method, wordsize=None):
+        # (ctype, name) of the out struct members
+        wordsize = wordsize or self.wordsize
+        fields = []
+        if method.return_type != 'void' and method.return_type != 'seL4_MessageInfo_t':
+            fields.append((method.return_type, '__ret'))
+        fields += [(a.ctype, a.name) for a in method.out_args]
+        if self.optimise_layout:
+            fields = optimise_layout(fields, wordsize, ctype=lambda f: f[0])
+        return fields
+
     def gen_ipc_in_struct(self,method: Method, indent='', name_prefix=''):
-        buf=''
-        buf=buf+f'{indent}struct {name_prefix}{self.ipc_in_struct_name(method.name)} {{'+'\n'
-        for a in method.args:
-            if a.direction != ArgDirection.OUT:
-                if a.const and a.direction == ArgDirection.IN and '*' in a.ctype:
-                    # super hacky check if passing const pointer by value
-                    # passing values, const is discarded
-                    const = 'const '
-                else:
-                    const=''
-                buf=buf+f'{indent}    {const}{a.ctype} {a.name};'+'\n'
-        buf=buf+f'{indent}}};'+'\n'
-        return buf
+        buf=[f'{indent}struct {name_prefix}{self.ipc_in_struct_name(method.name)} {{\n']
+        for ctype, name, value in self.ipc_in_fields(method):
+            buf.append(f'{indent}    {ctype} {name};\n')
+        buf.append(f'{indent}}};\n')
+        return ''.join(buf)
 
     def gen_ipc_out_struct(self, method: Method, indent='',name_prefix=''):
-        buf=''
-        buf=buf+f'{indent}struct {name_prefix}{self.ipc_out_struct_name(method.name)} {{'+'\n'
-        if method.return_type != 'void' and method.return_type != 'seL4_MessageInfo_t':
-            buf=buf+f'{indent}    {method.return_type} __ret;'+'\n'
-        for a in method.args:
-            if a.direction != ArgDirection.IN:
-                buf=buf+f'{indent}    {a.ctype} {a.name};'+'\n'
-        buf=buf+f'{indent}}};'+'\n'
-        return buf
+        buf=[f'{indent}struct {name_prefix}{self.ipc_out_struct_name(method.name)} {{\n']
+        for ctype, name in self.ipc_out_fields(method):
+            buf.append(f'{indent}    {ctype} {name};\n')
+        buf.append(f'{indent}}};\n')
+        return ''.join(buf)
+
+    def gen_size_asserts(self, f, method: Method, indent='', name_prefix=''):
+        # Oversized messages would otherwise only show up at run time
+        for struct in (self.ipc_in_struct_name(method.name), self.ipc_out_struct_name(method.name)):
+            f.line(f'{indent}_Static_assert(sizeof_in_MRs(struct {name_prefix}{struct}) <= seL4_MsgMaxLength,')
+            f.line(f'{indent}               "struct {name_prefix}{struct} does not fit in seL4_MsgMaxLength MRs");')
+
+    def ipc_in_initialiser(self, method: Method):
+        # Same order as the struct members
+        return ', '.join(f[2] for f in self.ipc_in_fields(method))
+
+    def gen_batch_macros(self, hf, method: Method, macro_prefix='', struct_prefix=''):
+        # Records are packed stride words apart, in and out alike, and as
+        # many as fit go in one message
+        name = f'{macro_prefix}{method.name.upper()}_BATCH'
+        in_mrs = f'sizeof_in_MRs(struct {struct_prefix}{self.ipc_in_struct_name(method.name)})'
+        out_mrs = f'sizeof_in_MRs(struct {struct_prefix}{self.ipc_out_struct_name(method.name)})'
+        hf.line(f'#define METHOD_NUM_{method.name.upper()}_BATCH {method.batch_id}')
+        hf.line(f'#define {name}_STRIDE ({in_mrs} > {out_mrs} ? {in_mrs} : ({out_mrs} > 0 ? {out_mrs} : 1))')
+        hf.line(f'#define {name}_MAX (seL4_MsgMaxLength / {name}_STRIDE)')
+
+    def stats_names(self):
+        # Every label the stats are kept for, indexed in this order
+        names = [m.name for m in self.interface.methods]
+        names += [f'{m.name}_batch' for m in self.interface.methods if m.batch_id is not None]
+        return names
+
+    def stat_idx(self, prefix, name):
+        return f'{prefix.upper()}STATS_IDX_{name.upper()}'
+
+    def gen_stats_decls(self, hf, prefix):
+        # Everything compiles away unless <PREFIX>STATS is defined. The
+        # counters are not atomic, concurrent callers can lose updates.
+        names = self.stats_names()
+        macro = prefix.upper()
+        hf.line()
+        hf.line(f'/* Per-method call statistics, define {macro}STATS to collect them */')
+        hf.line(f'#define {macro}STATS_METHODS {len(names)}')
+        for idx, name in enumerate(names):
+            hf.line(f'#define {self.stat_idx(prefix, name)} {idx}')
+        hf.line(f'#ifdef {macro}STATS')
+        hf.line(f'#ifndef {macro}CYCLES')
+        hf.line('#if defined(__x86_64__) || defined(__i386__)')
+        hf.line(f'#define {macro}CYCLES() __builtin_ia32_rdtsc()')
+        hf.line('#elif defined(__aarch64__)')
+        hf.line(f'#define {macro}CYCLES() ({{ seL4_Uint64 _c; __asm__ volatile("mrs %0, cntvct_el0" : "=r"(_c)); _c; }})')
+        hf.line('#elif defined(__riscv)')
+        hf.line(f'#define {macro}CYCLES() ({{ unsigned long _c; __asm__ volatile("rdcycle %0" : "=r"(_c)); (seL4_Uint64)_c; }})')
+        hf.line('#else')
+        hf.line(f'#define {macro}CYCLES() ((seL4_Uint64)0)')
+        hf.line('#endif')
+        hf.line('#endif')
+        hf.line(f'#ifndef {macro}STATS_BUCKETS')
+        hf.line(f'#define {macro}STATS_BUCKETS 32')
+        hf.line('#endif')
+        hf.line(f'struct {prefix}stats {{')
+        hf.line('    seL4_Uint64 calls;')
+        hf.line('    seL4_Uint64 cycles;')
+        hf.line('    seL4_Uint64 max_cycles;')
+        hf.line(f'    /* hist[i] counts calls taking [2^(i-1), 2^i) cycles, the last bucket the rest */')
+        hf.line(f'    seL4_Uint64 hist[{macro}STATS_BUCKETS];')
+        hf.line('};')
+        hf.line(f'extern struct {prefix}stats {prefix}stats[{macro}STATS_METHODS];')
+        hf.line(f'extern const char *const {prefix}stats_names[{macro}STATS_METHODS];')
+        hf.line(f'static inline void {prefix}stat_record(struct {prefix}stats *s, seL4_Uint64 cycles)\n{{')
+        hf.line('    unsigned bucket = cycles == 0 ? 0 : 64 - __builtin_clzll(cycles);')
+        hf.line(f'    if (bucket >= {macro}STATS_BUCKETS) {{')
+        hf.line(f'        bucket = {macro}STATS_BUCKETS - 1;')
+        hf.line('    }')
+        hf.line('    s->calls++;')
+        hf.line('    s->cycles += cycles;')
+        hf.line('    if (cycles > s->max_cycles) {')
+        hf.line('        s->max_cycles = cycles;')
+        hf.line('    }')
+        hf.line('    s->hist[bucket]++;')
+        hf.line('}')
+        hf.line(f'#define {macro}STAT_BEGIN(idx) seL4_Uint64 {prefix}stat_start = {macro}CYCLES()')
+        hf.line(f'#define {macro}STAT_END(idx) {prefix}stat_record(&{prefix}stats[idx], {macro}CYCLES() - {prefix}stat_start)')
+        hf.line('#else')
+        hf.line(f'#define {macro}STAT_BEGIN(idx) do {{ }} while (0)')
+        hf.line(f'#define {macro}STAT_END(idx) do {{ }} while (0)')
+        hf.line('#endif')
+
+    def gen_stats_defs(self, cf, prefix):
+        macro = prefix.upper()
+        cf.line(f'#ifdef {macro}STATS')
+        cf.line(f'struct {prefix}stats {prefix}stats[{macro}STATS_METHODS];')
+        cf.line(f'const char *const {prefix}stats_names[{macro}STATS_METHODS] = {{')
+        for name in self.stats_names():
+            cf.line(f'    [{self.stat_idx(prefix, name)}] = "{name}",')
+        cf.line('};')
+        cf.line('#endif\n')
+
+    def by_hotness(self, methods):
+        # Most called first, declaration order without a profile
+        return sorted(methods, key=lambda m: -self.profile.get(m.name, 0))
+
+    def fastpath_eligible(self, method: Method):
+        # Caps are transferred through the IPC buffer, so only cap-free
+        # methods can stay in registers. Whether the structs fit in
+        # seL4_FastMessageRegisters is decided by the C compiler.
+        return self.fastpath and len(method.cap_args) == 0
 
 
 class InterfacePrint(InterfaceGen):
+    # Prints to stdout
+    cacheable = False
+
     def __str__(self):
 
         return str(self.__class__) + ": " + str(self.__dict__)
 
-    def __init__(self, interface, filebasename = '', wordsize=8):
+    def __init__(self, interface, filebasename = '', wordsize=8, **options):
 
-        super().__init__(interface, filebasename, wordsize)
+        super().__init__(interface, filebasename, wordsize, **options)
         
-        for i in self.interface.includes:
-            print(f'#include {i.header}')
+        with self.open_output('', stdout=True) as pf:
+            for i in self.interface.includes:
+                pf.line(f'#include {i.header}')
 
-        for i in self.interface.defines:
-            print(f'#define {i.name} ({i.value})')
+            for i in self.interface.defines:
+                pf.line(f'#define {i.name} ({i.value})')
 
-        for i in self.interface.methods:
-            print(f'{i.name}[id={i.id}](',end='')
-            print(', '.join(map(self.formatarg,i.args)),end='')
-            print(f') -> {i.return_type}')
+            for i in self.interface.methods:
+                pf.write(f'{i.name}[id={i.id}](')
+                pf.write(', '.join(list(map(self.formatarg,i.args)) + list(map(self.formatbufarg,i.buf_args))))
+                pf.line(f') -> {i.return_type}' + (' oneway' if i.oneway else '') +
+                        (f' batch[id={i.batch_id}]' if i.batch_id is not None else '') +
+                        (f' cacheable[{i.cache_size}]' if i.cache_size is not None else ''))
 
 
 
-# should add check the id are greater than seL4_NumErrors
+class InterfaceCostReport(InterfaceGen):
+    # Message cost of each method for every word size, as text (.txt)
+    # and json (.json). Sizes come from interface_layout, methods with
+    # types it doesn't know have no size. The kernel fastpath takes
+    # seL4_Call with no caps and messages of up to
+    # seL4_FastMessageRegisters words both ways. That is 4 on every 64
+    # bit architecture, on 32 bit ones it is 2 on ia32 and 4 on ARM and
+    # RISC-V, the report takes the smaller.
+    wordsizes = [4, 8]
+    fast_message_registers = {4 : 2, 8 : 4}
+    msg_max_length = 120
+
+    def __str__(self):
+
+        return str(self.__class__) + ": " + str(self.__dict__)
+
+    def __init__(self, interface, filebasename = '', wordsize=8, **options):
+
+        super().__init__(interface, filebasename, wordsize, **options)
+
+        methods = [self.method_cost(i) for i in self.interface.methods]
+        with self.open_output('.txt') as tf:
+            self.gen_text(tf, methods)
+        with self.open_output('.json') as jf:
+            report = dict(server_prefix=self.interface.server_prefix,
+                          optimise_layout=self.optimise_layout,
+                          fast_message_registers={str(ws * 8): self.fast_message_registers[ws] for ws in self.wordsizes},
+                          msg_max_length=self.msg_max_length,
+                          methods=methods)
+            jf.write(json.dumps(report, indent=1) + '\n')
+
+    def method_cost(self, i: Method):
+        cost = dict(name=i.name, id=i.id, oneway=i.oneway, batch_id=i.batch_id,
+                    in_caps=len(i.in_caps), out_caps=len(i.out_caps),
+                    buffers=[b.name for b in i.buf_args], sizes={})
+        for ws in self.wordsizes:
+            in_bytes = struct_size([f[0] for f in self.ipc_in_fields(i, ws)], ws)
+            out_bytes = 0 if i.oneway else struct_size([f[0] for f in self.ipc_out_fields(i, ws)], ws)
+            in_mrs = None if in_bytes is None else (in_bytes + ws - 1) // ws
+            out_mrs = None if out_bytes is None else (out_bytes + ws - 1) // ws
+            if in_mrs is None or out_mrs is None:
+                fastpath = fits = None
+            else:
+                fastpath = (not i.oneway and len(i.cap_args) == 0 and
+                            max(in_mrs, out_mrs) <= self.fast_message_registers[ws])
+                fits = max(in_mrs, out_mrs) <= self.msg_max_length
+            # Keyed by word size in bits
+            cost['sizes'][str(ws * 8)] = dict(in_bytes=in_bytes, out_bytes=out_bytes,
+                                              in_mrs=in_mrs, out_mrs=out_mrs,
+                                              fastpath=fastpath, fits=fits)
+        return cost
+
+    def gen_text(self, tf, methods):
+        def show(value):
+            if value is None:
+                return '?'
+            if isinstance(value, bool):
+                return 'yes' if value else 'no'
+            return str(value)
+        bits = [str(ws * 8) for ws in self.wordsizes]
+        tf.line(f'Message cost of {self.interface.server_prefix} methods, MRs are {"/".join(bits)} bit')
+        tf.line(f'Fastpath allows {"/".join(str(self.fast_message_registers[ws]) for ws in self.wordsizes)} MRs '
+                f'(32 bit as on ia32, ARM and RISC-V allow 4)')
+        tf.line()
+        tf.line(f'{"method":24s} {"id":>6s} {"in MRs":>8s} {"out MRs":>8s} {"caps in/out":>12s} {"fastpath":>9s}  notes')
+        for m in methods:
+            in_mrs = '/'.join(show(m['sizes'][b]['in_mrs']) for b in bits)
+            out_mrs = '/'.join(show(m['sizes'][b]['out_mrs']) for b in bits)
+            fastpath = '/'.join(show(m['sizes'][b]['fastpath']) for b in bits)
+            notes = []
+            if m['oneway']:
+                notes.append('oneway')
+            if m['batch_id'] is not None:
+                notes.append(f'batch[id={m["batch_id"]}]')
+            if len(m['buffers']) > 0:
+                notes.append(f'buffers {", ".join(m["buffers"])}')
+            if any(m['sizes'][b]['fits'] is False for b in bits):
+                notes.append(f'TOO BIG (seL4_MsgMaxLength is {self.msg_max_length})')
+            if any(m['sizes'][b]['in_mrs'] is None or m['sizes'][b]['out_mrs'] is None for b in bits):
+                notes.append('unknown type sizes')
+            tf.line(f'{m["name"]:24s} {show(m["id"]):>6s} {in_mrs:>8s} {out_mrs:>8s} '
+                    f'{m["in_caps"]:>6d}/{m["out_caps"]:<5d} {fastpath:>9s}  {" ".join(notes)}'.rstrip())
+
 
 class InterfaceClientStubs(InterfaceGen):
+    guard_tag = '_CLIENT'
+
     def __str__(self):
 
         return str(self.__class__) + ": " + str(self.__dict__)
 
-    def __init__(self, interface, filebasename = '', wordsize=8):
+    def __init__(self, interface, filebasename = '', wordsize=8, **options):
 
-        super().__init__(interface, filebasename, wordsize)
+        super().__init__(interface, filebasename, wordsize, **options)
 
-        with open(self.filebasename + '.h', 'w') as hf:
-            print(self.preamble, file=hf)
+        with self.open_output('.h') as hf:
+            hf.line(self.preamble)
+            hf.line(f'#ifndef {self.include_guard()}')
+            hf.line(f'#define {self.include_guard()}\n')
             
             for i in self.interface.includes:
                 if i.client:
-                    print(f'#include {i.header}',file=hf)
+                    hf.line(f'#include {i.header}')
 
-            print(f'#define sizeof_in_MRs(x)    ((sizeof(x)+{self.wordsize}-1)/{self.wordsize})',file=hf)    
+            hf.line(f'#define sizeof_in_MRs(x)    ((sizeof(x)+{self.wordsize}-1)/{self.wordsize})')
             for i in self.interface.defines:
-                print(f'#define {i.name} ({i.value})', file=hf)
+                hf.line(f'#define {i.name} ({i.value})')
+
+            if self.fastpath:
+                syscalls = [('call', 'Call')]
+                if any(i.oneway for i in self.interface.methods):
+                    syscalls += [('send', 'Send'), ('nbsend', 'NBSend')]
+                hf.line('#if seL4_FastMessageRegisters == 4')
+                for name, syscall in syscalls:
+                    hf.line(f'#define {name}_with_MRs(cap, msg, mr) seL4_{syscall}WithMRs(cap, msg, &(mr)[0], &(mr)[1], &(mr)[2], &(mr)[3])')
+                hf.line('#elif seL4_FastMessageRegisters == 2')
+                for name, syscall in syscalls:
+                    hf.line(f'#define {name}_with_MRs(cap, msg, mr) seL4_{syscall}WithMRs(cap, msg, &(mr)[0], &(mr)[1])')
+                hf.line('#else')
+                hf.line('#error "Unsupported number of fast message registers"')
+                hf.line('#endif')
+
+            if self.instrument:
+                self.gen_stats_decls(hf, self.stats_prefix())
+
+            if any(i.cache_size is not None for i in self.interface.methods):
+                self.gen_cache_hash(hf)
 
             for i in self.interface.methods:
-                print(f'#define METHOD_NUM_{i.name.upper()} {i.id}',file=hf)
-                print(f'extern {i.return_type} {i.name}(',end='', file=hf)
+                hf.line(f'#define METHOD_NUM_{i.name.upper()} {i.id}')
+                if not self.inline_stubs:
+                    hf.line(f'extern {i.return_type} {i.name}({self.formatparams(i)});\n')
+                if self.structs_in_header(i):
+                    hf.line(self.gen_ipc_in_struct(i))
+                    hf.line(self.gen_ipc_out_struct(i))
+                    self.gen_size_asserts(hf, i)
+                if i.batch_id is not None:
+                    self.gen_batch_macros(hf, i)
+                    if not self.inline_stubs:
+                        hf.line(f'extern seL4_Word {i.name}_batch({self.batch_params(i)});\n')
+                if i.cache_size is not None:
+                    self.gen_cache_decls(hf, i)
+                if self.inline_stubs:
+                    # Definitions go in the header so constant arguments and
+                    # the message info fold into each call site
+                    self.gen_stub(hf, i, 'static inline ')
+                    if i.batch_id is not None:
+                        self.gen_batch_stub(hf, i, 'static inline ')
 
-                    
-                if len(i.args) == 0 and len(i.cap_args) == 0:
-                    print(f'void',end='', file=hf)
-                else:
-                    if len(i.args) > 0:
-                        print(', '.join(map(self.formatarg,i.args)),end='',file=hf)
-                    if len(i.cap_args) > 0:
-                        print(', '.join(map(self.formatcaparg,i.cap_args)),end='',file=hf)
-                
-                print(');\n',file=hf)
-            
-            
-        with open(self.filebasename + '.c', 'w') as cf:
-            print(self.preamble, file=cf)
-            print(f'#include <{self.filebasename + ".h"}>',file=cf)
+            hf.line(f'#endif /* {self.include_guard()} */')
+
+        with self.open_output('.c') as cf:
+            cf.line(self.preamble)
+            cf.line(f'#include <{self.filebasename + ".h"}>')
 
             #for i in self.interface.includes:
             #    print(f'#include {i.header}',file=cf)
 
+            if self.instrument:
+                cf.line()
+                self.gen_stats_defs(cf, self.stats_prefix())
 
-            for i in self.interface.methods:
-                print(f'{i.return_type} {i.name}(',end='', file=cf)
-                
-                if len(i.args) == 0 and len(i.cap_args) == 0:
-                    print(f'void',end='', file=cf)
-                else:
-                    if len(i.args) > 0:
-                        print(', '.join(map(self.formatarg,i.args)),end='',file=cf)
-                    if len(i.cap_args) > 0:
-                        print(', '.join(map(self.formatcaparg,i.cap_args)),end='',file=cf)
-                
-                
-                print(')\n{',file=cf)
-                print(self.gen_ipc_in_struct(i,'    '),file=cf)
-                print(self.gen_ipc_out_struct(i,'    '),file=cf)
-                print(f'    seL4_MessageInfo_t message;', file=cf)
-                print(f'    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();', file=cf)
-                print(f'    struct {self.ipc_in_struct_name(i.name)} *argsin_ptr = (struct {self.ipc_in_struct_name(i.name)} *) &(ipc_buf->msg[0]);', file=cf)
-                print(f'    struct {self.ipc_out_struct_name(i.name)} *argsout_ptr = (struct {self.ipc_out_struct_name(i.name)} *) &(ipc_buf->msg[0]);', file=cf)
-
-                if len(i.args) > 0:
-                    print(f'    *argsin_ptr = ((struct {self.ipc_in_struct_name(i.name)}) {{', end='', file=cf)
-                    initialiser = ', '.join(map(lambda a: f'{a.name}' if a.direction == ArgDirection.IN else f'*{a.name}',filter(lambda a: a.direction != ArgDirection.OUT, i.args)))
-                    print(initialiser, end='',file=cf)
-                    print('});',file=cf)
-                in_caps = list(filter(lambda c: c.direction == ArgDirection.IN,i.cap_args))
-                num_in_caps = len(in_caps)
-                out_caps = list(filter(lambda c: c.direction == ArgDirection.OUT,i.cap_args))
-                num_out_caps = len(out_caps)
-
-                for ci in range(num_in_caps):
-                    print(f'    ipc_buf->caps_or_badges[{ci}] = {in_caps[ci].name};',file=cf)
-                    
-                    
-                
-                if num_out_caps == 0:
-                    pass
-                elif num_out_caps == 1:
-                   print(f'    ipc_buf->receiveCNode = {self.interface.client_cspace_root};',file=cf) 
-                   print(f'    ipc_buf->receiveIndex = {out_caps[0].name};',file=cf) 
-                   print(f'    ipc_buf->receiveDepth = {self.interface.client_cspace_depth};',file=cf) 
-                else:
-                    raise RuntimeError('Only one capability can be received')                    
-
-
-                print(f'    message = seL4_MessageInfo_new(METHOD_NUM_{i.name.upper()}, 0, {num_in_caps}, sizeof_in_MRs(struct {self.ipc_in_struct_name(i.name)}));', file=cf)
-                print(f'    message = seL4_Call({i.cap}, message);',file=cf)
-                outs = [a for a in i.args if a.direction != ArgDirection.IN]
-                for o in outs:
-                    print (f'    *{o.name} = argsout_ptr->{o.name};',file=cf)
-                if i.return_type == 'void':
-                    pass
-                elif i.return_type == 'seL4_MessageInfo_t':
-                    print(f'    return message;', file=cf)
-                else:
-                    print(f'    return argsout_ptr->__ret;', file=cf)
+            # Here whether or not the stubs are inline or split
+            if any(i.cache_size is not None for i in self.interface.methods):
+                cf.line()
+                self.gen_cache_defs(cf)
+
+            # With inline stubs there is nothing left out of line, the file
+            # is kept so builds listing it still work
+            if not self.inline_stubs and self.split is None:
+                for i in self.interface.methods:
+                    self.gen_stub(cf, i)
+                    if i.batch_id is not None:
+                        self.gen_batch_stub(cf, i)
+
+        if self.write and self.split is None:
+            remove_stale_sources(self.filebasename, None)
+        if not self.inline_stubs and self.split is not None:
+            # One translation unit per method or shard, with write if
+            # changed only the ones with changed methods get rebuilt.
+            # The .sources manifest lists every .c file to compile.
+            sources = [os.path.basename(self.filebasename) + '.c']
+            for suffix, methods in self.split_methods():
+                with self.open_output(suffix) as cf:
+                    cf.line(self.preamble)
+                    cf.line(f'#include <{self.filebasename + ".h"}>\n')
+                    for i in methods:
+                        self.gen_stub(cf, i)
+                        if i.batch_id is not None:
+                            self.gen_batch_stub(cf, i)
+                sources.append(os.path.basename(self.filebasename) + suffix)
+            if self.write:
+                remove_stale_sources(self.filebasename, sources)
+            with self.open_output('.sources') as sf:
+                for source in sources:
+                    sf.line(source)
+
+    def split_methods(self):
+        # (file name suffix, methods) of each split .c file. Shards are
+        # picked by a hash of the method name, so adding or removing a
+        # method only changes its own shard and the set of files only
+        # depends on the number of shards.
+        if self.split == 'method':
+            return [(f'_{m.name}.c', [m]) for m in self.interface.methods]
+        shards = [(f'_{n}.c', []) for n in range(self.split)]
+        for m in self.interface.methods:
+            shards[zlib.crc32(m.name.encode()) % self.split][1].append(m)
+        return shards
+
+    def stats_prefix(self):
+        return f'{self.interface.server_prefix}client_'
+
+    def structs_in_header(self, i: Method):
+        # Batched and cached methods share their structs with other code
+        return i.batch_id is not None or i.cache_size is not None
+
+    def cache_prefix(self):
+        return f'{self.interface.server_prefix}client_cache_'
+
+    def gen_cache_hash(self, hf):
+        # The caches are plain arrays, callers on several threads must
+        # serialise their calls to cached methods and the invalidates
+        hf.line()
+        hf.line('/* Client side reply caches, not thread safe */')
+        hf.line(f'extern void {self.cache_prefix()}invalidate_all(void);')
+        hf.line(f'static inline seL4_Word {self.cache_prefix()}hash(const void *key, seL4_Word len)\n{{')
+        hf.line('    /* FNV-1a */')
+        hf.line('    const unsigned char *p = key;')
+        hf.line('    seL4_Uint32 h = 2166136261u;')
+        hf.line('    seL4_Word j;')
+        hf.line('    for (j = 0; j < len; j++) {')
+        hf.line('        h = (h ^ p[j]) * 16777619u;')
+        hf.line('    }')
+        hf.line('    return h;')
+        hf.line('}\n')
+
+    def gen_cache_decls(self, hf, i: Method):
+        hf.line(f'#define {i.name.upper()}_CACHE_SIZE {i.cache_size}')
+        hf.line(f'struct {i.name}_cache_entry {{')
+        hf.line('    seL4_Bool valid;')
+        hf.line(f'    struct {self.ipc_in_struct_name(i.name)} in;')
+        hf.line(f'    struct {self.ipc_out_struct_name(i.name)} out;')
+        if i.return_type == 'seL4_MessageInfo_t':
+            hf.line('    seL4_MessageInfo_t message;')
+        hf.line('};')
+        hf.line(f'extern struct {i.name}_cache_entry {i.name}_cache[{i.name.upper()}_CACHE_SIZE];')
+        hf.line(f'extern void {i.name}_invalidate(void);\n')
+
+    def gen_cache_defs(self, cf):
+        cached = [i for i in self.interface.methods if i.cache_size is not None]
+        for i in cached:
+            cf.line(f'struct {i.name}_cache_entry {i.name}_cache[{i.name.upper()}_CACHE_SIZE];\n')
+            cf.line(f'void {i.name}_invalidate(void)\n{{')
+            cf.line(f'    __builtin_memset({i.name}_cache, 0, sizeof({i.name}_cache));')
+            cf.line('}\n')
+        cf.line(f'void {self.cache_prefix()}invalidate_all(void)\n{{')
+        for i in cached:
+            cf.line(f'    {i.name}_invalidate();')
+        cf.line('}\n')
+
+    def gen_cache_lookup(self, cf, i: Method):
+        # Direct mapped on a hash of the in struct, which is zeroed
+        # first so padding doesn't change the key
+        cf.line(f'    struct {self.ipc_in_struct_name(i.name)} cache_key;')
+        cf.line(f'    struct {i.name}_cache_entry *cache_entry;')
+        cf.line('    __builtin_memset(&cache_key, 0, sizeof(cache_key));')
+        for ctype, name, value in self.ipc_in_fields(i):
+            cf.line(f'    cache_key.{name} = {value};')
+        cf.line(f'    cache_entry = &{i.name}_cache[{self.cache_prefix()}hash(&cache_key, sizeof(cache_key)) % {i.name.upper()}_CACHE_SIZE];')
+        cf.line('    if (cache_entry->valid && __builtin_memcmp(&cache_entry->in, &cache_key, sizeof(cache_key)) == 0) {')
+        for o in i.out_args:
+            cf.line(f'        *{o.name} = cache_entry->out.{o.name};')
+        if i.return_type == 'void':
+            cf.line('        return;')
+        elif i.return_type == 'seL4_MessageInfo_t':
+            cf.line('        return cache_entry->message;')
+        else:
+            cf.line('        return cache_entry->out.__ret;')
+        cf.line('    }')
+
+    def gen_cache_store(self, cf, i: Method, indent, out):
+        # Error replies (non zero label) are not kept
+        if i.cache_size is None:
+            return
+        cf.line(f'{indent}if (seL4_MessageInfo_get_label(message) == 0) {{')
+        cf.line(f'{indent}    __builtin_memcpy(&cache_entry->in, &cache_key, sizeof(cache_key));')
+        if len(self.ipc_out_fields(i)) > 0:
+            cf.line(f'{indent}    cache_entry->out = {out};')
+        if i.return_type == 'seL4_MessageInfo_t':
+            cf.line(f'{indent}    cache_entry->message = message;')
+        cf.line(f'{indent}    cache_entry->valid = 1;')
+        cf.line(f'{indent}}}')
+
+    def gen_stat_begin(self, cf, indent, name):
+        if self.instrument:
+            cf.line(f'{indent}{self.stats_prefix().upper()}STAT_BEGIN({self.stat_idx(self.stats_prefix(), name)});')
 
-                print('}\n\n',file=cf)
+    def gen_stat_end(self, cf, indent, name):
+        if self.instrument:
+            cf.line(f'{indent}{self.stats_prefix().upper()}STAT_END({self.stat_idx(self.stats_prefix(), name)});')
+
+    def gen_stub(self, cf, i: Method, qualifier=''):
+        cf.line(f'{qualifier}{i.return_type} {i.name}({self.formatparams(i)})\n{{')
+        if not self.structs_in_header(i):
+            cf.line(self.gen_ipc_in_struct(i,'    '))
+            cf.line(self.gen_ipc_out_struct(i,'    '))
+            self.gen_size_asserts(cf, i, '    ')
+        cf.line(f'    seL4_MessageInfo_t message;')
+        if i.cache_size is not None:
+            self.gen_cache_lookup(cf, i)
+        if self.fastpath_eligible(i):
+            self.gen_fastpath_call(i, cf)
+        # Only declared when used, inline stubs end up in every includer
+        if len(i.args) > 0 or len(i.buf_args) > 0 or len(self.ipc_out_fields(i)) > 0 or len(i.cap_args) > 0:
+            cf.line(f'    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();')
+        if len(i.args) > 0 or len(i.buf_args) > 0:
+            cf.line(f'    struct {self.ipc_in_struct_name(i.name)} *argsin_ptr = (struct {self.ipc_in_struct_name(i.name)} *) &(ipc_buf->msg[0]);')
+        if len(self.ipc_out_fields(i)) > 0:
+            cf.line(f'    struct {self.ipc_out_struct_name(i.name)} *argsout_ptr = (struct {self.ipc_out_struct_name(i.name)} *) &(ipc_buf->msg[0]);')
+
+        if len(i.args) > 0 or len(i.buf_args) > 0:
+            cf.write(f'    *argsin_ptr = ((struct {self.ipc_in_struct_name(i.name)}) {{')
+            cf.write(self.ipc_in_initialiser(i))
+            cf.line('});')
+        in_caps = i.in_caps
+        num_in_caps = len(in_caps)
+        out_caps = i.out_caps
+        num_out_caps = len(out_caps)
+
+        for ci in range(num_in_caps):
+            cf.line(f'    ipc_buf->caps_or_badges[{ci}] = {in_caps[ci].name};')
+            
+            
+        
+        if num_out_caps == 0:
+            pass
+        elif num_out_caps == 1:
+           cf.line(f'    ipc_buf->receiveCNode = {self.interface.client_cspace_root};')
+           cf.line(f'    ipc_buf->receiveIndex = {out_caps[0].name};')
+           cf.line(f'    ipc_buf->receiveDepth = {self.interface.client_cspace_depth};')
+        else:
+            raise RuntimeError('Only one capability can be received')                    
+
+
+        cf.line(f'    message = seL4_MessageInfo_new(METHOD_NUM_{i.name.upper()}, 0, {num_in_caps}, sizeof_in_MRs(struct {self.ipc_in_struct_name(i.name)}));')
+        self.gen_stat_begin(cf, '    ', i.name)
+        if i.oneway:
+            cf.line(f'    seL4_{self.send_syscall(i)}({i.cap}, message);')
+        else:
+            cf.line(f'    message = seL4_Call({i.cap}, message);')
+        self.gen_stat_end(cf, '    ', i.name)
+        self.gen_cache_store(cf, i, '    ', '*argsout_ptr')
+        for o in i.out_args:
+            cf.line(f'    *{o.name} = argsout_ptr->{o.name};')
+        if i.return_type == 'void':
+            pass
+        elif i.return_type == 'seL4_MessageInfo_t':
+            cf.line(f'    return message;')
+        else:
+            cf.line(f'    return argsout_ptr->__ret;')
+
+        cf.line('}\n\n')
+
+    def batch_params(self, i: Method):
+        return f'seL4_Word n, const struct {self.ipc_in_struct_name(i.name)} *in, struct {self.ipc_out_struct_name(i.name)} *out'
+
+    def gen_batch_stub(self, cf, i: Method, qualifier=''):
+        # Returns the number of invocations done, stops early when the
+        # server replies with a non zero label
+        batch = f'{i.name.upper()}_BATCH'
+        cf.line(f'{qualifier}seL4_Word {i.name}_batch({self.batch_params(i)})\n{{')
+        cf.line('    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();')
+        cf.line('    seL4_Word done = 0;')
+        cf.line('    while (done < n) {')
+        cf.line(f'        seL4_Word count = n - done > {batch}_MAX ? {batch}_MAX : n - done;')
+        cf.line('        seL4_MessageInfo_t message;')
+        cf.line('        seL4_Word j;')
+        cf.line('        for (j = 0; j < count; j++) {')
+        cf.line(f'            __builtin_memcpy(&ipc_buf->msg[j * {batch}_STRIDE], &in[done + j], sizeof(*in));')
+        cf.line('        }')
+        cf.line(f'        message = seL4_MessageInfo_new(METHOD_NUM_{batch}, 0, 0, count * {batch}_STRIDE);')
+        self.gen_stat_begin(cf, '        ', f'{i.name}_batch')
+        cf.line(f'        message = seL4_Call({i.cap}, message);')
+        self.gen_stat_end(cf, '        ', f'{i.name}_batch')
+        cf.line(f'        count = seL4_MessageInfo_get_length(message) / {batch}_STRIDE;')
+        cf.line('        for (j = 0; j < count; j++) {')
+        cf.line(f'            __builtin_memcpy(&out[done + j], &ipc_buf->msg[j * {batch}_STRIDE], sizeof(*out));')
+        cf.line('        }')
+        cf.line('        done += count;')
+        cf.line('        if (seL4_MessageInfo_get_label(message) != 0 || count == 0) {')
+        cf.line('            break;')
+        cf.line('        }')
+        cf.line('    }')
+        cf.line('    return done;')
+        cf.line('}\n\n')
+
+    def send_syscall(self, i: Method):
+        # Used by oneway methods
+        return 'NBSend' if i.nonblocking else 'Send'
+
+    def gen_fastpath_call(self, i: Method, cf):
+        # Constant condition, the compiler keeps only one of the two paths
+        in_struct = f'struct {self.ipc_in_struct_name(i.name)}'
+        out_struct = f'struct {self.ipc_out_struct_name(i.name)}'
+        cf.line(f'    if (sizeof_in_MRs({in_struct}) <= seL4_FastMessageRegisters &&')
+        cf.line(f'        sizeof_in_MRs({out_struct}) <= seL4_FastMessageRegisters) {{')
+        cf.line(f'        union {{')
+        cf.line(f'            {in_struct} in;')
+        cf.line(f'            {out_struct} out;')
+        cf.line(f'            seL4_Word mr[seL4_FastMessageRegisters];')
+        if len(self.ipc_in_fields(i)) > 0:
+            cf.line(f'        }} regs = {{ .in = {{{self.ipc_in_initialiser(i)}}} }};')
+        else:
+            cf.line(f'        }} regs = {{ .mr = {{0}} }};')
+        cf.line(f'        message = seL4_MessageInfo_new(METHOD_NUM_{i.name.upper()}, 0, 0, sizeof_in_MRs({in_struct}));')
+        self.gen_stat_begin(cf, '        ', i.name)
+        if i.oneway:
+            cf.line(f'        {self.send_syscall(i).lower()}_with_MRs({i.cap}, message, regs.mr);')
+        else:
+            cf.line(f'        message = call_with_MRs({i.cap}, message, regs.mr);')
+        self.gen_stat_end(cf, '        ', i.name)
+        self.gen_cache_store(cf, i, '        ', 'regs.out')
+        for o in i.out_args:
+            cf.line(f'        *{o.name} = regs.out.{o.name};')
+        if i.return_type == 'void':
+            cf.line(f'        return;')
+        elif i.return_type == 'seL4_MessageInfo_t':
+            cf.line(f'        return message;')
+        else:
+            cf.line(f'        return regs.out.__ret;')
+        cf.line(f'    }}')
 
 
 
@@ -202,67 +799,999 @@ class InterfaceClientStubs(InterfaceGen):
 #
 # Roger A. Sayle, "A Superoptimizer Analysis of Multiway Branch Code
 # Generation", Proc. GCC Summit, 2008
+#
+# As an alternative the dispatch can be generated as a bounds checked
+# table of handlers (dense ids) or a minimal perfect hash (sparse ids),
+# selected with the dispatch option ('auto' picks based on the ids).
+
+HASH_MIX1 = 0x85ebca6b
+HASH_MIX2 = 0xc2b2ae35
+HASH_DISP = 0x9e3779b9
+HASH_MASK = 0xffffffff
+
+def hash_mix(x):
+    # Must match the <dispatch_func>_mix() emitted in C
+    x &= HASH_MASK
+    x ^= x >> 16
+    x = (x * HASH_MIX1) & HASH_MASK
+    x ^= x >> 13
+    x = (x * HASH_MIX2) & HASH_MASK
+    x ^= x >> 16
+    return x
+
+def perfect_hash(keys, max_tries=1 << 20):
+    # Hash and displace: keys are split into buckets by hash_mix(key), then
+    # for each bucket (largest first) search for a displacement that puts
+    # all its keys into free slots. Returns the displacement per bucket and
+    # the key stored in each of the len(keys) slots.
+    n = len(keys)
+    for k in keys:
+        if k < 0 or k > HASH_MASK:
+            raise RuntimeError(f'Method id {k} out of range for hash dispatch')
+    nbuckets = max(1, (n + 1) // 2)
+    buckets = [[] for b in range(nbuckets)]
+    for k in keys:
+        buckets[hash_mix(k) % nbuckets].append(k)
+    disp = [0] * nbuckets
+    slots = [None] * n
+    for b in sorted(range(nbuckets), key=lambda b: -len(buckets[b])):
+        if len(buckets[b]) == 0:
+            break
+        for d in range(max_tries):
+            pos = [hash_mix(k ^ ((d * HASH_DISP) & HASH_MASK)) % n for k in buckets[b]]
+            if len(set(pos)) == len(pos) and all(slots[p] is None for p in pos):
+                break
+        else:
+            raise RuntimeError('Unable to find a perfect hash for the method ids')
+        disp[b] = d
+        for k, p in zip(buckets[b], pos):
+            slots[p] = k
+    return disp, slots
 
 
 class InterfaceServerDispatch(InterfaceGen):
+    guard_tag = '_SERVER'
+
+    # Thresholds for the 'auto' dispatch strategy
+    min_table_methods = 4
+    min_table_density = 0.5
+    # Even when asked for, a table with more than this many entries per
+    # method is replaced by the hash
+    max_table_span = 8
+    # With a profile, methods getting at least this share of the calls
+    # are checked before the general dispatch
+    hot_share = 0.2
+    max_hot_methods = 2
+
     def __str__(self):
 
         return str(self.__class__) + ": " + str(self.__dict__)
 
-    def __init__(self, interface, filebasename = '', wordsize=8):
+    def __init__(self, interface, filebasename = '', wordsize=8, **options):
 
-        super().__init__(interface, filebasename, wordsize)
+        super().__init__(interface, filebasename, wordsize, **options)
 
-        with open(self.filebasename + '.h', 'w') as hf:
-            print(self.preamble, file=hf)
+        with self.open_output('.h') as hf:
+            hf.line(self.preamble)
+            hf.line(f'#ifndef {self.include_guard()}')
+            hf.line(f'#define {self.include_guard()}\n')
             
             for i in self.interface.includes:
                 if i.server:
-                    print(f'#include {i.header}',file=hf)
+                    hf.line(f'#include {i.header}')
 
-            print(f'#define sizeof_in_MRs(x)    ((sizeof(x)+{self.wordsize}-1)/{self.wordsize})',file=hf)    
+            hf.line(f'#define sizeof_in_MRs(x)    ((sizeof(x)+{self.wordsize}-1)/{self.wordsize})')
             for i in self.interface.defines:
-                print(f'#define {i.name} ({i.value})', file=hf)
+                hf.line(f'#define {i.name} ({i.value})')
 
-            print(f'extern seL4_MessageInfo_t {self.interface.dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);',file=hf)
-            print(f'extern seL4_MessageInfo_t {self.interface.error_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);',file=hf)
+            hf.line(f'extern seL4_MessageInfo_t {self.interface.dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);')
+            hf.line(f'extern seL4_MessageInfo_t {self.interface.error_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);')
+            if self.server_loop or any(i.oneway for i in self.interface.methods):
+                self.gen_no_reply_decls(hf)
+            if self.server_loop:
+                self.gen_server_loop_decls(hf)
+            if self.interface.client_state is not None:
+                self.gen_client_state_decls(hf)
 
             for i in self.interface.methods:
-                print('\n/****************************************', file=hf)
-                print(f' * extern {i.return_type} {i.name}(',end='', file=hf)
-                if len(i.args) != 0:
-                    print(', '.join(map(self.formatarg,i.args)),end='',file=hf)
+                hf.line('\n/****************************************')
+                hf.write(f' * extern {i.return_type} {i.name}(')
+                if len(i.args) != 0 or len(i.buf_args) != 0:
+                    hf.write(', '.join(list(map(self.formatarg,i.args)) + list(map(self.formatbufarg,i.buf_args))))
                 else:
-                    print(f'void',end='', file=hf)
+                    hf.write(f'void')
                         
                 
-                print(');',file=hf)
-                print(' */', file=hf)    
-                print(f'#define METHOD_NUM_{i.name.upper()} {i.id}',file=hf)
-                print(self.gen_ipc_in_struct(i,'', self.interface.server_prefix),file=hf)
-                print(self.gen_ipc_out_struct(i,'', self.interface.server_prefix ),file=hf)
+                hf.line(');')
+                hf.line(' */')
+                hf.line(f'#define METHOD_NUM_{i.name.upper()} {i.id}')
+                hf.line(self.gen_ipc_in_struct(i,'', self.interface.server_prefix))
+                hf.line(self.gen_ipc_out_struct(i,'', self.interface.server_prefix ))
+                self.gen_size_asserts(hf, i, '', self.interface.server_prefix)
+                for b in i.buf_args:
+                    self.gen_buf_accessor(hf, i, b)
+                if i.batch_id is not None:
+                    self.gen_batch_macros(hf, i, self.interface.server_prefix.upper(), self.interface.server_prefix)
+
+                hf.line(f'extern seL4_MessageInfo_t {self.handler_name(i)}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);\n')
+                if self.typed_handlers:
+                    self.gen_typed_handler_decl(hf, i)
+                elif self.interface.client_state is not None:
+                    hf.line(f'extern seL4_MessageInfo_t {self.client_handler_name(i)}({self.client_handler_params()});\n')
+            if self.instrument:
+                self.gen_stats_decls(hf, self.interface.server_prefix)
 
-                print(f'extern seL4_MessageInfo_t {self.interface.server_prefix}{i.name}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);\n', file=hf)
+            hf.line(f'#endif /* {self.include_guard()} */')
             
             
-        with open(self.filebasename + '.c', 'w') as cf:
-            print(self.preamble, file=cf)
-            print(f'#include <{self.filebasename + ".h"}>',file=cf)
+        with self.open_output('.c') as cf:
+            cf.line(self.preamble)
+            cf.line(f'#include <{self.filebasename + ".h"}>')
 
             #for i in self.interface.includes:
             #    if i.server:
             #        print(f'#include {i.header}',file=cf)
 
-            print(f'seL4_MessageInfo_t {self.interface.dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{',file=cf)
-            print('    seL4_MessageInfo_t msg;',file=cf);
-            print('    switch (seL4_MessageInfo_get_label(msginfo)) {', file=cf)
+            entries, counts = self.gen_dispatch_entries(cf)
+            self.gen_dispatch(cf, entries, self.interface.dispatch_func, self.interface.error_func, counts)
+            if self.server_loop:
+                self.gen_server_loop(cf)
+
+    def gen_dispatch_entries(self, cf):
+        # Emits the static functions the dispatcher calls, returns the
+        # dispatch entries and their profiled call counts
+        if self.interface.client_state is not None:
+            self.gen_client_state_defs(cf)
+        for i in self.interface.methods:
+            if self.typed_handlers:
+                self.gen_typed_wrapper(cf, i)
+            elif self.interface.client_state is not None:
+                self.gen_client_wrapper(cf, i)
+            if i.oneway:
+                self.gen_oneway_wrapper(cf, i)
+            if i.batch_id is not None:
+                self.gen_batch_handler(cf, i)
+        entries = [(f'METHOD_NUM_{i.name.upper()}', i.id, self.dispatch_handler(i)) for i in self.interface.methods]
+        entries += [(f'METHOD_NUM_{i.name.upper()}_BATCH', i.batch_id, f'{self.handler_name(i)}_batch')
+                    for i in self.interface.methods if i.batch_id is not None]
+        if self.instrument:
+            # Same order as the entries
+            self.gen_stats_defs(cf, self.interface.server_prefix)
+            entries = [(label, id, self.gen_stat_wrapper(cf, name, handler))
+                       for (label, id, handler), name in zip(entries, self.stats_names())]
+        counts = {f'METHOD_NUM_{i.name.upper()}': self.profile.get(i.name, 0) for i in self.interface.methods}
+        counts.update({f'METHOD_NUM_{i.name.upper()}_BATCH': self.profile.get(f'{i.name}_batch', 0)
+                       for i in self.interface.methods if i.batch_id is not None})
+        return entries, counts
+
+    def dispatch_name(self):
+        return self.interface.dispatch_func
+
+    def no_reply_name(self):
+        return f'{self.interface.server_prefix.upper()}NO_REPLY'
+
+    def badge_name(self):
+        return f'{self.interface.server_prefix}badge'
+
+    def gen_no_reply_label(self, hf):
+        no_reply = self.no_reply_name()
+        hf.line(f'#ifndef {no_reply}_LABEL')
+        hf.line(f'#define {no_reply}_LABEL 0x{self.no_reply_label:x}')
+        hf.line('#endif')
+
+    def gen_no_reply_decls(self, hf, label=True):
+        # label is False if gen_no_reply_label was called earlier
+        no_reply = self.no_reply_name()
+        hf.line()
+        hf.line('/*')
+        hf.line(f' * {self.dispatch_name()}() returns {no_reply} when no reply must be sent,')
+        hf.line(f' * either because the method is oneway or because the handler deferred its reply.')
+        hf.line(' */')
+        if label:
+            self.gen_no_reply_label(hf)
+        hf.line(f'#define {no_reply} seL4_MessageInfo_new({no_reply}_LABEL, 0, 0, 0)')
+
+    def gen_server_loop_decls(self, hf):
+        hf.line()
+        hf.line('/*')
+        hf.line(f' * {self.dispatch_name()}_loop() receives on ep forever, passing each message')
+        hf.line(f' * to {self.dispatch_name()}() and answering with seL4_ReplyRecv. reply points')
+        hf.line(f' * to the reply object cptr (used on MCS kernels) and {self.badge_name()} holds the badge')
+        hf.line(f' * of the current message. A handler returning {self.no_reply_name()} defers its reply,')
+        hf.line(f' * the loop then only waits for the next message.')
+        hf.line(' *')
+        hf.line(' * The next receive overwrites the reply capability of the caller, so a handler')
+        hf.line(f' * deferring its reply must first keep it: on MCS kernels by setting *(seL4_CPtr *)reply')
+        hf.line(' * to a fresh reply object (the loop receives into it from then on) and keeping the')
+        hf.line(' * old one, on other kernels by moving the caller\'s reply cap into a free slot with')
+        hf.line(' * seL4_CNode_SaveCaller(). The reply is later sent with seL4_Send() on the kept cap.')
+        hf.line(' */')
+        hf.line(f'extern seL4_Word {self.badge_name()};')
+        hf.line(f'extern void {self.dispatch_name()}_loop(seL4_CPtr ep, seL4_CPtr reply, void *data);')
+
+    def gen_recv(self, cf, indent, reply_info=None):
+        badge = self.badge_name()
+        cf.line('#ifdef CONFIG_KERNEL_MCS')
+        if reply_info is None:
+            cf.line(f'{indent}msginfo = seL4_Recv(ep, &{badge}, reply);')
+        else:
+            cf.line(f'{indent}msginfo = seL4_ReplyRecv(ep, {reply_info}, &{badge}, reply);')
+        cf.line('#else')
+        if reply_info is None:
+            cf.line(f'{indent}msginfo = seL4_Recv(ep, &{badge});')
+        else:
+            cf.line(f'{indent}msginfo = seL4_ReplyRecv(ep, {reply_info}, &{badge});')
+        cf.line('#endif')
+
+    def gen_server_loop(self, cf):
+        dispatch_func = self.dispatch_name()
+        cf.line()
+        # Already defined with the client states
+        if self.interface is None or self.interface.client_state is None:
+            cf.line(f'seL4_Word {self.badge_name()};')
+            cf.line()
+        cf.line(f'void {dispatch_func}_loop(seL4_CPtr ep, seL4_CPtr reply, void *data)\n{{')
+        cf.line('    seL4_MessageInfo_t msginfo;')
+        cf.line('    seL4_MessageInfo_t reply_info;')
+        self.gen_recv(cf, '    ')
+        cf.line('    for (;;) {')
+        cf.line(f'        reply_info = {dispatch_func}(ep, msginfo, &reply, data);')
+        cf.line(f'        if (seL4_MessageInfo_get_label(reply_info) == {self.no_reply_name()}_LABEL) {{')
+        self.gen_recv(cf, '            ')
+        cf.line('        } else {')
+        self.gen_recv(cf, '            ', 'reply_info')
+        cf.line('        }')
+        cf.line('    }')
+        cf.line('}')
+
+    def handler_name(self, method: Method):
+        return f'{self.interface.server_prefix}{method.name}'
+
+    def gen_buf_accessor(self, hf, method: Method, b):
+        # Typed pointer into the shared region, NULL if the client sent
+        # a buffer that is misaligned or not inside the region
+        prefix = self.interface.server_prefix
+        const = 'const ' if b.direction == ArgDirection.IN else ''
+        size = f'(seL4_Word)({self.interface.shmem_size})'
+        hf.line(f'static inline {const}{b.ctype} *{prefix}{method.name}_{b.name}(const struct {prefix}{self.ipc_in_struct_name(method.name)} *in)\n{{')
+        hf.line(f'    if (in->{b.name}_offset > {size} ||')
+        hf.line(f'        in->{b.name}_len > ({size} - in->{b.name}_offset) / sizeof({b.ctype}) ||')
+        hf.line(f'        in->{b.name}_offset % __alignof__({b.ctype}) != 0) {{')
+        hf.line(f'        return NULL;')
+        hf.line(f'    }}')
+        hf.line(f'    return ({const}{b.ctype} *)((char *)({self.interface.shmem}) + in->{b.name}_offset);')
+        hf.line('}\n')
+
+    def dispatch_handler(self, method: Method):
+        # Function the dispatcher calls for the method
+        if method.oneway:
+            return f'{self.handler_name(method)}_oneway'
+        return self.handler_name(method)
+
+    def gen_batch_handler(self, cf, method: Method):
+        # Each record is staged at the start of the IPC buffer for the
+        # handler. Records before the current one are already consumed,
+        # the results are kept aside and packed at the end.
+        prefix = self.interface.server_prefix
+        batch = f'{prefix.upper()}{method.name.upper()}_BATCH'
+        in_struct = f'struct {prefix}{self.ipc_in_struct_name(method.name)}'
+        out_struct = f'struct {prefix}{self.ipc_out_struct_name(method.name)}'
+        cf.line(f'static seL4_MessageInfo_t {self.handler_name(method)}_batch(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        cf.line('    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();')
+        cf.line(f'    {out_struct} results[{batch}_MAX];')
+        cf.line(f'    seL4_Word n = seL4_MessageInfo_get_length(msginfo) / {batch}_STRIDE;')
+        cf.line('    seL4_Word label = 0;')
+        cf.line('    seL4_Word i, j;')
+        cf.line(f'    if (n > {batch}_MAX) {{')
+        cf.line(f'        n = {batch}_MAX;')
+        cf.line('    }')
+        cf.line('    for (i = 0; i < n; i++) {')
+        cf.line(f'        {in_struct} in;')
+        cf.line(f'        __builtin_memcpy(&in, &ipc_buf->msg[i * {batch}_STRIDE], sizeof(in));')
+        cf.line('        __builtin_memcpy(&ipc_buf->msg[0], &in, sizeof(in));')
+        cf.line(f'        label = seL4_MessageInfo_get_label({self.handler_name(method)}(ep, seL4_MessageInfo_new(METHOD_NUM_{method.name.upper()}, 0, 0, sizeof_in_MRs(in)), reply, data));')
+        cf.line('        if (label != 0) {')
+        cf.line('            break;')
+        cf.line('        }')
+        cf.line('        __builtin_memcpy(&results[i], &ipc_buf->msg[0], sizeof(results[i]));')
+        cf.line('    }')
+        cf.line('    for (j = 0; j < i; j++) {')
+        cf.line(f'        __builtin_memcpy(&ipc_buf->msg[j * {batch}_STRIDE], &results[j], sizeof(results[j]));')
+        cf.line('    }')
+        cf.line(f'    return seL4_MessageInfo_new(label, 0, 0, i * {batch}_STRIDE);')
+        cf.line('}\n')
+
+    def typed_handler_name(self, method: Method):
+        return f'{self.handler_name(method)}_typed'
+
+    def typed_handler_params(self, method: Method):
+        params = ['seL4_CPtr ep', 'seL4_MessageInfo_t msginfo', 'void *reply', 'void *data']
+        prefix = self.interface.server_prefix
+        if self.interface.client_state is not None:
+            params.append(f'{self.interface.client_state} *client')
+        if len(self.ipc_in_fields(method)) > 0:
+            params.append(f'const struct {prefix}{self.ipc_in_struct_name(method.name)} *in')
+        if len(self.ipc_out_fields(method)) > 0:
+            params.append(f'struct {prefix}{self.ipc_out_struct_name(method.name)} *out')
+        return ', '.join(params)
+
+    def gen_typed_handler_decl(self, hf, method: Method):
+        hf.line('/*')
+        hf.line(f' * {self.handler_name(method)}() is generated, it checks the message and calls')
+        hf.line(f' * {self.typed_handler_name(method)}(). in and out both point to the start of the IPC')
+        hf.line(' * buffer, in must not be read after writing to out. A zero return replies with')
+        hf.line(' * the out struct, anything else replies with that label and no data.')
+        if self.interface.client_state is not None:
+            hf.line(' * client is the state of the caller.')
+        hf.line(' */')
+        hf.line(f'extern seL4_Word {self.typed_handler_name(method)}({self.typed_handler_params(method)});\n')
+
+    def gen_typed_wrapper(self, cf, method: Method):
+        # Short messages or missing caps go to the error func, the reply
+        # is exactly as long as the out struct
+        prefix = self.interface.server_prefix
+        in_struct = f'struct {prefix}{self.ipc_in_struct_name(method.name)}'
+        out_struct = f'struct {prefix}{self.ipc_out_struct_name(method.name)}'
+        has_in = len(self.ipc_in_fields(method)) > 0
+        has_out = len(self.ipc_out_fields(method)) > 0
+        args = ['ep', 'msginfo', 'reply', 'data']
+        if self.interface.client_state is not None:
+            args.append('client')
+        checks = []
+        if has_in:
+            checks.append(f'seL4_MessageInfo_get_length(msginfo) < sizeof_in_MRs({in_struct})')
+            args.append(f'(const {in_struct} *)&ipc_buf->msg[0]')
+        if len(method.in_caps) > 0:
+            checks.append(f'seL4_MessageInfo_get_extraCaps(msginfo) < {len(method.in_caps)}')
+        if has_out:
+            args.append(f'({out_struct} *)&ipc_buf->msg[0]')
+        cf.line(f'seL4_MessageInfo_t {self.handler_name(method)}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        if has_in or has_out:
+            cf.line('    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();')
+        cf.line('    seL4_Word label;')
+        if self.interface.client_state is not None:
+            self.gen_client_lookup(cf)
+        if len(checks) > 0:
+            cf.line(f'    if ({checks[0]}' + ''.join(f' ||\n        {c}' for c in checks[1:]) + ') {')
+            cf.line(f'        return {self.interface.error_func}(ep, msginfo, reply, data);')
+            cf.line('    }')
+        cf.line(f'    label = {self.typed_handler_name(method)}({", ".join(args)});')
+        cf.line('    if (label != 0) {')
+        cf.line('        return seL4_MessageInfo_new(label, 0, 0, 0);')
+        cf.line('    }')
+        out_mrs = f'sizeof_in_MRs({out_struct})' if has_out else '0'
+        cf.line(f'    return seL4_MessageInfo_new(0, 0, {len(method.out_caps)}, {out_mrs});')
+        cf.line('}\n')
+
+    def client_prefix(self):
+        return f'{self.interface.server_prefix}client'
+
+    def client_handler_name(self, method: Method):
+        return f'{self.handler_name(method)}_client'
+
+    def client_handler_params(self):
+        return f'seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data, {self.interface.client_state} *client'
+
+    def gen_client_state_decls(self, hf):
+        # Badge b (1 to max_clients) is the client in slot b - 1, badge 0
+        # (unbadged caps) has no state
+        prefix = self.client_prefix()
+        macro = f'{self.interface.server_prefix.upper()}MAX_CLIENTS'
+        hf.line()
+        hf.line('/*')
+        hf.line(f' * State of each client, indexed by the badge of its endpoint cap. {self.badge_name()}')
+        hf.line(f' * must hold the badge of the message being dispatched, {prefix}_mint() allocates')
+        hf.line(f' * a badge and mints a cap with it, {prefix}_release() frees the badge once the')
+        hf.line(' * cap is deleted. Handlers get the state of the caller, messages with a badge')
+        hf.line(f' * that has no state go to {self.interface.error_func}(). Not thread safe.')
+        hf.line(' */')
+        hf.line(f'#define {macro} {self.interface.max_clients}')
+        hf.line(f'struct {prefix} {{')
+        hf.line('    seL4_Bool used;')
+        hf.line(f'    {self.interface.client_state} state;')
+        hf.line('};')
+        hf.line(f'extern struct {prefix} {prefix}s[{macro}];')
+        if not self.server_loop:
+            hf.line(f'extern seL4_Word {self.badge_name()};')
+        hf.line(f'extern seL4_Word {prefix}_alloc(void);')
+        hf.line(f'extern void {prefix}_release(seL4_Word badge);')
+        hf.line(f'extern seL4_Error {prefix}_mint(seL4_CPtr cnode, seL4_Word dest, seL4_Uint8 depth, seL4_CPtr ep,')
+        hf.line(f'                                  seL4_CapRights_t rights, seL4_Word *badge);')
+        hf.line(f'static inline {self.interface.client_state} *{prefix}_state(seL4_Word badge)\n{{')
+        hf.line(f'    if (badge == 0 || badge > {macro} || !{prefix}s[badge - 1].used) {{')
+        hf.line('        return NULL;')
+        hf.line('    }')
+        hf.line(f'    return &{prefix}s[badge - 1].state;')
+        hf.line('}')
+
+    def gen_client_state_defs(self, cf):
+        # Allocation scans for a free slot, it only happens when a
+        # client connects
+        prefix = self.client_prefix()
+        macro = f'{self.interface.server_prefix.upper()}MAX_CLIENTS'
+        cf.line(f'struct {prefix} {prefix}s[{macro}];')
+        cf.line(f'seL4_Word {self.badge_name()};\n')
+        cf.line(f'seL4_Word {prefix}_alloc(void)\n{{')
+        cf.line('    seL4_Word i;')
+        cf.line(f'    for (i = 0; i < {macro}; i++) {{')
+        cf.line(f'        if (!{prefix}s[i].used) {{')
+        cf.line(f'            __builtin_memset(&{prefix}s[i].state, 0, sizeof({prefix}s[i].state));')
+        cf.line(f'            {prefix}s[i].used = 1;')
+        cf.line('            return i + 1;')
+        cf.line('        }')
+        cf.line('    }')
+        cf.line('    return 0;')
+        cf.line('}\n')
+        cf.line(f'void {prefix}_release(seL4_Word badge)\n{{')
+        cf.line(f'    if (badge != 0 && badge <= {macro}) {{')
+        cf.line(f'        {prefix}s[badge - 1].used = 0;')
+        cf.line('    }')
+        cf.line('}\n')
+        cf.line(f'seL4_Error {prefix}_mint(seL4_CPtr cnode, seL4_Word dest, seL4_Uint8 depth, seL4_CPtr ep,')
+        cf.line(f'                        seL4_CapRights_t rights, seL4_Word *badge)\n{{')
+        cf.line('    seL4_Error err;')
+        cf.line(f'    seL4_Word b = {prefix}_alloc();')
+        cf.line('    if (b == 0) {')
+        cf.line('        return seL4_NotEnoughMemory;')
+        cf.line('    }')
+        cf.line('    err = seL4_CNode_Mint(cnode, dest, depth, cnode, ep, depth, rights, b);')
+        cf.line('    if (err != seL4_NoError) {')
+        cf.line(f'        {prefix}_release(b);')
+        cf.line('        return err;')
+        cf.line('    }')
+        cf.line('    *badge = b;')
+        cf.line('    return seL4_NoError;')
+        cf.line('}\n')
+
+    def gen_client_lookup(self, cf):
+        cf.line(f'    {self.interface.client_state} *client = {self.client_prefix()}_state({self.badge_name()});')
+        cf.line('    if (client == NULL) {')
+        cf.line(f'        return {self.interface.error_func}(ep, msginfo, reply, data);')
+        cf.line('    }')
+
+    def gen_client_wrapper(self, cf, method: Method):
+        # Finds the caller's state for the handler
+        cf.line(f'seL4_MessageInfo_t {self.handler_name(method)}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        self.gen_client_lookup(cf)
+        cf.line(f'    return {self.client_handler_name(method)}(ep, msginfo, reply, data, client);')
+        cf.line('}\n')
+
+    def gen_stat_wrapper(self, cf, name, handler):
+        # Without <PREFIX>STATS the dispatcher calls the handler directly
+        prefix = self.interface.server_prefix
+        idx = self.stat_idx(prefix, name)
+        cf.line(f'#ifdef {prefix.upper()}STATS')
+        cf.line(f'static seL4_MessageInfo_t {handler}_stat(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        cf.line('    seL4_MessageInfo_t msg;')
+        cf.line(f'    {prefix.upper()}STAT_BEGIN({idx});')
+        cf.line(f'    msg = {handler}(ep, msginfo, reply, data);')
+        cf.line(f'    {prefix.upper()}STAT_END({idx});')
+        cf.line('    return msg;')
+        cf.line('}')
+        cf.line('#else')
+        cf.line(f'#define {handler}_stat {handler}')
+        cf.line('#endif\n')
+        return f'{handler}_stat'
+
+    def gen_oneway_wrapper(self, cf, method: Method):
+        # The client is not waiting for a reply
+        cf.line(f'static seL4_MessageInfo_t {self.dispatch_handler(method)}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        cf.line(f'    {self.handler_name(method)}(ep, msginfo, reply, data);')
+        cf.line(f'    return {self.no_reply_name()};')
+        cf.line('}\n')
+
+    def choose_dispatch(self, ids):
+        span = max(ids) - min(ids) + 1 if len(ids) > 0 else 0
+        if self.dispatch == 'table' and span > self.max_table_span * len(ids):
+            print(f'Warning: the method ids span {span} labels for {len(ids)} methods, '
+                  f'using hash instead of table dispatch', file=sys.stderr)
+            return 'hash'
+        if self.dispatch != 'auto':
+            return self.dispatch
+        if len(ids) < self.min_table_methods:
+            return 'switch'
+        if len(ids) / span >= self.min_table_density:
+            return 'table'
+        return 'hash'
+
+    def gen_dispatch(self, cf, entries, dispatch_func, error_func, counts=None):
+        # entries is a list of (label macro, numeric id, handler function),
+        # counts maps label macros to profiled call counts
+        # Without methods there is nothing to index, only the error func
+        strategy = self.choose_dispatch([e[1] for e in entries]) if len(entries) > 0 else 'switch'
+        hot = []
+        if counts:
+            entries = sorted(entries, key=lambda e: -counts.get(e[0], 0))
+            total = sum(counts.values())
+            hot = [e for e in entries[:self.max_hot_methods]
+                   if total > 0 and counts.get(e[0], 0) >= total * self.hot_share]
+        if strategy == 'table':
+            self.gen_table_dispatch(cf, entries, dispatch_func, error_func, hot)
+        elif strategy == 'hash':
+            self.gen_hash_dispatch(cf, entries, dispatch_func, error_func, hot)
+        elif strategy == 'switch':
+            self.gen_switch_dispatch(cf, entries, dispatch_func, error_func, hot)
+        else:
+            raise RuntimeError(f'Unknown dispatch strategy "{strategy}"')
+
+    def gen_hot_checks(self, cf, hot):
+        # Direct, predicted branches to the hottest handlers
+        for label, id, handler in hot:
+            cf.line(f'    if (__builtin_expect(seL4_MessageInfo_get_label(msginfo) == {label}, 1)) {{')
+            cf.line(f'        return {handler}(ep, msginfo, reply, data);')
+            cf.line('    }')
+
+    def gen_switch_dispatch(self, cf, entries, dispatch_func, error_func, hot=[]):
+        cf.line(f'seL4_MessageInfo_t {dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        cf.line('    seL4_MessageInfo_t msg;')
+        self.gen_hot_checks(cf, hot)
+        cf.line('    switch (seL4_MessageInfo_get_label(msginfo)) {')
+        for label, id, handler in entries:
+            cf.line(f'        case {label}: msg = {handler}(ep, msginfo, reply, data); break;')
+
+            
+        cf.line(f'\n        default: msg = {error_func}(ep, msginfo, reply, data);')
+        cf.line('    }')
+        cf.line('    return msg;')
+        cf.line('}')
+
+    def gen_handler_typedef(self, cf, dispatch_func):
+        cf.line(f'typedef seL4_MessageInfo_t (*{dispatch_func}_handler_t)(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);\n')
+
+    def gen_table_dispatch(self, cf, entries, dispatch_func, error_func, hot=[]):
+        # Dense ids: index an array of handlers, holes go to the error func
+        base = min(e[1] for e in entries)
+        size = max(e[1] for e in entries) - base + 1
+        by_id = {id: (label, handler) for label, id, handler in entries}
+        self.gen_handler_typedef(cf, dispatch_func)
+        cf.line(f'static const {dispatch_func}_handler_t {dispatch_func}_table[{size}] = {{')
+        for id in range(base, base + size):
+            if id in by_id:
+                label, handler = by_id[id]
+                cf.line(f'    [{label} - {base}] = {handler},')
+            else:
+                cf.line(f'    [{id - base}] = {error_func},')
+        cf.line('};\n')
+        cf.line(f'seL4_MessageInfo_t {dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        self.gen_hot_checks(cf, hot)
+        cf.line(f'    seL4_Word index = seL4_MessageInfo_get_label(msginfo) - {base};')
+        cf.line(f'    if (index < {size}) {{')
+        cf.line(f'        return {dispatch_func}_table[index](ep, msginfo, reply, data);')
+        cf.line('    }')
+        cf.line(f'    return {error_func}(ep, msginfo, reply, data);')
+        cf.line('}')
+
+    def gen_hash_dispatch(self, cf, entries, dispatch_func, error_func, hot=[]):
+        # Sparse ids: minimal perfect hash, the key check catches labels
+        # that are not methods
+        disp, slots = perfect_hash([e[1] for e in entries])
+        by_id = {id: (label, handler) for label, id, handler in entries}
+        self.gen_handler_typedef(cf, dispatch_func)
+        cf.line(f'static inline seL4_Uint32 {dispatch_func}_mix(seL4_Uint32 x)\n{{')
+        cf.line(f'    x ^= x >> 16;')
+        cf.line(f'    x *= 0x{HASH_MIX1:08x}u;')
+        cf.line(f'    x ^= x >> 13;')
+        cf.line(f'    x *= 0x{HASH_MIX2:08x}u;')
+        cf.line(f'    x ^= x >> 16;')
+        cf.line(f'    return x;')
+        cf.line('}\n')
+        cf.line(f'static const seL4_Uint32 {dispatch_func}_disp[{len(disp)}] = {{')
+        cf.line('    ' + ', '.join(map(str, disp)))
+        cf.line('};\n')
+        cf.line(f'static const seL4_Word {dispatch_func}_keys[{len(slots)}] = {{')
+        for id in slots:
+            cf.line(f'    {by_id[id][0]},')
+        cf.line('};\n')
+        cf.line(f'static const {dispatch_func}_handler_t {dispatch_func}_handlers[{len(slots)}] = {{')
+        for id in slots:
+            cf.line(f'    {by_id[id][1]},')
+        cf.line('};\n')
+        cf.line(f'seL4_MessageInfo_t {dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data)\n{{')
+        self.gen_hot_checks(cf, hot)
+        cf.line(f'    seL4_Word label = seL4_MessageInfo_get_label(msginfo);')
+        cf.line(f'    seL4_Uint32 d = {dispatch_func}_disp[{dispatch_func}_mix(label) % {len(disp)}];')
+        cf.line(f'    seL4_Uint32 slot = {dispatch_func}_mix(label ^ (d * 0x{HASH_DISP:08x}u)) % {len(slots)};')
+        cf.line(f'    if ({dispatch_func}_keys[slot] == label) {{')
+        cf.line(f'        return {dispatch_func}_handlers[slot](ep, msginfo, reply, data);')
+        cf.line('    }')
+        cf.line(f'    return {error_func}(ep, msginfo, reply, data);')
+        cf.line('}')
+
+
+#############
+# Composite server dispatch
+#
+# One dispatch function for several interfaces served on the same
+# endpoint, instead of chaining their dispatchers through the error
+# funcs. Each interface keeps its own server header, the composite .c
+# has the static wrappers of all of them and one switch, table or hash
+# over every label.
+
+class InterfaceCompositeDispatch(InterfaceServerDispatch):
+    guard_tag = '_COMPOSITE'
+
+    def __str__(self):
+
+        return str(self.__class__) + ": " + str(self.__dict__)
+
+    def __init__(self, servers, filebasename = '', wordsize=8, dispatch_func='', error_func='', **options):
+        # servers are the InterfaceServerDispatch generators of the
+        # interfaces, created with the same options
+        InterfaceGen.__init__(self, None, filebasename, wordsize, **options)
+        self.servers = servers
+        self.dispatch_func = dispatch_func
+        self.error_func = error_func
+        self.check_servers()
+
+        with self.open_output('.h') as hf:
+            hf.line(self.preamble)
+            hf.line(f'#ifndef {self.include_guard()}')
+            hf.line(f'#define {self.include_guard()}\n')
+            if self.server_loop:
+                self.gen_no_reply_links(hf)
+            for server in self.servers:
+                hf.line(f'#include <{server.filebasename + ".h"}>')
+            hf.line()
+            if self.server_loop:
+                self.gen_no_reply_asserts(hf)
+            hf.line(f'extern seL4_MessageInfo_t {dispatch_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);')
+            hf.line(f'extern seL4_MessageInfo_t {error_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);')
+            if self.server_loop:
+                self.gen_no_reply_decls(hf, label=False)
+                self.gen_server_loop_decls(hf)
+            hf.line(f'\n#endif /* {self.include_guard()} */')
+
+        with self.open_output('.c') as cf:
+            cf.line(self.preamble)
+            cf.line(f'#include <{self.filebasename + ".h"}>\n')
+            entries = []
+            counts = {}
+            for server in self.servers:
+                server_entries, server_counts = server.gen_dispatch_entries(cf)
+                entries += server_entries
+                counts.update(server_counts)
+            self.gen_dispatch(cf, entries, dispatch_func, error_func, counts)
+            if self.server_loop:
+                self.gen_server_loop(cf)
+
+    def check_servers(self):
+        # The merged dispatcher needs every label and name to be unique
+        prefixes = {}
+        labels = {}
+        ids = {}
+        for server in self.servers:
+            interface = server.interface
+            where = server.filebasename
+            if interface.server_prefix in prefixes:
+                raise RuntimeError(f'{where} and {prefixes[interface.server_prefix]} have the same server_prefix "{interface.server_prefix}"')
+            prefixes[interface.server_prefix] = where
+            for m in interface.methods:
+                for label, id in [(f'METHOD_NUM_{m.name.upper()}', m.id), (f'METHOD_NUM_{m.name.upper()}_BATCH', m.batch_id)]:
+                    if id is None:
+                        continue
+                    if id in ids:
+                        raise RuntimeError(f'Method id {id} of "{m.name}" in {where} collides with "{ids[id][0]}" in {ids[id][1]}'
+                                           ' (give the interfaces different id_base values?)')
+                    if label in labels:
+                        raise RuntimeError(f'{label} is defined in {where} and {labels[label]}')
+                    ids[id] = (m.name, where)
+                    labels[label] = where
+
+    def dispatch_name(self):
+        return self.dispatch_func
+
+    def gen_recv(self, cf, indent, reply_info=None):
+        # Interfaces with client states look them up by their own badge
+        super().gen_recv(cf, indent, reply_info)
+        for server in self.servers:
+            if server.interface.client_state is not None:
+                cf.line(f'{indent}{server.badge_name()} = {self.badge_name()};')
+
+    def no_reply_name(self):
+        return f'{self.dispatch_func.upper()}_NO_REPLY'
+
+    def gen_no_reply_links(self, hf):
+        # The oneway wrappers of each interface return its own no reply
+        # message, the loop only knows ours. Their labels default to ours,
+        # set before their headers are included.
+        no_reply = self.no_reply_name()
+        self.gen_no_reply_label(hf)
+        for server in self.servers:
+            hf.line(f'#ifndef {server.no_reply_name()}_LABEL')
+            hf.line(f'#define {server.no_reply_name()}_LABEL {no_reply}_LABEL')
+            hf.line('#endif')
+        hf.line()
+
+    def gen_no_reply_asserts(self, hf):
+        # Catches an interface label overridden on its own
+        no_reply = self.no_reply_name()
+        for server in self.servers:
+            hf.line(f'_Static_assert({server.no_reply_name()}_LABEL == {no_reply}_LABEL,')
+            hf.line(f'               "{server.no_reply_name()}_LABEL must be the same as {no_reply}_LABEL");')
+        hf.line()
+
+    def badge_name(self):
+        return f'{self.dispatch_func}_badge'
+
+
+#############
+# Asynchronous ring transport
+#
+# Requests and responses go through two single producer, single consumer
+# rings in memory shared by client and server, with seL4 notifications
+# as doorbells. Producers only signal when the consumer said it is
+# going to sleep (consumer_waiting), and enqueue and kick are separate
+# so a batch of requests costs one signal. A server finding the response
+# ring full sleeps the same way (producer_waiting) until the client
+# dequeues, the client rings the server's notification for both. Methods
+# with capability args need the kernel to transfer the caps and are
+# left out.
+
+class InterfaceRingTransport(InterfaceGen):
+    guard_tag = '_RING'
+
+    def __str__(self):
+
+        return str(self.__class__) + ": " + str(self.__dict__)
+
+    def __init__(self, interface, filebasename = '', wordsize=8, **options):
+
+        super().__init__(interface, filebasename, wordsize, **options)
+
+        prefix = self.ring_prefix()
+        methods = [i for i in self.interface.methods if len(i.cap_args) == 0]
+
+        with self.open_output('.h') as hf:
+            hf.line(self.preamble)
+            hf.line(f'#ifndef {self.include_guard()}')
+            hf.line(f'#define {self.include_guard()}\n')
+
+            for i in self.interface.includes:
+                if i.client or i.server:
+                    hf.line(f'#include {i.header}')
+
+            hf.line(f'#define sizeof_in_MRs(x)    ((sizeof(x)+{self.wordsize}-1)/{self.wordsize})')
+            for i in self.interface.defines:
+                hf.line(f'#define {i.name} ({i.value})')
+
+            hf.line()
+            hf.line('/* Number of entries in each ring, must be a power of two */')
+            hf.line(f'#ifndef {prefix.upper()}SIZE')
+            hf.line(f'#define {prefix.upper()}SIZE 64')
+            hf.line('#endif')
+            hf.line()
+
             for i in self.interface.methods:
-                print(f'        case METHOD_NUM_{i.name.upper()}: msg = {self.interface.server_prefix}{i.name}(ep, msginfo, reply, data); break;', file=cf)
+                if len(i.cap_args) > 0:
+                    hf.line(f'/* {i.name} has capability args and is not available on the ring */')
+                    continue
+                hf.line(f'#define METHOD_NUM_{i.name.upper()} {i.id}')
+                hf.line(self.gen_ipc_in_struct(i, '', prefix))
+                hf.line(self.gen_ipc_out_struct(i, '', prefix))
 
-                
-            print(f'\n        default: msg = {self.interface.error_func}(ep, msginfo, reply, data);',file=cf)
-            print('    }',file=cf)
-            print('    return msg;',file=cf)
-            print('}',file=cf)
+            hf.line(f'struct {prefix}req {{')
+            hf.line('    seL4_Word label;')
+            hf.line('    seL4_Word cookie;')
+            hf.line('    union {')
+            for i in methods:
+                hf.line(f'        struct {prefix}{self.ipc_in_struct_name(i.name)} {i.name};')
+            hf.line('    } u;')
+            hf.line('};\n')
+
+            hf.line('/* label is the label of the message info returned by the server handler */')
+            hf.line(f'struct {prefix}resp {{')
+            hf.line('    seL4_Word label;')
+            hf.line('    seL4_Word cookie;')
+            hf.line('    union {')
+            for i in methods:
+                if not i.oneway:
+                    hf.line(f'        struct {prefix}{self.ipc_out_struct_name(i.name)} {i.name};')
+            hf.line('    } u;')
+            hf.line('};\n')
+
+            for kind in ['req', 'resp']:
+                self.gen_ring(hf, kind)
+
+            for i in methods:
+                self.gen_enqueue(hf, i)
+
+            if self.interface.client_state is not None:
+                hf.line('/*')
+                hf.line(f' * The handlers find the state of the client by {self.badge_name()}, drain() sets')
+                hf.line(' * it to badge, the badge of the client on the other end of the rings.')
+                hf.line(' */')
+                hf.line(f'extern seL4_Word {self.badge_name()};')
+            hf.line(f'extern void {prefix}drain({self.drain_params()});')
+            hf.line(f'extern void {prefix}serve({self.serve_params()});')
+            for i in methods:
+                hf.line(f'extern seL4_MessageInfo_t {self.interface.server_prefix}{i.name}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void * reply, void *data);')
+            hf.line(f'extern seL4_MessageInfo_t {self.interface.error_func}(seL4_CPtr ep, seL4_MessageInfo_t msginfo, void *reply, void *data);')
+            hf.line(f'\n#endif /* {self.include_guard()} */')
+
+        with self.open_output('.c') as cf:
+            cf.line(self.preamble)
+            cf.line(f'#include <{self.filebasename + ".h"}>')
+            cf.line()
+            self.gen_drain(cf, methods)
+
+    def ring_prefix(self):
+        return f'{self.interface.server_prefix}ring_'
+
+    def badge_name(self):
+        # Same variable as the server dispatch uses for the client states
+        return f'{self.interface.server_prefix}badge'
+
+    def drain_params(self):
+        prefix = self.ring_prefix()
+        params = f'struct {prefix}req_ring *req, struct {prefix}resp_ring *resp, seL4_CPtr client_ntfn, void *data'
+        if self.interface.client_state is not None:
+            params += ', seL4_Word badge'
+        return params
+
+    def serve_params(self):
+        prefix = self.ring_prefix()
+        params = f'struct {prefix}req_ring *req, struct {prefix}resp_ring *resp, seL4_CPtr ntfn, seL4_CPtr client_ntfn, void *data'
+        if self.interface.client_state is not None:
+            params += ', seL4_Word badge'
+        return params
+
+    def gen_ring(self, hf, kind):
+        prefix = self.ring_prefix()
+        ring = f'{prefix}{kind}_ring'
+        size = f'{prefix.upper()}SIZE'
+        hf.line(f'struct {ring} {{')
+        hf.line('    seL4_Word head;              /* next entry to produce, written by the producer */')
+        hf.line('    seL4_Word tail;              /* next entry to consume, written by the consumer */')
+        hf.line('    seL4_Word consumer_waiting;  /* set while the consumer waits for the doorbell */')
+        hf.line('    seL4_Word producer_waiting;  /* set while the producer waits for a free entry */')
+        hf.line(f'    struct {prefix}{kind} entries[{size}];')
+        hf.line('};\n')
+
+        hf.line(f'static inline int {ring}_empty(struct {ring} *ring)\n{{')
+        hf.line('    return __atomic_load_n(&ring->head, __ATOMIC_ACQUIRE) == ring->tail;')
+        hf.line('}\n')
+
+        hf.line(f'static inline int {ring}_full(struct {ring} *ring)\n{{')
+        hf.line(f'    return ring->head - __atomic_load_n(&ring->tail, __ATOMIC_ACQUIRE) == {size};')
+        hf.line('}\n')
+
+        hf.line('/* Make the entries enqueued so far visible and ring the doorbell if the consumer sleeps */')
+        hf.line(f'static inline void {ring}_kick(struct {ring} *ring, seL4_CPtr ntfn)\n{{')
+        hf.line('    __atomic_thread_fence(__ATOMIC_SEQ_CST);')
+        hf.line('    if (__atomic_load_n(&ring->consumer_waiting, __ATOMIC_RELAXED)) {')
+        hf.line('        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);')
+        hf.line('        seL4_Signal(ntfn);')
+        hf.line('    }')
+        hf.line('}\n')
+
+        hf.line('/* Block on the doorbell until the ring has entries */')
+        hf.line(f'static inline void {ring}_wait(struct {ring} *ring, seL4_CPtr ntfn)\n{{')
+        hf.line(f'    while ({ring}_empty(ring)) {{')
+        hf.line('        __atomic_store_n(&ring->consumer_waiting, 1, __ATOMIC_RELAXED);')
+        hf.line('        __atomic_thread_fence(__ATOMIC_SEQ_CST);')
+        hf.line(f'        if ({ring}_empty(ring)) {{')
+        hf.line('            seL4_Wait(ntfn, NULL);')
+        hf.line('        }')
+        hf.line('        __atomic_store_n(&ring->consumer_waiting, 0, __ATOMIC_RELAXED);')
+        hf.line('    }')
+        hf.line('}\n')
+
+        hf.line(f'static inline struct {prefix}{kind} *{ring}_front(struct {ring} *ring)\n{{')
+        hf.line(f'    return &ring->entries[ring->tail & ({size} - 1)];')
+        hf.line('}\n')
+
+        hf.line(f'static inline void {ring}_pop(struct {ring} *ring)\n{{')
+        hf.line('    __atomic_store_n(&ring->tail, ring->tail + 1, __ATOMIC_RELEASE);')
+        hf.line('}\n')
+
+        hf.line('/* Make the entries popped so far visible and ring the doorbell if the producer sleeps */')
+        hf.line(f'static inline void {ring}_release(struct {ring} *ring, seL4_CPtr ntfn)\n{{')
+        hf.line('    __atomic_thread_fence(__ATOMIC_SEQ_CST);')
+        hf.line('    if (__atomic_load_n(&ring->producer_waiting, __ATOMIC_RELAXED)) {')
+        hf.line('        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);')
+        hf.line('        seL4_Signal(ntfn);')
+        hf.line('    }')
+        hf.line('}\n')
+
+        hf.line('/* Block on the doorbell until the ring has a free entry */')
+        hf.line(f'static inline void {ring}_wait_space(struct {ring} *ring, seL4_CPtr ntfn)\n{{')
+        hf.line(f'    while ({ring}_full(ring)) {{')
+        hf.line('        __atomic_store_n(&ring->producer_waiting, 1, __ATOMIC_RELAXED);')
+        hf.line('        __atomic_thread_fence(__ATOMIC_SEQ_CST);')
+        hf.line(f'        if ({ring}_full(ring)) {{')
+        hf.line('            seL4_Wait(ntfn, NULL);')
+        hf.line('        }')
+        hf.line('        __atomic_store_n(&ring->producer_waiting, 0, __ATOMIC_RELAXED);')
+        hf.line('    }')
+        hf.line('}\n')
+
+        if kind == 'resp':
+            hf.line('/*')
+            hf.line(' * Copy out the next response, returns -1 if there is none. server_ntfn is')
+            hf.line(' * rung if the server waits for room in the ring, so it must be the')
+            hf.line(' * notification the server waits on.')
+            hf.line(' */')
+            hf.line(f'static inline int {ring}_dequeue(struct {ring} *ring, struct {prefix}resp *resp, seL4_CPtr server_ntfn)\n{{')
+            hf.line(f'    if ({ring}_empty(ring)) {{')
+            hf.line('        return -1;')
+            hf.line('    }')
+            hf.line(f'    *resp = *{ring}_front(ring);')
+            hf.line(f'    {ring}_pop(ring);')
+            hf.line(f'    {ring}_release(ring, server_ntfn);')
+            hf.line('    return 0;')
+            hf.line('}\n')
+
+    def gen_enqueue(self, hf, i: Method):
+        # Queue a request without signalling, returns -1 if the ring is full
+        prefix = self.ring_prefix()
+        ring = f'{prefix}req_ring'
+        params = ([f'struct {ring} *ring', 'seL4_Word cookie'] + list(map(self.formatarg, i.in_args)) +
+                  list(map(self.formatbufarg, i.buf_args)))
+        hf.line(f'static inline int {prefix}{i.name}_enqueue({", ".join(params)})\n{{')
+        hf.line(f'    struct {prefix}req *e;')
+        hf.line(f'    if ({ring}_full(ring)) {{')
+        hf.line('        return -1;')
+        hf.line('    }')
+        hf.line(f'    e = &ring->entries[ring->head & ({prefix.upper()}SIZE - 1)];')
+        hf.line(f'    e->label = METHOD_NUM_{i.name.upper()};')
+        hf.line('    e->cookie = cookie;')
+        for ctype, name, value in self.ipc_in_fields(i):
+            hf.line(f'    e->u.{i.name}.{name} = {value};')
+        hf.line('    __atomic_store_n(&ring->head, ring->head + 1, __ATOMIC_RELEASE);')
+        hf.line('    return 0;')
+        hf.line('}\n')
 
+    def gen_drain(self, cf, methods):
+        # The handlers read their args from and write their results to
+        # the IPC buffer, so each entry is staged there
+        prefix = self.ring_prefix()
+        cf.line(f'void {prefix}drain({self.drain_params()})\n{{')
+        cf.line('    seL4_IPCBuffer *ipc_buf = seL4_GetIPCBuffer();')
+        cf.line('    int responses = 0;')
+        if self.interface.client_state is not None:
+            cf.line(f'    {self.badge_name()} = badge;')
+        cf.line(f'    while (!{prefix}req_ring_empty(req) && !{prefix}resp_ring_full(resp)) {{')
+        cf.line(f'        struct {prefix}req *e = {prefix}req_ring_front(req);')
+        cf.line(f'        struct {prefix}resp *r = &resp->entries[resp->head & ({prefix.upper()}SIZE - 1)];')
+        cf.line('        seL4_MessageInfo_t reply_info;')
+        cf.line('        int respond = 1;')
+        cf.line('        r->cookie = e->cookie;')
+        cf.line('        switch (e->label) {')
+        for i in self.by_hotness(methods):
+            in_struct = f'struct {prefix}{self.ipc_in_struct_name(i.name)}'
+            cf.line(f'        case METHOD_NUM_{i.name.upper()}:')
+            cf.line(f'            __builtin_memcpy(&ipc_buf->msg[0], &e->u.{i.name}, sizeof({in_struct}));')
+            cf.line(f'            reply_info = {self.interface.server_prefix}{i.name}(0, seL4_MessageInfo_new(METHOD_NUM_{i.name.upper()}, 0, 0, sizeof_in_MRs({in_struct})), NULL, data);')
+            if i.oneway:
+                cf.line('            respond = 0;')
+            else:
+                cf.line(f'            __builtin_memcpy(&r->u.{i.name}, &ipc_buf->msg[0], sizeof(struct {prefix}{self.ipc_out_struct_name(i.name)}));')
+            cf.line('            break;')
+        cf.line('        default:')
+        cf.line(f'            reply_info = {self.interface.error_func}(0, seL4_MessageInfo_new(e->label, 0, 0, 0), NULL, data);')
+        cf.line('            break;')
+        cf.line('        }')
+        cf.line(f'        {prefix}req_ring_pop(req);')
+        cf.line('        if (respond) {')
+        cf.line('            r->label = seL4_MessageInfo_get_label(reply_info);')
+        cf.line('            __atomic_store_n(&resp->head, resp->head + 1, __ATOMIC_RELEASE);')
+        cf.line('            responses++;')
+        cf.line('        }')
+        cf.line('    }')
+        cf.line('    if (responses) {')
+        cf.line(f'        {prefix}resp_ring_kick(resp, client_ntfn);')
+        cf.line('    }')
+        cf.line('}\n')
 
+        # Waiting for room in the response ring instead of retrying lets
+        # a lower priority client run and dequeue
+        args = 'req, resp, client_ntfn, data'
+        if self.interface.client_state is not None:
+            args += ', badge'
+        cf.line(f'void {prefix}serve({self.serve_params()})\n{{')
+        cf.line('    for (;;) {')
+        cf.line(f'        {prefix}req_ring_wait(req, ntfn);')
+        cf.line(f'        {prefix}resp_ring_wait_space(resp, ntfn);')
+        cf.line(f'        {prefix}drain({args});')
+        cf.line('    }')
+        cf.line('}')
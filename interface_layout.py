@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+#
+# Size and alignment of C types as laid out in the IPC structs, used to
+# order struct fields so that messages need as few MRs as possible.
+#
+# Tables are indexed by the word size in bytes (as passed to the
+# generators). Types not in the tables are assumed to need the strictest
+# alignment, pointers are always word sized.
+#
+# 8 byte types are 8 byte aligned at both word sizes, as on ARM and
+# RISC-V. ia32 only aligns them to 4 bytes, so a 32 bit struct_size can
+# come out larger than the real size there (never smaller, the same
+# fields with weaker alignment need no more padding).
+
+_common = {
+    'char' : (1, 1),
+    'signed char' : (1, 1),
+    'unsigned char' : (1, 1),
+    'bool' : (1, 1),
+    '_Bool' : (1, 1),
+    'short' : (2, 2),
+    'unsigned short' : (2, 2),
+    'int' : (4, 4),
+    'unsigned' : (4, 4),
+    'unsigned int' : (4, 4),
+    'long long' : (8, 8),
+    'unsigned long long' : (8, 8),
+    'float' : (4, 4),
+    'double' : (8, 8),
+    'int8_t' : (1, 1),
+    'uint8_t' : (1, 1),
+    'int16_t' : (2, 2),
+    'uint16_t' : (2, 2),
+    'int32_t' : (4, 4),
+    'uint32_t' : (4, 4),
+    'int64_t' : (8, 8),
+    'uint64_t' : (8, 8),
+    'seL4_Int8' : (1, 1),
+    'seL4_Uint8' : (1, 1),
+    'seL4_Bool' : (1, 1),
+    'seL4_Int16' : (2, 2),
+    'seL4_Uint16' : (2, 2),
+    'seL4_Int32' : (4, 4),
+    'seL4_Uint32' : (4, 4),
+    'seL4_Int64' : (8, 8),
+    'seL4_Uint64' : (8, 8),
+    'seL4_Error' : (4, 4),
+}
+
+_word_types = ['long', 'unsigned long', 'size_t', 'ssize_t', 'intptr_t',
+               'uintptr_t', 'seL4_Word', 'seL4_CPtr', 'seL4_MessageInfo_t']
+
+ctype_layouts = {
+    4 : dict(_common, **{t : (4, 4) for t in _word_types}),
+    8 : dict(_common, **{t : (8, 8) for t in _word_types}),
+}
+
+
+def normalise_ctype(ctype: str):
+    words = [w for w in ctype.replace('*', ' * ').split() if w not in ('const', 'volatile')]
+    return ' '.join(words)
+
+def ctype_layout(ctype: str, wordsize):
+    '''(size, alignment) of a C type in bytes, None if unknown'''
+    ctype = normalise_ctype(ctype)
+    if '*' in ctype:
+        return (wordsize, wordsize)
+    return ctype_layouts[wordsize].get(ctype)
+
+def struct_size(ctypes, wordsize):
+    '''Size of a struct with fields of the given types, None if any is unknown'''
+    offset = 0
+    max_align = 1
+    for ctype in ctypes:
+        layout = ctype_layout(ctype, wordsize)
+        if layout is None:
+            return None
+        size, align = layout
+        offset = (offset + align - 1) // align * align + size
+        max_align = max(max_align, align)
+    return (offset + max_align - 1) // max_align * max_align
+
+def optimise_layout(fields, wordsize, ctype=lambda f: f.ctype):
+    '''Order fields by decreasing alignment, unknown types first.
+
+    For the scalar types in the tables this leaves padding only at the
+    end of the struct. The sort is stable, so it is a deterministic
+    function of the declaration and client and server agree on it.
+    '''
+    unknown = [f for f in fields if ctype_layout(ctype(f), wordsize) is None]
+    known = [f for f in fields if ctype_layout(ctype(f), wordsize) is not None]
+    return unknown + sorted(known, key=lambda f: -ctype_layout(ctype(f), wordsize)[1])
@@ -1,6 +1,7 @@
 #!/usr/bin/python3
-import sys, argparse
+import sys, gc
 import xml.etree.ElementTree as ET
+from xml.parsers import expat
 from enum import Enum,auto
 import string
 
@@ -16,33 +17,89 @@ class Scope(Enum):
     CAPIN = auto()
     CAPOUT = auto()
     INOUT = auto()
+    INBUF = auto()
+    OUTBUF = auto()
 
 class ArgDirection(Enum):
     IN = auto()
     OUT = auto()
     INOUT = auto()
 
+# Looking up an enum member runs a descriptor, the parser's per
+# element code uses these instead
+_METHOD = Scope.METHOD
+_IN = ArgDirection.IN
+_OUT = ArgDirection.OUT
+
 #class IdlArgType(Enum):
 #    VALUE = auto()
 #    CAP = auto()
     
+# Labels below this are seL4_Error values, automatically assigned
+# method ids start here
+SEL4_NUM_ERRORS = 11
+
+def slots_str(obj):
+    return str(obj.__class__) + ": " + str({k: getattr(obj, k) for k in obj.__slots__})
+
 class Interface:
+    # shmem is the address of the region shared by client and server
+    # that buffer args are passed in, shmem_size its size in bytes.
+    # client_state (None if not used) is the C type the server keeps for
+    # each of up to max_clients clients, indexed by badge. Methods
+    # without an id get one counting up from id_base, interfaces served
+    # together by a composite dispatch need bases far enough apart.
+    __slots__ = ('dispatch_func', 'server_prefix', 'error_func',
+                 'client_cspace_root', 'client_cspace_depth',
+                 'shmem', 'shmem_size', 'client_state', 'max_clients', 'id_base',
+                 'methods', 'includes', 'defines',
+                 'methods_by_name', 'methods_by_id')
 
-    def __init__(self, disp, err, pre, croot, cdepth):
+    def __init__(self, disp, err, pre, croot, cdepth, shmem='', shmem_size='',
+                 client_state=None, max_clients=0, id_base=SEL4_NUM_ERRORS):
         self.dispatch_func = disp
         self.server_prefix = pre
         self.error_func = err
         self.client_cspace_root = croot
         self.client_cspace_depth = cdepth
+        self.shmem = shmem
+        self.shmem_size = shmem_size
+        self.client_state = client_state
+        self.max_clients = max_clients
+        self.id_base = id_base
         self.methods = []
         self.includes = []
         self.defines = []
+        self.methods_by_name = {}
+        self.methods_by_id = {}
         
     def __str__(self):
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return slots_str(self)
 
     def add_method(self, method):
+        method.finish()
+        if method.name in self.methods_by_name:
+            raise RuntimeError(f'Duplicate method name "{method.name}"')
+        # Indexed by every label the method answers to, methods without
+        # an id get one from assign_ids
+        by_id = self.methods_by_id
+        for id in (method.id, method.batch_id):
+            if id is not None:
+                if id in by_id:
+                    raise RuntimeError(f'Duplicate method id {id} for "{method.name}" and "{by_id[id].name}"')
+                by_id[id] = method
         self.methods.append(method)
+        self.methods_by_name[method.name] = method
+
+    def assign_ids(self):
+        # Dense ids in declaration order, skipping the ones taken
+        next_id = self.id_base
+        for method in self.methods:
+            if method.id is None:
+                while next_id in self.methods_by_id:
+                    next_id += 1
+                method.id = next_id
+                self.methods_by_id[next_id] = method
 
     def add_include(self, inc):
         self.includes.append(inc)
@@ -51,21 +108,25 @@ class Interface:
         self.defines.append(d)
         
 class Include():
+    __slots__ = ('header', 'client', 'server')
+
     def __init__(self,header,client=True, server=True):
         self.header = header
         self.client = client
         self.server = server
 
     def __str__(self):
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return slots_str(self)
 
 class Define:
+    __slots__ = ('name', 'value')
+
     def __init__(self,name,value):
         self.name = name
         self.value = value
 
     def __str__(self):
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return slots_str(self)
     
     
 # class CType:
@@ -76,25 +137,72 @@ class Define:
 #         return str(self.__class__) + ": " + str(self.__dict__)
 
 class Method:
+    # in_args/out_args are the args carried in the in/out IPC structs
+    # (both include INOUT args), split off by finish(). The add_*arg
+    # methods and Interface.add_method call it, the parser appends to
+    # the lists itself and leaves it to add_method. The arg lists are
+    # tuples from then on, views that are the same as args share its
+    # tuple and empty ones the empty tuple.
+    # oneway methods are sent without waiting for a reply, with
+    # seL4_NBSend if nonblocking. batch_id (None if not batched) is the
+    # label of the call carrying several invocations at once. id is None
+    # until assigned if the xml leaves it out. cache_size (None if not
+    # cacheable) is the number of replies the client stub keeps.
+    __slots__ = ('name', 'id', 'return_type', 'cap', 'oneway', 'nonblocking', 'batch_id',
+                 'cache_size', 'args', 'cap_args', 'buf_args',
+                 'in_args', 'out_args', 'in_caps', 'out_caps')
+
     def __str__(self):
-        return str(self.__class__) + ": " + str(self.__dict__)
-    def __init__(self, name, id, return_type, cap):
+        return slots_str(self)
+    def __init__(self, name, id, return_type, cap, oneway=False, nonblocking=False, batch_id=None,
+                 cache_size=None):
         self.name = name
         self.id = id
         self.return_type = return_type
         self.cap = cap
+        self.oneway = oneway
+        self.nonblocking = nonblocking
+        self.batch_id = batch_id
+        self.cache_size = cache_size
         self.args = []
         self.cap_args = []
+        self.buf_args = []
+        self.in_args = self.out_args = self.in_caps = self.out_caps = ()
 
     def add_arg(self, arg):
-        self.args.append(arg)
+        self.args = (*self.args, arg)
+        self.finish()
         
+    def add_buf_arg(self, arg):
+        self.buf_args = (*self.buf_args, arg)
+        self.finish()
+
     def add_cap_arg(self, arg):
-        self.cap_args.append(arg)
+        self.cap_args = (*self.cap_args, arg)
+        self.finish()
+
+    def finish(self):
+        # Can be called any number of times
+        self.in_args = self.out_args = self.in_caps = self.out_caps = ()
+        args = self.args = tuple(self.args)
+        if len(args) > 0:
+            self.in_args = tuple([a for a in args if a.direction is not _OUT])
+            self.out_args = tuple([a for a in args if a.direction is not _IN])
+            if len(self.in_args) == len(args):
+                self.in_args = args
+            if len(self.out_args) == len(args):
+                self.out_args = args
+        self.buf_args = tuple(self.buf_args)
+        caps = self.cap_args = tuple(self.cap_args)
+        if len(caps) > 0:
+            self.in_caps = tuple([c for c in caps if c.direction is _IN])
+            self.out_caps = tuple([c for c in caps if c.direction is not _IN])
 
 class Arg:
+    __slots__ = ('ctype', 'name', 'direction', 'const')
+
     def __str__(self):
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return slots_str(self)
     def __init__(self, ctype, name, direction, const):
         self.ctype = ctype
         self.name = name
@@ -102,15 +210,59 @@ class Arg:
         self.const = const
 
 class CapArg:
+    __slots__ = ('ctype', 'name', 'direction')
+
     def __str__(self):
-        return str(self.__class__) + ": " + str(self.__dict__)
+        return slots_str(self)
 
     def __init__(self, ctype, name, direction):
         self.ctype = ctype
         self.name = name
         self.direction = direction
+
+class BufArg:
+    # Array of ctype in the shared region, size is a C expression (in
+    # terms of the in args) giving the number of elements
+    __slots__ = ('ctype', 'name', 'direction', 'size')
+
+    def __str__(self):
+        return slots_str(self)
+
+    def __init__(self, ctype, name, direction, size):
+        self.ctype = ctype
+        self.name = name
+        self.direction = direction
+        self.size = size
         
     
+# Closing tag -> (scope it must close, error message otherwise)
+end_scopes = {
+    'interface' : (Scope.INTERFACE, 'Missing <interface> scope start'),
+    'include' : (Scope.INCLUDE, 'Missing <include> scope start'),
+    'define' : (Scope.DEFINE, 'Missing <define> start'),
+    'ctype' : (Scope.CTYPE, 'Missing <ctype> scope start'),
+    'method' : (Scope.METHOD, 'Missing method start'),
+    'in' : (Scope.IN, 'Missing <in> arg start'),
+    'out' : (Scope.OUT, 'Missing <out> arg start'),
+    'capin' : (Scope.CAPIN, 'Missing <capin> arg start'),
+    'capout' : (Scope.CAPOUT, 'Missing <capout> arg start'),
+    'inout' : (Scope.INOUT, 'Missing <inout> arg start'),
+    'inbuf' : (Scope.INBUF, 'Missing <inbuf> arg start'),
+    'outbuf' : (Scope.OUTBUF, 'Missing <outbuf> arg start'),
+}
+
+# Closing tag -> scope it closes
+end_tags = {tag : scope for tag, (scope, error) in end_scopes.items()}
+
+# Value arg tags -> (scope, direction)
+value_args = {
+    'in' : (Scope.IN, ArgDirection.IN),
+    'out' : (Scope.OUT, ArgDirection.OUT),
+    'inout' : (Scope.INOUT, ArgDirection.INOUT),
+}
+
+whitespace = string.whitespace
+
 class InterfaceParser:
 
     def __init__(self, wordsize):
@@ -120,192 +272,209 @@ class InterfaceParser:
         self.args = []
         self.wordsize = 0
         self.interface = None
+        # Arg types and names repeat a lot, keep one copy of each
+        self.intern = sys.intern
+        # Character data since the last check, see check_text
+        self.text = []
+        # Opening tag -> handler
+        self.start_handlers = {
+            'interface' : self.start_interface,
+            'include' : self.start_include,
+            'define' : self.start_define,
+            'method' : self.start_method,
+            'capin' : self.start_capin,
+            'capout' : self.start_capout,
+            'inbuf' : self.start_inbuf,
+            'outbuf' : self.start_outbuf,
+        }
     
     def __str__(self):
         return str(self.__class__) + ": " + str(self.__dict__)
 
     def start(self, tag, attrib): # Called for each opening tag
-        if tag == 'interface':
-            if self.scope[-1] != Scope.XML:
-                raise RuntimeError('Only a single interface allowed')
-            else:
-                self.scope.append(Scope.INTERFACE)
-                if 'client_cspace_root' in attrib.keys():
-                    cspace=attrib['client_cspace_root']
-                else:
-                    cspace=""
-                    
-                if 'client_cspace_depth' in attrib.keys():
-                    cdepth=attrib['client_cspace_depth']
-                else:
-                    cdepth=""
-                    
-                self.interface = Interface(attrib['dispatch_func'], attrib['error_func'], attrib['server_prefix'],cspace,cdepth);
-                
-        elif tag == 'include':
-            if self.scope[-1] != Scope.INTERFACE:
-                raise RuntimeError('Include must be in interface scope')
-            else:
-                self.scope.append(Scope.INCLUDE)
-                client=True
-                server=True
-                if 'client' in attrib.keys():
-                    client = str(attrib['client']).lower() == 'true'
-                if 'server' in attrib.keys():
-                    server = attrib['server'].lower() == 'true'
-                self.interface.add_include(Include(attrib['header'],client,server))
-                
-        elif tag == 'define':
-            if self.scope[-1] != Scope.INTERFACE:
-                raise RuntimeError('Define must be in interface scope')
-            else:
-                self.scope.append(Scope.DEFINE)
-                self.interface.add_define(Define(attrib['name'],attrib['value']))
-                
-        # elif tag == 'ctype':
-        #     if self.scope[-1] != Scope.INTERFACE:
-        #         raise RuntimeError('Define must be in <interface> scope')
-        #     else:
-        #         self.scope.append(Scope.CTYPE)
-        #         self.ctypes[attrib['name']] = CType(attrib['name'], attrib['type'])
-        
-        elif tag == 'method':
-            if self.scope[-1] != Scope.INTERFACE:
-                raise RuntimeError('Method definition outside interface scope')
-            else:
-                self.scope.append(Scope.METHOD)
-                # More extensive checks required
-                if 'return_type' not in attrib.keys():
-                    rt = 'seL4_MessageInfo_t'
-                else:
-                    rt = attrib['return_type']
-                    
-                self.cur_method = Method(attrib['name'],int(attrib['id']),rt,attrib['clientcap'])
-
-                
-        elif tag == 'in':
-            if self.scope[-1] != Scope.METHOD:
-                raise RuntimeError('arg definition outside method scope')
-            else:
-                self.scope.append(Scope.IN)
-
-                if 'const' in attrib.keys():
-                    const = (attrib['const'].lower() == 'true')
-                else:
-                    const = False
-                    
-                self.cur_method.add_arg(Arg(attrib['ctype'],
-                                                attrib['name'],
-                                                ArgDirection.IN,
-                                                const))
-                                
-        elif tag == 'out':
-            if self.scope[-1] != Scope.METHOD:
+        # Value args are most of the elements, they are added here rather
+        # than through another call
+        arg = value_args.get(tag)
+        if arg is not None:
+            scope, direction = arg
+            scopes = self.scope
+            if scopes[-1] is not _METHOD:
                 raise RuntimeError('arg definition outside method scope')
-            else:
-                self.scope.append(Scope.OUT)
-                    
-                self.cur_method.add_arg(Arg(attrib['ctype'],
-                                                attrib['name'],
-                                                ArgDirection.OUT, False))
-
-        elif tag == 'inout':
-            if self.scope[-1] != Scope.METHOD:
-                raise RuntimeError('arg definition outside method scope')
-            else:
-                self.scope.append(Scope.INOUT)
-                    
-                self.cur_method.add_arg(Arg(attrib['ctype'],
-                                            attrib['name'],
-                                            ArgDirection.INOUT, False))
-
-        elif tag == 'capin':
-            if self.scope[-1] != Scope.METHOD:
-                raise RuntimeError('arg definition outside method scope')
-            else:
-                self.scope.append(Scope.CAPIN)
-                    
-                self.cur_method.add_cap_arg(CapArg(attrib['ctype'],
-                                            attrib['name'],
-                                            ArgDirection.IN))
-
-        elif tag == 'capout':
-            if self.scope[-1] != Scope.METHOD:
-                raise RuntimeError('arg definition outside method scope')
-            else:
-                self.scope.append(Scope.CAPOUT)
-                    
-                self.cur_method.add_cap_arg(CapArg(attrib['ctype'],
-                                            attrib['name'],
-                                            ArgDirection.OUT))
-        else:
+            scopes.append(scope)
+            # Optional attributes are tested with "in", most leave them out
+            const = direction is _IN and 'const' in attrib and attrib['const'].lower() == 'true'
+            intern = self.intern
+            self.cur_method.args.append(Arg(intern(attrib['ctype']), intern(attrib['name']), direction, const))
+            return
+        handler = self.start_handlers.get(tag)
+        if handler is None:
             raise RuntimeError(f'Unknown xml tag: {tag}')
-        
+        handler(attrib)
+
+    def start_interface(self, attrib):
+        if self.scope[-1] != Scope.XML:
+            raise RuntimeError('Only a single interface allowed')
+        self.scope.append(Scope.INTERFACE)
+        if ('client_state' in attrib) != ('max_clients' in attrib):
+            raise RuntimeError('client_state and max_clients must be given together')
+        max_clients = int(attrib.get('max_clients', '0'), 0)
+        if 'max_clients' in attrib and max_clients < 1:
+            raise RuntimeError('max_clients must be at least 1')
+        id_base = int(attrib.get('id_base', str(SEL4_NUM_ERRORS)), 0)
+        if id_base < SEL4_NUM_ERRORS:
+            raise RuntimeError(f'id_base must be at least seL4_NumErrors ({SEL4_NUM_ERRORS})')
+        self.interface = Interface(attrib['dispatch_func'], attrib['error_func'], attrib['server_prefix'],
+                                   attrib.get('client_cspace_root', ''),
+                                   attrib.get('client_cspace_depth', ''),
+                                   attrib.get('shmem', ''),
+                                   attrib.get('shmem_size', ''),
+                                   attrib.get('client_state'),
+                                   max_clients, id_base)
+
+    def start_include(self, attrib):
+        if self.scope[-1] != Scope.INTERFACE:
+            raise RuntimeError('Include must be in interface scope')
+        self.scope.append(Scope.INCLUDE)
+        client = attrib.get('client', 'true').lower() == 'true'
+        server = attrib.get('server', 'true').lower() == 'true'
+        self.interface.add_include(Include(attrib['header'],client,server))
+
+    def start_define(self, attrib):
+        if self.scope[-1] != Scope.INTERFACE:
+            raise RuntimeError('Define must be in interface scope')
+        self.scope.append(Scope.DEFINE)
+        self.interface.add_define(Define(attrib['name'],attrib['value']))
+
+    # def start_ctype(self, attrib):
+    #     if self.scope[-1] != Scope.INTERFACE:
+    #         raise RuntimeError('Define must be in <interface> scope')
+    #     self.scope.append(Scope.CTYPE)
+    #     self.ctypes[attrib['name']] = CType(attrib['name'], attrib['type'])
+
+    def start_method(self, attrib):
+        if self.scope[-1] != Scope.INTERFACE:
+            raise RuntimeError('Method definition outside interface scope')
+        self.scope.append(Scope.METHOD)
+        # More extensive checks required
+        oneway = 'oneway' in attrib and attrib['oneway'].lower() == 'true'
+        nonblocking = 'nonblocking' in attrib and attrib['nonblocking'].lower() == 'true'
+        batch_id = int(attrib['batch_id']) if 'batch_id' in attrib else None
+        rt = self.intern(attrib['return_type']) if 'return_type' in attrib else \
+            'void' if oneway else 'seL4_MessageInfo_t'
+        id = int(attrib['id']) if 'id' in attrib else None
+        cache_size = int(attrib['cacheable']) if 'cacheable' in attrib else None
+        if cache_size is not None and cache_size < 1:
+            raise RuntimeError(f'Method "{attrib["name"]}" cache size must be at least 1')
+        self.cur_method = Method(attrib['name'],id,rt,self.intern(attrib['clientcap']),oneway,nonblocking,batch_id,cache_size)
+
+    def start_arg(self, scope):
+        if self.scope[-1] is not _METHOD:
+            raise RuntimeError('arg definition outside method scope')
+        self.scope.append(scope)
+
+    def start_capin(self, attrib):
+        self.start_arg(Scope.CAPIN)
+        self.cur_method.cap_args.append(CapArg(self.intern(attrib['ctype']), self.intern(attrib['name']), ArgDirection.IN))
+
+    def start_capout(self, attrib):
+        self.start_arg(Scope.CAPOUT)
+        self.cur_method.cap_args.append(CapArg(self.intern(attrib['ctype']), self.intern(attrib['name']), ArgDirection.OUT))
+
+    def start_inbuf(self, attrib):
+        self.start_arg(Scope.INBUF)
+        self.cur_method.buf_args.append(BufArg(self.intern(attrib['ctype']), self.intern(attrib['name']), ArgDirection.IN, attrib['size']))
+
+    def start_outbuf(self, attrib):
+        self.start_arg(Scope.OUTBUF)
+        self.cur_method.buf_args.append(BufArg(self.intern(attrib['ctype']), self.intern(attrib['name']), ArgDirection.OUT, attrib['size']))
+
     def end(self, tag):           # Called for each closing tag.
-        if tag == 'interface':
-            if self.scope[-1] != Scope.INTERFACE:
-                raise RuntimeError('Missing <interface> scope start')
-            else:
-                self.scope.pop()
-        elif tag == 'include':
-            if self.scope[-1] != Scope.INCLUDE:
-                raise RuntimeError('Missing <include> scope start')
-            else:
-                self.scope.pop()
-        elif tag == 'define':
-            if self.scope[-1] != Scope.DEFINE:
-                raise RuntimeError('Missing <define> start')
-            else:
-                self.scope.pop()
-        elif tag == 'ctype':
-            if self.scope[-1] != Scope.CTYPE:
-                raise RuntimeError('Missing <ctype> scope start')
-            else:
-                self.scope.pop()
-        elif tag == 'method':
-            if self.scope[-1] != Scope.METHOD:
-                raise RuntimeError('Missing method start')
-            else:
-                self.scope.pop()
-                self.interface.add_method(self.cur_method)
-                
-        elif tag == 'in':
-            if self.scope[-1] != Scope.IN:
-                raise RuntimeError('Missing <in> arg start')
-            else:
-                self.scope.pop()
-        elif tag == 'out':
-            if self.scope[-1] != Scope.OUT:
-                raise RuntimeError('Missing <out> arg start')
-            else:
-                self.scope.pop()
-        elif tag == 'capin':
-            if self.scope[-1] != Scope.CAPIN:
-                raise RuntimeError('Missing <capin> arg start')
-            else:
-                self.scope.pop()
-        elif tag == 'capout':
-            if self.scope[-1] != Scope.CAPOUT:
-                raise RuntimeError('Missing <capout> arg start')
-            else:
-                self.scope.pop()
-        elif tag == 'inout':
-            if self.scope[-1] != Scope.INOUT:
-                raise RuntimeError('Missing <inout> arg start')
-            else:
-                self.scope.pop()
-        else:
-            raise RuntimeError(f'Unknown xml tag: {tag}')
-        
-    def data(self, data):
-        if data.translate({ord(c): None for c in string.whitespace}) != '':
-            raise RuntimeError(f'Unexpected data in the XML: {data}')
+        scope = self.scope.pop()
+        if end_tags.get(tag) is not scope:
+            self.scope.append(scope)
+            self.end_error(tag)
+        if scope is _METHOD:
+            self.check_text()
+            self.interface.add_method(self.cur_method)
+
+    def end_error(self, tag):
+        try:
+            scope, error = end_scopes[tag]
+        except KeyError:
+            raise RuntimeError(f'Unknown xml tag: {tag}') from None
+        raise RuntimeError(error)
+
+    def check_text(self):
+        # The parser only collects character data, it is checked a method
+        # at a time as a callback for each run of whitespace is too slow
+        text = self.text
+        if ''.join(text).strip(whitespace) != '':
+            for data in text:
+                if data.strip(whitespace) != '':
+                    raise RuntimeError(f'Unexpected data in the XML: {data}')
+        text.clear()
         
     def close(self):              # Called when all data has been parsed.
+            self.check_text()
             if self.scope[-1] != Scope.XML:
                 raise RuntimeError('Premature end of file')
             else:
+                # All explicit ids are known now
+                self.interface.assign_ids()
                 return self.interface
 
 
+def parse_interface(xml, wordsize):
+    '''Parse interface xml (bytes) into an Interface.
+
+    Uses expat directly with buffered character data, which avoids most
+    of the per callback overhead of going through ET.XMLParser.
+    '''
+    target = InterfaceParser(wordsize)
+    parser = expat.ParserCreate()
+    parser.buffer_text = True
+    parser.buffer_size = 1 << 16
+    parser.StartElementHandler = target.start
+    parser.EndElementHandler = target.end
+    parser.CharacterDataHandler = target.text.append
+    # The model only holds acyclic references, don't let the garbage
+    # collector rescan it over and over while it is being built
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        parser.Parse(xml, True)
+    except expat.ExpatError as e:
+        err = ET.ParseError(str(e))
+        err.code = e.code
+        err.position = (e.lineno, e.offset)
+        raise err from None
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return target.close()
+
+def parse_interface_file(filename, wordsize):
+    with open(filename, 'rb') as xmlfile:
+        return parse_interface(xmlfile.read(), wordsize)
+
+def load_profile(filename):
+    '''Call counts by method name, from lines of "name count".
 
+    Blank lines and lines starting with # are ignored, counts for the
+    same name are added up. Batched calls are counted as <name>_batch.
+    '''
+    profile = {}
+    with open(filename) as f:
+        for lineno, line in enumerate(f, 1):
+            line = line.strip()
+            if line == '' or line.startswith('#'):
+                continue
+            fields = line.split()
+            try:
+                name, count = fields[0], int(fields[1])
+                if len(fields) != 2 or count < 0:
+                    raise ValueError
+            except (IndexError, ValueError):
+                raise RuntimeError(f'{filename}:{lineno}: expected "name count"') from None
+            profile[name] = profile.get(name, 0) + count
+    return profile
@@ -1,55 +1,140 @@
 #!/usr/bin/python3
-import sys, argparse
-import xml.etree.ElementTree as ET
-from interface_parse import InterfaceParser
-from interface_gen import InterfacePrint, InterfaceClientStubs, InterfaceServerDispatch
+import sys, os, argparse
+from interface_parse import parse_interface, load_profile
+from interface_gen import InterfacePrint, InterfaceCostReport, InterfaceClientStubs, InterfaceServerDispatch, InterfaceRingTransport, write_if_changed, remove_stale_sources
+from interface_cache import GeneratorCache, default_cachedir
             
 generators = {'printer' : InterfacePrint,
               'clientstubs' : InterfaceClientStubs,
-              'serverdispatch' : InterfaceServerDispatch
+              'serverdispatch' : InterfaceServerDispatch,
+              'ring' : InterfaceRingTransport,
+              'cost' : InterfaceCostReport
 }
         
-def main() -> int:
-    global wordsize_in_bytes
-    
+wordsizes = {'64' : 8,
+             '32' : 4
+}
+
+def argument_parser():
     ap = argparse.ArgumentParser(description='Generate seL4 RPC stubs for an interface specified in XML') 
     ap.add_argument('filename', metavar='file_name.xml',
                     type=str, help='Interface xml file')
-    ap.add_argument('-w','--wordsize', dest='wordsize', default='64',
-                    type=str, help='CPU word size in bits (default=64)')
+    ap.add_argument('-w','--wordsize', dest='wordsizes', action='append',
+                    type=str, help='CPU word size in bits (default=64), may be repeated')
     ap.add_argument('-g','--generator',
-                    dest='generator',
-                    default='printer',
+                    dest='generators',
+                    action='append',
                     choices=generators.keys(),
                     type=str,
-                    help='Choose output interface generator (default=printer)')
+                    help='Choose output interface generator (default=printer), may be repeated')
     ap.add_argument('-o','--output', dest='filebasename', default='',
-                    type=str, help='Choose output file base name')
-
-    args = ap.parse_args()
-    if args.wordsize == '64':
-        wordsize_in_bytes = 8
-    elif args.wordsize == '32':
-        wordsize_in_bytes=4
-    else:
-        raise RuntimeError(f'Unsupported word size "{args.wordsize}"')
-    
-
-    target = InterfaceParser(wordsize_in_bytes)
-    parser = ET.XMLParser(target=target)
-    with open(args.filename) as xmlfile:
-        for line in xmlfile:
-            parser.feed(line)
-        interface = parser.close()
-
-
-    if args.generator in generators.keys():
-        generators[args.generator](interface,
-                                   args.filebasename,
-                                   wordsize_in_bytes)
-    else:
-        raise RuntimeError(f'Non-existant output generator "{args.generator}"')
+                    type=str, help='Choose output file base name, {generator}, {wordsize} '
+                    'and {stem} (xml file name without extension) are replaced')
+    add_generator_options(ap)
+    ap.add_argument('--cache-dir', dest='cachedir', default=default_cachedir(),
+                    type=str, help='Cache generated files in this directory '
+                    '(default=$INTERFACE_GEN_CACHE, no caching if unset)')
+    return ap
+
+def main(argv=None, models=None) -> int:
+    # models, if given, maps xml content to parsed interfaces and is
+    # kept between calls (see daemon.py)
+    args = argument_parser().parse_args(argv)
+    if args.generators is None:
+        args.generators = ['printer']
+    if args.wordsizes is None:
+        args.wordsizes = ['64']
+    for w in args.wordsizes:
+        if w not in wordsizes:
+            raise RuntimeError(f'Unsupported word size "{w}"')
+
+    targets = [(g, w) for g in args.generators for w in args.wordsizes]
+    if len(targets) > 1 and len(set(target_basename(args.filebasename, g, w, args.filename) for g, w in targets)) != len(targets):
+        raise RuntimeError('Output name must contain {generator} and/or {wordsize} to tell the targets apart')
+
+    options = generator_options(args)
+
+    with open(args.filename, 'rb') as xmlfile:
+        xml = xmlfile.read()
+
+    cache = GeneratorCache(args.cachedir) if args.cachedir else None
+    interface = None
+    for g, w in targets:
+        filebasename = target_basename(args.filebasename, g, w, args.filename)
+        if cache is not None and generators[g].cacheable:
+            key = cache.key(xml, g, w, filebasename, options)
+            outputs = cache.lookup(key)
+            if outputs is not None:
+                if generators[g] is InterfaceClientStubs:
+                    remove_stale_sources(filebasename, outputs['.sources'].split() if '.sources' in outputs else None)
+                for suffix, text in outputs.items():
+                    write_if_changed(filebasename + suffix, text)
+                continue
+
+        # The interface model does not depend on the word size, parse it once
+        if interface is None and models is not None:
+            interface = models.get(xml)
+        if interface is None:
+            interface = parse_interface(xml, wordsizes[w])
+            if models is not None:
+                models[xml] = interface
+        gen = generators[g](interface, filebasename, wordsizes[w], **options)
+
+        if cache is not None and generators[g].cacheable:
+            cache.store(key, gen.outputs, filename=args.filename, generator=g,
+                        wordsize=w, filebasename=filebasename)
     return 0
 
+def add_generator_options(ap):
+    # Options passed on to the generators, shared with composite.py
+    ap.add_argument('--fastpath', dest='fastpath', action='store_true',
+                    help='Pass small messages in registers with seL4_CallWithMRs')
+    ap.add_argument('-d','--dispatch', dest='dispatch', default='switch',
+                    choices=['switch', 'table', 'hash', 'auto'],
+                    help='Server dispatch strategy (default=switch)')
+    ap.add_argument('--optimise-layout', dest='optimise_layout', action='store_true',
+                    help='Reorder IPC struct fields to use the fewest MRs')
+    ap.add_argument('--server-loop', dest='server_loop', action='store_true',
+                    help='Also generate a seL4_ReplyRecv server loop around the dispatch function')
+    ap.add_argument('--no-reply-label', dest='no_reply_label', default=0xfffff,
+                    type=lambda x: int(x, 0), help='Label a handler returns to defer its reply (default=0xfffff)')
+    ap.add_argument('--inline', dest='inline_stubs', action='store_true',
+                    help='Generate the client stubs as static inline functions in the header')
+    ap.add_argument('--profile', dest='profile', default=None,
+                    type=str, help='File of "method count" lines, the hottest methods are dispatched first')
+    ap.add_argument('--instrument', dest='instrument', action='store_true',
+                    help='Add per-method call count and cycle timing hooks, enabled by defining <PREFIX>STATS')
+    ap.add_argument('--split', dest='split', default=None,
+                    type=split_arg, help='Write the client stubs to one .c per method ("method") or to N '
+                    '.c shards, listed in a .sources file')
+    ap.add_argument('--typed-handlers', dest='typed_handlers', action='store_true',
+                    help='Generate the server handlers, checking the message and calling '
+                    '<server_prefix><method>_typed() with pointers to the IPC structs')
+
+def generator_options(args):
+    if args.split is not None and args.inline_stubs:
+        raise RuntimeError('--split and --inline cannot be used together, inline stubs have no .c to split')
+    return dict(fastpath=args.fastpath,
+                dispatch=args.dispatch,
+                optimise_layout=args.optimise_layout,
+                server_loop=args.server_loop,
+                no_reply_label=args.no_reply_label,
+                inline_stubs=args.inline_stubs,
+                profile=load_profile(args.profile) if args.profile else None,
+                instrument=args.instrument,
+                split=args.split,
+                typed_handlers=args.typed_handlers)
+
+def split_arg(value):
+    if value == 'method':
+        return value
+    if not value.isdigit() or int(value) < 1:
+        raise argparse.ArgumentTypeError('must be "method" or a number of shards')
+    return int(value)
+
+def target_basename(filebasename, generator, wordsize, filename):
+    stem = os.path.splitext(os.path.basename(filename))[0]
+    return filebasename.format(generator=generator, wordsize=wordsize, stem=stem)
+
 if __name__ == '__main__':
     sys.exit(main())
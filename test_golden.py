@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+#
+# Compares the generated files with the ones kept in golden/, generated
+# from the interfaces there. After changing what a generator emits,
+# check the diff and update them with
+#
+#   GOLDEN_UPDATE=1 python3 -m pytest test_golden.py
+import unittest, os
+from interface_parse import parse_interface_file, load_profile
+from interface_gen import (InterfaceClientStubs, InterfaceServerDispatch, InterfaceRingTransport,
+                           InterfaceCompositeDispatch, InterfaceCostReport)
+
+golden_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'golden')
+update = os.environ.get('GOLDEN_UPDATE') == '1'
+
+class TestGolden(unittest.TestCase):
+    def generate(self, name, gen, xml, wordsize=8, **options):
+        # Outputs of gen for golden/<xml>.xml, checked against
+        # golden/<name><suffix>
+        interface = parse_interface_file(os.path.join(golden_dir, xml + '.xml'), wordsize)
+        outputs = gen(interface, name, wordsize, write=False, **options).outputs
+        self.check(name, outputs)
+        return outputs
+
+    def check(self, name, outputs):
+        for suffix, text in outputs.items():
+            filename = os.path.join(golden_dir, name + suffix)
+            if update:
+                with open(filename, 'w') as f:
+                    f.write(text)
+            with open(filename) as f:
+                self.assertEqual(text, f.read(), f'{filename} differs')
+
+    def test_client_stubs(self):
+        self.generate('calc_client', InterfaceClientStubs, 'calc')
+
+    def test_server_dispatch(self):
+        self.generate('calc_server', InterfaceServerDispatch, 'calc')
+
+    def test_server_loop(self):
+        self.generate('calc_server_loop', InterfaceServerDispatch, 'calc', server_loop=True)
+
+    def test_fastpath(self):
+        self.generate('calc_client_fastpath', InterfaceClientStubs, 'calc', fastpath=True)
+        self.generate('calc_client_fastpath32', InterfaceClientStubs, 'calc', 4, fastpath=True)
+
+    def test_dispatch(self):
+        for dispatch in ('table', 'hash'):
+            self.generate(f'calc_server_{dispatch}', InterfaceServerDispatch, 'calc', dispatch=dispatch)
+
+    def test_optimise_layout(self):
+        for wordsize in (8, 4):
+            self.generate(f'calc_client_layout{wordsize * 8}', InterfaceClientStubs, 'calc', wordsize, optimise_layout=True)
+            self.generate(f'calc_server_layout{wordsize * 8}', InterfaceServerDispatch, 'calc', wordsize, optimise_layout=True)
+
+    def test_oneway(self):
+        self.generate('notify_client', InterfaceClientStubs, 'notify')
+        self.generate('notify_server', InterfaceServerDispatch, 'notify')
+
+    def test_shmem(self):
+        self.generate('blk_client', InterfaceClientStubs, 'blk')
+        self.generate('blk_server', InterfaceServerDispatch, 'blk')
+
+    def test_ring(self):
+        self.generate('calc_ring', InterfaceRingTransport, 'calc')
+        self.generate('notify_ring', InterfaceRingTransport, 'notify')
+
+    def test_batch(self):
+        self.generate('kv_client', InterfaceClientStubs, 'kv')
+        self.generate('kv_server', InterfaceServerDispatch, 'kv')
+
+    def test_inline(self):
+        outputs = self.generate('calc_client_inline', InterfaceClientStubs, 'calc', inline_stubs=True)
+        # The .c is still written, with nothing left in it
+        self.assertNotIn('seL4_Call', outputs['.c'])
+
+    def test_profile(self):
+        profile = load_profile(os.path.join(golden_dir, 'calc.profile'))
+        self.generate('calc_server_profile', InterfaceServerDispatch, 'calc', profile=profile)
+        self.generate('calc_server_profile_hash', InterfaceServerDispatch, 'calc', profile=profile, dispatch='hash')
+
+    def test_instrument(self):
+        self.generate('calc_client_instrument', InterfaceClientStubs, 'calc', instrument=True)
+        self.generate('calc_server_instrument', InterfaceServerDispatch, 'calc', instrument=True)
+
+    def test_composite(self):
+        servers = [InterfaceServerDispatch(parse_interface_file(os.path.join(golden_dir, xml + '.xml'), 8),
+                                           f'{xml}_composite_server', 8, write=False, server_loop=True)
+                   for xml in ('calc', 'timer')]
+        composite = InterfaceCompositeDispatch(servers, 'calc_timer', 8, 'calc_timer', 'calc_timer_error',
+                                               write=False, server_loop=True)
+        for server in servers:
+            self.check(server.filebasename, server.outputs)
+        self.check('calc_timer', composite.outputs)
+
+    def test_split(self):
+        self.generate('calc_client_split', InterfaceClientStubs, 'calc', split='method')
+        self.generate('kv_client_split2', InterfaceClientStubs, 'kv', split=2)
+
+    def test_typed_handlers(self):
+        self.generate('calc_server_typed', InterfaceServerDispatch, 'calc', typed_handlers=True)
+        self.generate('notify_server_typed', InterfaceServerDispatch, 'notify', typed_handlers=True)
+
+    def test_cache(self):
+        self.generate('geo_client', InterfaceClientStubs, 'geo')
+
+    def test_cost(self):
+        self.generate('calc_cost', InterfaceCostReport, 'calc')
+        self.generate('notify_cost', InterfaceCostReport, 'notify')
+
+    def test_static_asserts(self):
+        # The MR budget checks of each IPC struct, at both word sizes
+        for name, wordsize in (('calc_client', 8), ('calc_client32', 4)):
+            outputs = self.generate(name, InterfaceClientStubs, 'calc', wordsize)
+            self.assertEqual(outputs['.c'].count('_Static_assert(sizeof_in_MRs('), 10)
+
+    def test_client_state(self):
+        self.generate('sess_server', InterfaceServerDispatch, 'sess')
+        self.generate('sess_server_loop', InterfaceServerDispatch, 'sess', server_loop=True)
+        self.generate('sess_ring', InterfaceRingTransport, 'sess')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+import unittest, os, tempfile, shutil
+import interface_cache
+from interface_cache import GeneratorCache
+
+class TestGeneratorCache(unittest.TestCase):
+    xml = b'<interface dispatch_func="d" error_func="e" server_prefix="s_"/>\n'
+    options = dict(fastpath=False, dispatch='switch')
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.cache = GeneratorCache(os.path.join(self.dir, 'cache'))
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def key(self, **changes):
+        args = dict(xml=self.xml, generator='clientstubs', wordsize='64',
+                    filebasename='out', options=self.options)
+        args.update(changes)
+        return self.cache.key(**args)
+
+    def test_key_changes(self):
+        key = self.key()
+        self.assertEqual(key, self.key())
+        self.assertEqual(key, self.key(options=dict(reversed(list(self.options.items())))))
+        others = [self.key(xml=self.xml + b' '),
+                  self.key(generator='serverdispatch'),
+                  self.key(wordsize='32'),
+                  self.key(filebasename='other'),
+                  self.key(options=dict(self.options, fastpath=True)),
+                  self.key(options=dict(self.options, dispatch='hash')),
+                  self.key(options=dict(self.options, split=2))]
+        self.assertEqual(len(set(others + [key])), len(others) + 1)
+
+    def test_key_changes_with_sources(self):
+        source = os.path.join(self.dir, 'gen.py')
+        with open(source, 'w') as f:
+            f.write('# version 1\n')
+        saved = interface_cache._sources, interface_cache._generator_version
+        try:
+            interface_cache._sources = [source]
+            interface_cache._generator_version = None
+            key = self.key()
+            with open(source, 'w') as f:
+                f.write('# version 2\n')
+            interface_cache._generator_version = None
+            self.assertNotEqual(key, self.key())
+        finally:
+            interface_cache._sources, interface_cache._generator_version = saved
+
+    def test_store_lookup(self):
+        key = self.key()
+        self.assertIsNone(self.cache.lookup(key))
+        outputs = {'.h': 'header\n', '.c': 'source\n'}
+        self.cache.store(key, outputs, generator='clientstubs')
+        self.assertEqual(self.cache.lookup(key), outputs)
+        self.assertIsNone(self.cache.lookup(self.key(wordsize='32')))
+        self.assertEqual(self.cache.clear(), 1)
+        self.assertIsNone(self.cache.lookup(key))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+#!/usr/bin/python3
+import unittest, random, os, tempfile, shutil
+from interface_parse import parse_interface
+from interface_gen import (perfect_hash, hash_mix, HASH_DISP, HASH_MASK, write_if_changed,
+                           InterfaceClientStubs, InterfaceServerDispatch, InterfaceCompositeDispatch)
+
+def lookup(disp, slots, key):
+    # Same steps as the generated <dispatch_func>()
+    d = disp[hash_mix(key) % len(disp)]
+    return hash_mix(key ^ ((d * HASH_DISP) & HASH_MASK)) % len(slots)
+
+class TestPerfectHash(unittest.TestCase):
+    key_sets = [
+        [11],
+        [11, 12],
+        list(range(11, 43)),
+        [11, 500, 3991, 70000, 0xfffff, 0xffffffff],
+        random.Random(1).sample(range(11, 1 << 20), 200),
+    ]
+
+    def test_no_collisions(self):
+        for keys in self.key_sets:
+            disp, slots = perfect_hash(keys)
+            self.assertEqual(sorted(slots), sorted(keys))
+            for k in keys:
+                self.assertEqual(slots[lookup(disp, slots, k)], k)
+
+    def test_other_keys_rejected(self):
+        for keys in self.key_sets:
+            disp, slots = perfect_hash(keys)
+            for k in [0, 1, 10, max(keys) + 1, 0x12345678]:
+                if k not in keys:
+                    self.assertNotEqual(slots[lookup(disp, slots, k)], k)
+
+    def test_out_of_range(self):
+        with self.assertRaises(RuntimeError):
+            perfect_hash([11, 1 << 32])
+        with self.assertRaises(RuntimeError):
+            perfect_hash([-1, 11])
+
+class TestDispatch(unittest.TestCase):
+    def test_empty_interface(self):
+        # Every label goes to the error func, whatever the strategy
+        interface = parse_interface(b'<interface dispatch_func="d" error_func="e" server_prefix="s_"/>', 8)
+        for dispatch in ('switch', 'table', 'hash', 'auto'):
+            c = InterfaceServerDispatch(interface, 'empty', 8, dispatch=dispatch, write=False).outputs['.c']
+            self.assertIn('default: msg = e(ep, msginfo, reply, data);', c)
+            self.assertNotIn('% 0', c)
+            self.assertNotIn('[0]', c)
+
+class TestComposite(unittest.TestCase):
+    def servers(self, bar_attrs, **options):
+        foo = parse_interface(b'<interface dispatch_func="foo" error_func="e" server_prefix="foo_">'
+                              b'<method name="nb" clientcap="1"/></interface>', 8)
+        bar = parse_interface(b'<interface dispatch_func="bar" error_func="e" server_prefix="bar_" %s>'
+                              b'<method name="bnb" clientcap="1"/></interface>' % bar_attrs, 8)
+        return [InterfaceServerDispatch(i, f'{i.dispatch_func}_server', 8, write=False, **options) for i in (foo, bar)]
+
+    def test_auto_ids(self):
+        with self.assertRaises(RuntimeError):
+            InterfaceCompositeDispatch(self.servers(b''), 'both', 8, 'both', 'e', write=False)
+        servers = self.servers(b'id_base="0x100"')
+        InterfaceCompositeDispatch(servers, 'both', 8, 'both', 'e', write=False)
+        self.assertIn('#define METHOD_NUM_NB 11\n', servers[0].outputs['.h'])
+        self.assertIn('#define METHOD_NUM_BNB 256\n', servers[1].outputs['.h'])
+
+    def test_no_reply_labels(self):
+        # The interfaces' oneway wrappers must answer with the loop's label
+        servers = self.servers(b'id_base="0x100"', server_loop=True)
+        h = InterfaceCompositeDispatch(servers, 'both', 8, 'both', 'e', write=False, server_loop=True).outputs['.h']
+        for prefix in ('FOO', 'BAR'):
+            link = f'#ifndef {prefix}_NO_REPLY_LABEL\n#define {prefix}_NO_REPLY_LABEL BOTH_NO_REPLY_LABEL\n'
+            self.assertLess(h.index(link), h.index(f'#include <{prefix.lower()}_server.h>'))
+            self.assertIn(f'_Static_assert({prefix}_NO_REPLY_LABEL == BOTH_NO_REPLY_LABEL,', h)
+
+class TestOutput(unittest.TestCase):
+    xml = b'''<interface dispatch_func="d" error_func="e" server_prefix="s_">
+  <method name="a" clientcap="1"><in ctype="int" name="x"/><out ctype="int" name="y"/></method>
+</interface>'''
+
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_in_memory_matches_files(self):
+        interface = parse_interface(self.xml, 8)
+        for gen in (InterfaceClientStubs, InterfaceServerDispatch):
+            base = os.path.join(self.dir, gen.__name__)
+            outputs = gen(interface, base, 8, write=False).outputs
+            self.assertFalse(any(name.startswith(gen.__name__) for name in os.listdir(self.dir)))
+            self.assertEqual(gen(interface, base, 8).outputs, outputs)
+            for suffix, text in outputs.items():
+                with open(base + suffix) as f:
+                    self.assertEqual(f.read(), text)
+
+    def test_write_if_changed(self):
+        filename = os.path.join(self.dir, 'out.h')
+        self.assertTrue(write_if_changed(filename, 'one\n'))
+        os.utime(filename, (0, 0))
+        self.assertFalse(write_if_changed(filename, 'one\n'))
+        self.assertEqual(os.stat(filename).st_mtime, 0)
+        self.assertTrue(write_if_changed(filename, 'two\n'))
+        with open(filename) as f:
+            self.assertEqual(f.read(), 'two\n')
+        self.assertEqual(os.listdir(self.dir), ['out.h'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/python3
+import unittest
+from interface_layout import ctype_layout, struct_size, optimise_layout
+
+class TestLayout(unittest.TestCase):
+    def test_ctype_layout(self):
+        self.assertEqual(ctype_layout('seL4_Word', 4), (4, 4))
+        self.assertEqual(ctype_layout('seL4_Word', 8), (8, 8))
+        self.assertEqual(ctype_layout('const char *', 4), (4, 4))
+        self.assertEqual(ctype_layout('const   uint16_t', 8), (2, 2))
+        self.assertIsNone(ctype_layout('struct foo', 8))
+
+    def test_struct_size(self):
+        for wordsize in (4, 8):
+            self.assertEqual(struct_size([], wordsize), 0)
+            self.assertEqual(struct_size(['char', 'uint64_t', 'char'], wordsize), 24)
+            self.assertEqual(struct_size(['uint8_t', 'uint16_t', 'uint8_t'], wordsize), 6)
+            self.assertIsNone(struct_size(['int', 'struct foo'], wordsize))
+        self.assertEqual(struct_size(['char', 'seL4_Word', 'char'], 4), 12)
+        self.assertEqual(struct_size(['char', 'seL4_Word', 'char'], 8), 24)
+        self.assertEqual(struct_size(['int', 'void *'], 8), 16)
+
+    def test_optimise_layout(self):
+        fields = ['char', 'seL4_Word', 'short', 'uint64_t', 'char', 'int']
+        for wordsize, size in ((4, 24), (8, 24)):
+            ordered = optimise_layout(fields, wordsize, ctype=lambda f: f)
+            self.assertEqual(sorted(ordered), sorted(fields))
+            self.assertEqual(struct_size(ordered, wordsize), size)
+            self.assertLess(struct_size(ordered, wordsize), struct_size(fields, wordsize))
+        self.assertEqual(optimise_layout(fields, 8, ctype=lambda f: f),
+                         ['seL4_Word', 'uint64_t', 'int', 'short', 'char', 'char'])
+        self.assertEqual(optimise_layout(fields, 4, ctype=lambda f: f),
+                         ['uint64_t', 'seL4_Word', 'int', 'short', 'char', 'char'])
+
+    def test_optimise_layout_unknown_first(self):
+        # Stable, so client and server agree on the order
+        fields = [('char', 'a'), ('struct foo', 'b'), ('int', 'c'), ('struct bar', 'd'), ('char', 'e')]
+        self.assertEqual([f[1] for f in optimise_layout(fields, 8, ctype=lambda f: f[0])],
+                         ['b', 'd', 'c', 'a', 'e'])
+
+if __name__ == '__main__':
+    unittest.main()
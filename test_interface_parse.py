@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+import unittest
+import xml.etree.ElementTree as ET
+from interface_parse import parse_interface, ArgDirection, Interface, Method, Arg, CapArg
+from interface_gen import InterfaceClientStubs
+
+def interface_xml(body, attrs=''):
+    return (f'<interface dispatch_func="d" error_func="e" server_prefix="s_" {attrs}>\n'
+            f'{body}\n</interface>\n').encode()
+
+class TestParse(unittest.TestCase):
+    def test_model(self):
+        interface = parse_interface(interface_xml('''
+  <include header="&lt;sel4/sel4.h&gt;" server="false"/>
+  <define name="N" value="4"/>
+  <method name="a" id="20" clientcap="1">
+    <in ctype="int" name="x"/>
+    <out ctype="int" name="y"/>
+    <inout ctype="seL4_Word" name="z"/>
+    <capin ctype="seL4_CPtr" name="c"/>
+  </method>
+  <method name="b" clientcap="1" oneway="true"/>
+  <method name="c" clientcap="1" batch_id="11"/>'''), 8)
+        self.assertEqual(interface.includes[0].header, '<sel4/sel4.h>')
+        self.assertFalse(interface.includes[0].server)
+        a, b, c = interface.methods
+        self.assertEqual([x.name for x in a.args], ['x', 'y', 'z'])
+        self.assertEqual([x.name for x in a.in_args], ['x', 'z'])
+        self.assertEqual([x.name for x in a.out_args], ['y', 'z'])
+        self.assertEqual([x.name for x in a.in_caps], ['c'])
+        self.assertEqual(a.out_caps, ())
+        self.assertEqual(a.args[2].direction, ArgDirection.INOUT)
+        self.assertEqual(b.return_type, 'void')
+        self.assertEqual(b.args, ())
+        # Ids left out are assigned from seL4_NumErrors, skipping taken ones
+        self.assertEqual((a.id, b.id, c.id, c.batch_id), (20, 12, 13, 11))
+        self.assertIs(interface.methods_by_id[11], c)
+
+    def test_id_base(self):
+        interface = parse_interface(interface_xml('<method name="a" clientcap="1"/><method name="b" id="257" clientcap="1"/>'
+                                                  '<method name="c" clientcap="1"/>', 'id_base="0x100"'), 8)
+        self.assertEqual([m.id for m in interface.methods], [0x100, 0x101, 0x102])
+        self.assertParseError(interface_xml('', 'id_base="10"'), 'id_base must be at least seL4_NumErrors (11)')
+
+    def test_model_in_code(self):
+        # Built through the API the views match what the parser gives
+        interface = Interface('d', 'e', 's_', '', '')
+        a = Method('a', 20, 'int', '1')
+        a.add_arg(Arg('int', 'x', ArgDirection.IN, False))
+        a.add_cap_arg(CapArg('seL4_CPtr', 'c', ArgDirection.IN))
+        interface.add_method(a)
+        a.add_arg(Arg('int', 'y', ArgDirection.OUT, False))
+        a.add_arg(Arg('seL4_Word', 'z', ArgDirection.INOUT, False))
+        b = Method('b', None, 'void', '1')
+        b.args.append(Arg('int', 'v', ArgDirection.IN, False))
+        interface.add_method(b)
+        interface.assign_ids()
+        self.assertEqual([x.name for x in a.in_args], ['x', 'z'])
+        self.assertEqual([x.name for x in a.out_args], ['y', 'z'])
+        self.assertEqual([x.name for x in a.in_caps], ['c'])
+        self.assertEqual([x.name for x in b.in_args], ['v'])
+        self.assertEqual(b.out_args, ())
+        c = InterfaceClientStubs(interface, 'f', 8, write=False).outputs['.c']
+        self.assertIn('struct a_ipc_in {\n        int x;\n        seL4_Word z;\n    };', c)
+        self.assertIn('struct a_ipc_out {\n        int __ret;\n        int y;\n        seL4_Word z;\n    };', c)
+        self.assertIn('struct b_ipc_in {\n        int v;\n    };', c)
+
+    def assertParseError(self, xml, message):
+        with self.assertRaises(RuntimeError) as cm:
+            parse_interface(xml, 8)
+        self.assertEqual(str(cm.exception), message)
+
+    def test_unexpected_data(self):
+        self.assertParseError(interface_xml('<method name="a" clientcap="1"> x <in ctype="int" name="v"/></method>'),
+                              'Unexpected data in the XML:  x ')
+        self.assertParseError(interface_xml('text'), 'Unexpected data in the XML: \ntext\n')
+
+    def test_unknown_tag(self):
+        self.assertParseError(interface_xml('<foo/>'), 'Unknown xml tag: foo')
+
+    def test_scopes(self):
+        self.assertParseError(interface_xml('<in ctype="int" name="v"/>'), 'arg definition outside method scope')
+        self.assertParseError(interface_xml('<method name="a" clientcap="1"><in ctype="int" name="v"><out ctype="int" name="w"/></in></method>'),
+                              'arg definition outside method scope')
+        self.assertParseError(interface_xml('<method name="a" clientcap="1"><method name="b" clientcap="1"/></method>'),
+                              'Method definition outside interface scope')
+        self.assertParseError(interface_xml('<interface dispatch_func="d" error_func="e" server_prefix="t_"/>'),
+                              'Only a single interface allowed')
+        self.assertParseError(b'<method name="a" clientcap="1"/>', 'Method definition outside interface scope')
+        self.assertParseError(interface_xml('<method name="a" clientcap="1"><include header="x"/></method>'),
+                              'Include must be in interface scope')
+
+    def test_duplicates(self):
+        self.assertParseError(interface_xml('<method name="a" clientcap="1"/><method name="a" clientcap="1"/>'),
+                              'Duplicate method name "a"')
+        self.assertParseError(interface_xml('<method name="a" id="12" clientcap="1"/><method name="b" id="12" clientcap="1"/>'),
+                              'Duplicate method id 12 for "b" and "a"')
+        self.assertParseError(interface_xml('<method name="a" id="12" batch_id="12" clientcap="1"/>'),
+                              'Duplicate method id 12 for "a" and "a"')
+
+    def test_attributes(self):
+        self.assertParseError(interface_xml('<method name="a" clientcap="1" cacheable="0"/>'),
+                              'Method "a" cache size must be at least 1')
+        self.assertParseError(interface_xml('', 'client_state="int"'),
+                              'client_state and max_clients must be given together')
+
+    def test_malformed(self):
+        with self.assertRaises(ET.ParseError) as cm:
+            parse_interface(b'<interface dispatch_func="d" error_func="e" server_prefix="s_">\n<method', 8)
+        self.assertEqual(cm.exception.position[0], 2)
+        with self.assertRaises(ET.ParseError):
+            parse_interface(interface_xml('<method name="a" clientcap="1"></in>'), 8)
+        with self.assertRaises(ET.ParseError):
+            parse_interface(b'', 8)
+
+if __name__ == '__main__':
+    unittest.main()